@@ -0,0 +1,133 @@
+"""
+Kyutai PCM → 8kHz μ-law conversion off the event loop
+
+Resampling and μ-law encoding of every Kyutai frame used to run on the
+event loop, so one call converting a long reply made every other call's
+20ms frames late. Conversion jobs now run in a bounded pool:
+
+- thread:   ThreadPoolExecutor (NumPy releases the GIL in the heavy parts)
+- process:  ProcessPoolExecutor (no GIL at all; the decimator state, a few
+            hundred floats, travels with each job)
+- inline:   on the event loop, as before (lowest overhead for a few calls)
+
+At most `max_pending` jobs are queued or running; further callers wait
+for a slot (backpressure) instead of piling work up. Queue wait (call →
+job start) and compute time are measured per job.
+"""
+
+import asyncio
+import concurrent.futures
+import multiprocessing
+import time
+
+from resampler import PolyphaseDecimator
+from ulaw_codec import float_to_int16, lin2ulaw
+
+CONVERSION_MODES = ("thread", "process", "inline")
+
+
+def convert_chunk(decimator, pcm, submitted):
+    """24kHz float PCM → 8kHz μ-law (pcm None = flush); returns (μ-law, decimator, wait s, compute s)"""
+    started = time.perf_counter()
+    if pcm is None:
+        ulaw = lin2ulaw(float_to_int16(decimator.flush()))
+    else:
+        ulaw = lin2ulaw(float_to_int16(decimator.process(pcm)))
+    return ulaw, decimator, started - submitted, time.perf_counter() - started
+
+
+class ConversionStream:
+    """One segment's conversion: resampler filter state carries over between chunks"""
+
+    def __init__(self, pool, quality):
+        self.pool = pool
+        self.decimator = PolyphaseDecimator(quality)
+
+    async def convert(self, pcm):
+        return await self.pool.run(self, pcm)
+
+    async def flush(self):
+        """Tail still held back by the resampler filter delay"""
+        return await self.pool.run(self, None)
+
+
+class ConversionPool:
+    """Bounded executor for Kyutai audio conversion, with queue-wait and compute metrics"""
+
+    def __init__(self, mode="thread", workers=2, max_pending=64, observe=None):
+        if mode not in CONVERSION_MODES:
+            raise ValueError(f"❌ Unknown conversion mode '{mode}' (choose from {', '.join(CONVERSION_MODES)})")
+        self.mode = mode
+        self.workers = workers
+        self.max_pending = max_pending
+        self.observe = observe   # observe(stage, ms): latency histograms
+
+        if mode == "thread":
+            self._executor = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="conversion")
+        elif mode == "process":
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._executor = None
+        self._slots = None   # created on first use, inside the running loop
+
+        self.jobs = 0
+        self.pending = 0
+        self.pending_max = 0
+        self.backpressure_waits = 0   # jobs that found every slot taken
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.compute_ms_total = 0.0
+        self.compute_ms_max = 0.0
+
+    def stream(self, quality):
+        return ConversionStream(self, quality)
+
+    async def run(self, stream, pcm):
+        """Convert one chunk of `stream`; returns μ-law bytes"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        submitted = time.perf_counter()
+        if self._slots.locked():
+            self.backpressure_waits += 1
+        async with self._slots:
+            self.pending += 1
+            self.pending_max = max(self.pending_max, self.pending)
+            try:
+                if self._executor is None:
+                    ulaw, decimator, wait_s, compute_s = convert_chunk(stream.decimator, pcm, submitted)
+                else:
+                    ulaw, decimator, wait_s, compute_s = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, convert_chunk, stream.decimator, pcm, submitted
+                    )
+            finally:
+                self.pending -= 1
+
+        # Process pool: the updated filter state comes back as a copy
+        stream.decimator = decimator
+        self.jobs += 1
+        self.wait_ms_total += wait_s * 1000
+        self.wait_ms_max = max(self.wait_ms_max, wait_s * 1000)
+        self.compute_ms_total += compute_s * 1000
+        self.compute_ms_max = max(self.compute_ms_max, compute_s * 1000)
+        if self.observe is not None:
+            self.observe("conversion_wait", wait_s * 1000)
+            self.observe("conversion_compute", compute_s * 1000)
+        return ulaw
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "jobs": self.jobs,
+            "pending_max": self.pending_max,
+            "backpressure_waits": self.backpressure_waits,
+            "queue_wait_ms_avg": round(self.wait_ms_total / self.jobs, 2) if self.jobs else 0.0,
+            "queue_wait_ms_max": round(self.wait_ms_max, 2),
+            "compute_ms_avg": round(self.compute_ms_total / self.jobs, 2) if self.jobs else 0.0,
+            "compute_ms_max": round(self.compute_ms_max, 2),
+        }
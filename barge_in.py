@@ -0,0 +1,68 @@
+"""
+Barge-in: stop the bot as soon as the caller starts talking
+
+Cancelling the reply task tears down the whole reply at once: the GPT
+request (streamed or not), the Kyutai session (its pooled connection is
+closed) and the Twilio send loop. Twilio's `clear` event then flushes
+the audio already queued on Twilio's side (burst-ahead lead).
+
+Only a reply that has started playing (first frame sent) is cut off.
+Before that the bot has said nothing the caller could be talking over:
+the caller just kept talking after a pause, so the turn is cancelled and
+its transcript held for the next final (TurnManager.hold_current).
+
+A reply cancelled for another reason (superseded by a newer final) that
+had already started playing gets the same `clear` through `flush`.
+"""
+
+import asyncio
+import json
+
+
+class BargeIn:
+    """Per-call barge-in handling and speech-start → silence metrics"""
+
+    def __init__(self, min_words=1):
+        self.min_words = min_words
+        self.interruptions = 0
+        self.flushed = 0         # cancelled replies other than barge-ins whose audio was cleared
+        self.silence_ms = []     # speech start → Twilio cleared, per interruption
+
+    def _talking_during(self, reply_task, transcript):
+        return reply_task is not None and not reply_task.done() and len(transcript.split()) >= self.min_words
+
+    def should_interrupt(self, reply_task, transcript, playing=True):
+        """True when the reply's audio is playing and the caller said enough to cut it off"""
+        return playing and self._talking_during(reply_task, transcript)
+
+    def should_hold(self, reply_task, transcript, playing):
+        """True when the caller is still talking before the reply's first frame (the turn came too early)"""
+        return not playing and self._talking_during(reply_task, transcript)
+
+    async def _clear(self, reply_task, websocket, stream_sid):
+        # Wait until the cancelled reply stopped sending, then drop what Twilio still has queued
+        await asyncio.wait([reply_task])
+        await websocket.send(json.dumps({"event": "clear", "streamSid": stream_sid}))
+
+    async def flush(self, reply_task, websocket, stream_sid):
+        """Flush Twilio's playback buffer after a playing reply was cancelled elsewhere (superseded, held)"""
+        await self._clear(reply_task, websocket, stream_sid)
+        self.flushed += 1
+
+    async def interrupt(self, reply_task, websocket, stream_sid, speech_start):
+        """Cancel the running reply and flush Twilio's playback buffer"""
+        reply_task.cancel()
+        await self._clear(reply_task, websocket, stream_sid)
+
+        silence_ms = (asyncio.get_running_loop().time() - speech_start) * 1000
+        self.interruptions += 1
+        self.silence_ms.append(silence_ms)
+        print(f"✋ Barge-in: caller spoke, bot silent after {silence_ms:.0f}ms")
+
+    def stats(self):
+        return {
+            "interruptions": self.interruptions,
+            "flushed": self.flushed,
+            "silence_ms_avg": round(sum(self.silence_ms) / len(self.silence_ms), 1) if self.silence_ms else 0.0,
+            "silence_ms_max": round(max(self.silence_ms), 1) if self.silence_ms else 0.0,
+        }
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Per-call trace timelines (JSONL) and an offline waterfall report
+
+Histograms (latency_metrics.py) say how slow turns are in aggregate; a
+trace says what happened on one bad call. Every call writes
+<directory>/<CallSid>.jsonl, one compact record per event:
+
+    {"t":1234.5,"e":"gpt_first","turn":2}
+
+`t` is monotonic time in ms since the call was accepted. Events:
+
+    twilio_start                       callSid / streamSid, wall-clock start
+    dg_interim, dg_final               Deepgram results (final: text, STT latency)
+    turn_start, turn_end               one reply (turn_end: complete or interrupted)
+    gpt_request, gpt_first, gpt_done   GPT request, first token, full reply (speculative: `spec` number)
+    gpt_adopted                        the turn took over speculation `spec`
+    kyutai_connect                     Kyutai session acquired for a segment
+    kyutai_first_audio, kyutai_last_audio
+    reply_first_frame                  first reply frame sent to Twilio
+    frames                             every `frame_batch` frames sent (filler or reply)
+    call_end
+
+Events raised inside a turn's task tree carry its number (a context
+variable set by `begin_turn`); Deepgram results and speculative GPT
+requests happen before their turn starts and are attached to the next
+turn by the report, which only counts the GPT events of the turn's own
+request or of the speculation it adopted. Records go through a TranscriptJournal, so the event
+loop only enqueues them and one background thread does the file I/O.
+
+Report:
+
+    python call_trace.py traces/                 p50/p95/p99 per stage
+    python call_trace.py traces/ --waterfall 5   plus the 5 slowest turns
+    python call_trace.py traces/CA123.jsonl --waterfall 0   every turn of one call
+"""
+
+import argparse
+import contextvars
+import glob
+import json
+import os
+import time
+
+from latency_metrics import percentile
+from transcript_journal import TranscriptJournal
+
+# Trace of the call handled by the current task (inherited by every task it creates)
+current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_turn = contextvars.ContextVar("current_turn", default=None)
+
+STAGES = ("stt_final", "final_to_turn", "gpt_first_token", "kyutai_first_audio", "first_frame", "turn_total")
+
+
+class CallTracer:
+    """Process-wide trace writer: one JSONL file per CallSid"""
+
+    def __init__(self, directory, frame_batch=50, flush_interval=0.5):
+        self.frame_batch = frame_batch
+        # Traces are diagnostics: no fsync, large batches
+        self.journal = TranscriptJournal(directory, fsync="never", flush_interval=flush_interval,
+                                         max_batch=1024, suffix=".jsonl")
+        self.calls = 0
+
+    def start(self):
+        """New call: its trace becomes current for this task and the tasks it creates"""
+        self.calls += 1
+        trace = CallTrace(self)
+        current_trace.set(trace)
+        return trace
+
+    def close(self):
+        """Write out everything still queued (blocking)"""
+        self.journal.close()
+
+    def stats(self):
+        return {"calls": self.calls, **self.journal.stats()}
+
+
+class CallTrace:
+    """Timeline of one call; records are held back until Twilio's start event names the file"""
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.origin = time.monotonic()
+        self.call_sid = None
+        self._pending = []
+        self._turns = 0
+        self._frames = 0        # frames sent since the last `frames` record
+        self._frames_total = 0
+
+    def event(self, name, **fields):
+        record = {"t": round((time.monotonic() - self.origin) * 1000, 1), "e": name}
+        turn = _current_turn.get()
+        if turn is not None:
+            record["turn"] = turn
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        if self.call_sid is None:
+            self._pending.append(line)
+        else:
+            self.tracer.journal.write(self.call_sid, line)
+
+    def twilio_start(self, call_sid, stream_sid):
+        self.call_sid = call_sid
+        for line in self._pending:
+            self.tracer.journal.write(call_sid, line)
+        self._pending.clear()
+        self.event("twilio_start", call_sid=call_sid, stream_sid=stream_sid, wall=round(time.time(), 3))
+
+    def begin_turn(self, transcript):
+        """Called from the turn's own task: later events in it (and its subtasks) carry the turn number"""
+        self._turns += 1
+        _current_turn.set(self._turns)
+        self.event("turn_start", text=transcript)
+
+    def end_turn(self, complete):
+        self._flush_frames()
+        self.event("turn_end", complete=complete)
+
+    def frame(self):
+        self._frames += 1
+        if self._frames >= self.tracer.frame_batch:
+            self._flush_frames()
+
+    def _flush_frames(self):
+        if self._frames:
+            self._frames_total += self._frames
+            self.event("frames", n=self._frames, total=self._frames_total)
+            self._frames = 0
+
+    def close(self):
+        self._flush_frames()
+        self.event("call_end", turns=self._turns)
+        if self.call_sid is None:
+            # Never got a start event: keep what happened under "unknown"
+            self.call_sid = "unknown"
+            for line in self._pending:
+                self.tracer.journal.write(self.call_sid, line)
+            self._pending.clear()
+        self.tracer.journal.close_call(self.call_sid)
+
+
+def trace_event(name, **fields):
+    """Record an event on the current call's trace, if any (no-op outside a call)"""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.event(name, **fields)
+
+
+# ✅ Offline report
+def load_trace(path):
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                pass   # last line of a call cut off by a crash
+    events.sort(key=lambda event: event["t"])
+    return events
+
+
+def split_turns(events):
+    """Per turn: its events plus the untagged ones (Deepgram, speculative GPT) that led up to it"""
+    turns = {}
+    waiting = []
+    open_turn = None
+    for event in events:
+        turn = event.get("turn")
+        if event["e"] == "turn_start":
+            turns[turn] = waiting + [event]
+            waiting = []
+            open_turn = turn
+        elif turn is not None and turn in turns:
+            turns[turn].append(event)
+            if event["e"] == "turn_end" and turn == open_turn:
+                open_turn = None
+        elif event["e"].startswith("gpt_") and open_turn is not None:
+            # Speculative GPT still streaming after its turn took it over
+            turns[open_turn].append(event)
+        elif event["e"] not in ("twilio_start", "frames", "call_end"):
+            waiting.append(event)
+    return [sorted(turn_events, key=lambda event: event["t"]) for turn_events in turns.values()]
+
+
+def turn_stages(turn_events):
+    """Stage latencies in ms (same stages as the live histograms, plus final → turn start)"""
+    def first(name):
+        return next((event for event in turn_events if event["e"] == name), None)
+
+    start = first("turn_start")
+    finals = [event for event in turn_events if event["e"] == "dg_final" and event["t"] <= start["t"]]
+    final = finals[-1] if finals else None
+    adopted = first("gpt_adopted")
+
+    def gpt_event(name):
+        # The turn's own request, else the adopted speculation; discarded speculations never count
+        for event in turn_events:
+            if event["e"] == name and (event.get("turn") == start.get("turn") if "spec" not in event
+                                       else adopted is not None and event["spec"] == adopted["spec"]):
+                return event
+        return None
+
+    gpt = gpt_event("gpt_first") or gpt_event("gpt_done")   # not streamed: the whole reply is the first token
+    audio = first("kyutai_first_audio")
+    frame = first("reply_first_frame")
+    end = first("turn_end")
+
+    stages = {}
+    if final is not None:
+        if "stt_ms" in final:
+            stages["stt_final"] = final["stt_ms"]
+        stages["final_to_turn"] = start["t"] - final["t"]
+    if gpt is not None:
+        # Speculative GPT may have answered before the turn started: no wait at all
+        stages["gpt_first_token"] = max(0.0, gpt["t"] - start["t"])
+    if audio is not None:
+        stages["kyutai_first_audio"] = audio["t"] - max(gpt["t"] if gpt is not None else start["t"], start["t"])
+    if frame is not None:
+        stages["first_frame"] = frame["t"] - start["t"]
+    if end is not None and end.get("complete"):
+        stages["turn_total"] = end["t"] - start["t"]
+    return {stage: round(ms, 1) for stage, ms in stages.items()}
+
+
+def summarize(turns):
+    """{stage: {count, p50, p95, p99, max}} over every turn"""
+    samples = {stage: [] for stage in STAGES}
+    for turn in turns:
+        for stage, ms in turn["stages"].items():
+            samples[stage].append(ms)
+    summary = {}
+    for stage, values in samples.items():
+        if values:
+            values.sort()
+            summary[stage] = {
+                "count": len(values),
+                **{f"p{q}": percentile(values, q) for q in (50, 95, 99)},
+                "max": values[-1],
+            }
+    return summary
+
+
+def waterfall(call_sid, turn_events, stages, width=50):
+    """Text waterfall of one turn: every event on a shared time axis from the final transcript"""
+    start = next(event for event in turn_events if event["e"] == "turn_start")
+    origin = min(event["t"] for event in turn_events)
+    span = max(event["t"] for event in turn_events) - origin or 1.0
+    end = next((event for event in turn_events if event["e"] == "turn_end"), None)
+    outcome = "no end" if end is None else "complete" if end.get("complete") else "interrupted"
+    lines = [f"📞 {call_sid} turn {start.get('turn')} ({outcome}): {start.get('text', '')[:60]!r}"]
+    for event in turn_events:
+        if event["e"] == "dg_interim":
+            continue
+        column = int((event["t"] - origin) / span * (width - 1))
+        detail = {key: value for key, value in event.items() if key not in ("t", "e", "turn", "text")}
+        lines.append(f"  {event['t'] - start['t']:+9.1f}ms  {event['e']:<20} {' ' * column}█ "
+                     f"{json.dumps(detail, ensure_ascii=False) if detail else ''}".rstrip())
+    lines.append("  " + "  ".join(f"{stage}={ms:.0f}ms" for stage, ms in stages.items()))
+    return "\n".join(lines)
+
+
+def load_turns(paths):
+    turns = []
+    for path in paths:
+        events = load_trace(path)
+        start = next((event for event in events if event["e"] == "twilio_start"), {})
+        call_sid = start.get("call_sid") or os.path.splitext(os.path.basename(path))[0]
+        for turn_events in split_turns(events):
+            turns.append({"call_sid": call_sid, "events": turn_events, "stages": turn_stages(turn_events)})
+    return turns
+
+
+def trace_paths(targets):
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            paths.extend(sorted(glob.glob(os.path.join(target, "*.jsonl"))))
+        else:
+            paths.append(target)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-stage latency report from call traces")
+    parser.add_argument("traces", nargs="+", help="trace files or directories of <CallSid>.jsonl")
+    parser.add_argument("--waterfall", type=int, default=None, metavar="N",
+                        help="print the waterfall of the N slowest turns (0 = every turn)")
+    parser.add_argument("--stage", default="first_frame", choices=STAGES, help="stage that ranks the slowest turns")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    paths = trace_paths(args.traces)
+    turns = load_turns(paths)
+    summary = summarize(turns)
+
+    if args.waterfall is not None:
+        ranked = sorted(turns, key=lambda turn: turn["stages"].get(args.stage, -1), reverse=True)
+        for turn in ranked[:args.waterfall or None]:
+            print(waterfall(turn["call_sid"], turn["events"], turn["stages"]))
+            print()
+
+    if args.json:
+        print(json.dumps({"calls": len(paths), "turns": len(turns), "stages": summary}, indent=2))
+        return
+    print(f"📊 {len(paths)} call(s), {len(turns)} turn(s)")
+    print(f"  {'stage':<20}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for stage, row in summary.items():
+        print(f"  {stage:<20}{row['count']:>8}" + "".join(f"{row[key]:>8.0f}ms" for key in ("p50", "p95", "p99", "max")))
+
+
+if __name__ == "__main__":
+    main()
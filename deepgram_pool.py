@@ -0,0 +1,92 @@
+"""
+Shared aiohttp session + pre-opened Deepgram live-transcription sockets
+
+Every call used to create its own ClientSession and only then open the
+Deepgram WebSocket, so the first caller audio waited on DNS, TCP and TLS.
+Now one process-wide session (DNS cache, one SSL context built once)
+is reused by all calls, and a few listen sockets with the call's
+parameters are kept open ahead of time. Idle sockets get a Deepgram
+`KeepAlive` message so the server does not close them for lack of audio.
+"""
+
+import contextlib
+import json
+import ssl
+
+import aiohttp
+
+from warm_pool import WarmPool
+
+
+def create_shared_session(limit=100, dns_ttl=300, keepalive_timeout=30.0):
+    """One long-lived ClientSession for the whole process (call inside the event loop)"""
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        ttl_dns_cache=dns_ttl,
+        keepalive_timeout=keepalive_timeout,
+        # Built once: loading the CA store per connection costs more than the handshake
+        ssl=ssl.create_default_context(),
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+class DeepgramStreamPool(WarmPool):
+    """Hands out ready Deepgram listen sockets and refills them in the background"""
+
+    label = "Deepgram"
+
+    def __init__(self, url, api_key, size=2, max_idle=60.0, keepalive_interval=5.0, session=None):
+        super().__init__(size, max_idle, refill_interval=keepalive_interval)
+        self.url = url
+        self.api_key = api_key
+        self.keepalive_interval = keepalive_interval
+        self._session = session
+
+    @property
+    def session(self):
+        """The process-wide session (created on first use, inside the running loop)"""
+        if self._session is None or self._session.closed:
+            self._session = create_shared_session()
+        return self._session
+
+    async def _open(self, key):
+        return await self.session.ws_connect(self.url, headers={"Authorization": f"Token {self.api_key}"})
+
+    def _is_open(self, ws):
+        return not ws.closed
+
+    async def _keepalive(self, ws):
+        # Deepgram closes a listen socket that gets no audio for ~10s
+        await ws.send_str(json.dumps({"type": "KeepAlive"}))
+
+    def warm(self):
+        """Start keeping `size` sockets ready"""
+        self._warm(None)
+
+    async def acquire(self):
+        """Return an open listen socket (pool hit) or connect a new one (pool miss)"""
+        return await self._acquire(None)
+
+    async def finish(self, ws):
+        """No more audio: Deepgram sends its last results, then closes the socket"""
+        with contextlib.suppress(Exception):
+            await ws.send_str(json.dumps({"type": "CloseStream"}))
+
+    async def retire(self, ws):
+        """Close a used socket (one Deepgram stream per call)"""
+        await self.finish(ws)
+        with contextlib.suppress(Exception):
+            await ws.close()
+
+    @contextlib.asynccontextmanager
+    async def stream(self):
+        ws = await self.acquire()
+        try:
+            yield ws
+        finally:
+            await self.retire(ws)
+
+    async def close(self):
+        await super().close()
+        if self._session is not None:
+            await self._session.close()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Deepgram live transcription (no speech recognition)
+
+Accepts the call server's listen socket (`Authorization: Token …`,
+binary μ-law frames, `KeepAlive` / `CloseStream` text messages) and
+answers with scripted transcripts in Deepgram's `Results` format. The
+script is laid out on the caller's audio timeline, so results come as
+audio frames arrive, exactly as paced by Twilio:
+
+    lead_s             audio before the first utterance starts
+    words_per_second   speaking rate: how long each utterance lasts
+    interim_interval   audio seconds between interim results (growing prefix)
+    endpointing_ms     silence after an utterance before its final
+    pause_s            more silence before the next utterance
+    latency_ms         real-time delay before every result is sent
+
+Finals carry `start` / `duration` (seconds of audio), which the call
+server uses for its STT latency and barge-in timing. The script repeats
+once it runs out.
+
+    python deepgram_stand_in.py --port 8091 --script "Bonjour|Quelle heure est-il ?"
+    DEEPGRAM_ENDPOINT=ws://127.0.0.1:8091/v1/listen python twilio_kyutai_tts.py
+"""
+
+import argparse
+import asyncio
+import http
+import json
+
+import websockets
+
+ULAW_BYTES_PER_SECOND = 8000
+
+DEFAULT_SCRIPT = [
+    "Bonjour, quels sont vos horaires d'ouverture ?",
+    "Et le samedi ?",
+    "Merci beaucoup, au revoir.",
+]
+
+
+def result(transcript, start, duration, is_final):
+    return {
+        "type": "Results",
+        "channel": {"alternatives": [{"transcript": transcript, "confidence": 0.99}]},
+        "is_final": is_final,
+        "speech_final": is_final,
+        "start": round(start, 3),
+        "duration": round(duration, 3),
+    }
+
+
+class ScriptedTranscript:
+    """Results due for one stream as its audio advances (audio time, not wall time)"""
+
+    def __init__(self, script, lead_s=0.5, words_per_second=3.0, interim_interval=0.3, endpointing_ms=500,
+                 pause_s=3.0):
+        self.script = script
+        self.words_per_second = words_per_second
+        self.interim_interval = interim_interval
+        self.endpointing_s = endpointing_ms / 1000
+        self.pause_s = pause_s
+
+        self.index = 0
+        self.start = lead_s            # audio time the current utterance starts
+        self.next_interim = lead_s + interim_interval
+        self.heard = 0                 # words already sent in an interim
+
+    def _words(self):
+        return self.script[self.index % len(self.script)].split()
+
+    def advance(self, audio_s):
+        """Every result due once `audio_s` seconds of audio have arrived"""
+        due = []
+        while self.script:
+            words = self._words()
+            end = self.start + len(words) / self.words_per_second
+            # Interims: the words spoken so far, every interim_interval of audio
+            while self.next_interim <= min(audio_s, end):
+                heard = min(len(words), int((self.next_interim - self.start) * self.words_per_second))
+                if heard > self.heard:
+                    self.heard = heard
+                    due.append(result(" ".join(words[:heard]), self.start, self.next_interim - self.start, False))
+                self.next_interim += self.interim_interval
+            if audio_s < end + self.endpointing_s:
+                return due
+            due.append(result(" ".join(words), self.start, end - self.start, True))
+            self.index += 1
+            self.start = end + self.endpointing_s + self.pause_s
+            self.next_interim = self.start + self.interim_interval
+            self.heard = 0
+        return due
+
+    def flush(self, audio_s):
+        """CloseStream: the utterance in progress is final with what was heard"""
+        if not self.script or audio_s <= self.start:
+            return []
+        words = self._words()
+        heard = min(len(words), max(1, int((audio_s - self.start) * self.words_per_second)))
+        return [result(" ".join(words[:heard]), self.start, audio_s - self.start, True)]
+
+
+class DeepgramStandIn:
+    """Deepgram-protocol listen socket that replays a script against the incoming audio"""
+
+    def __init__(self, script=None, lead_s=0.5, words_per_second=3.0, interim_interval=0.3, endpointing_ms=500,
+                 pause_s=3.0, latency_ms=150.0, api_key=None):
+        self.script = list(script or DEFAULT_SCRIPT)
+        self.lead_s = lead_s
+        self.words_per_second = words_per_second
+        self.interim_interval = interim_interval
+        self.endpointing_ms = endpointing_ms
+        self.pause_s = pause_s
+        self.latency_ms = latency_ms
+        self.api_key = api_key         # None: any token
+        self._server = None
+
+        self.streams = 0
+        self.active = 0
+        self.rejected = 0
+        self.audio_s = 0.0
+        self.results = 0
+
+    def _check_request(self, connection, request):
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.startswith("Token ") or (self.api_key is not None and authorization != f"Token {self.api_key}"):
+            self.rejected += 1
+            return connection.respond(http.HTTPStatus.UNAUTHORIZED, "Invalid credentials\n")
+        return None
+
+    async def start(self, host="127.0.0.1", port=8091):
+        """Listen; returns the bound port (port 0 picks a free one)"""
+        self._server = await websockets.serve(self._stream, host, port, process_request=self._check_request,
+                                              ping_interval=None, max_size=None)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _stream(self, ws):
+        loop = asyncio.get_running_loop()
+        transcript = ScriptedTranscript(self.script, self.lead_s, self.words_per_second, self.interim_interval,
+                                        self.endpointing_ms, self.pause_s)
+        outbox = asyncio.Queue()   # (send at, result | None): results keep their order, each one delayed
+
+        async def sender():
+            while (item := await outbox.get())[1] is not None:
+                send_at, message = item
+                await asyncio.sleep(max(0.0, send_at - loop.time()))
+                await ws.send(json.dumps(message))
+                self.results += 1
+
+        def queue(results):
+            for message in results:
+                outbox.put_nowait((loop.time() + self.latency_ms / 1000, message))
+
+        self.streams += 1
+        self.active += 1
+        audio_bytes = 0
+        sending = asyncio.create_task(sender())
+        try:
+            async for message in ws:
+                if isinstance(message, bytes):
+                    audio_bytes += len(message)
+                    self.audio_s += len(message) / ULAW_BYTES_PER_SECOND
+                    queue(transcript.advance(audio_bytes / ULAW_BYTES_PER_SECOND))
+                elif json.loads(message).get("type") == "CloseStream":
+                    queue(transcript.flush(audio_bytes / ULAW_BYTES_PER_SECOND))
+                    break
+            # Last results out, then Deepgram closes the socket
+            outbox.put_nowait((loop.time(), None))
+            await sending
+            await ws.close()
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            sending.cancel()
+            self.active -= 1
+
+    def stats(self):
+        return {
+            "streams": self.streams,
+            "active": self.active,
+            "rejected": self.rejected,
+            "audio_s": round(self.audio_s, 1),
+            "results": self.results,
+        }
+
+
+async def serve(stand_in, host, port):
+    port = await stand_in.start(host, port)
+    print(f"🧪 Deepgram stand-in at ws://{host}:{port}/v1/listen "
+          f"({len(stand_in.script)} utterance(s), results {stand_in.latency_ms:.0f}ms late)")
+    try:
+        await asyncio.Future()
+    finally:
+        await stand_in.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deepgram live-transcription stand-in (scripted transcripts)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--api-key", default=None, help="accept only this token (default: any)")
+    parser.add_argument("--script", default="|".join(DEFAULT_SCRIPT), help="utterances separated by |")
+    parser.add_argument("--lead-s", type=float, default=0.5, help="audio before the first utterance")
+    parser.add_argument("--words-per-second", type=float, default=3.0)
+    parser.add_argument("--interim-interval", type=float, default=0.3, help="audio seconds between interims")
+    parser.add_argument("--endpointing-ms", type=int, default=500, help="silence before a final")
+    parser.add_argument("--pause-s", type=float, default=3.0, help="extra silence between utterances")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="delay before each result is sent")
+    args = parser.parse_args(argv)
+
+    script = [line.strip() for line in args.script.split("|") if line.strip()]
+    stand_in = DeepgramStandIn(script, args.lead_s, args.words_per_second, args.interim_interval,
+                               args.endpointing_ms, args.pause_s, args.latency_ms, args.api_key)
+    try:
+        asyncio.run(serve(stand_in, args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"📊 Deepgram stand-in: {stand_in.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Pre-rendered filler clips ("D'accord…", "Un instant…") to mask LLM latency
+
+Clips are synthesized once at startup (through Kyutai, or straight from
+the TTS cache on later runs) and kept as 8kHz μ-law, so a filler costs
+no GPU time per call. When a turn starts, a filler begins after a short
+grace delay; the real reply stops it right before its own first frame
+and continues on the same playout clock, so there is no gap and no
+overlap. If the reply is ready within the grace delay (cache hit, FAQ),
+the filler never plays.
+
+A filler is never cut mid-word: when the reply is ready, a remainder no
+longer than the playout lead plays to the end, and a longer one fades
+to silence over the lead, so the reply's first frame waits at most one
+playout lead for it.
+"""
+
+import asyncio
+import random
+
+import numpy as np
+
+from ulaw_codec import lin2ulaw, ulaw2lin
+
+FRAME_BYTES = 160   # 20ms of 8kHz μ-law
+
+
+def trim_silence(ulaw, threshold=500, margin_frames=1):
+    """Cut leading/trailing near-silence so a filler starts on its first word"""
+    pcm = np.abs(ulaw2lin(ulaw).astype(np.int32))
+    voiced = np.flatnonzero(pcm > threshold)
+    if len(voiced) == 0:
+        return bytes(ulaw)
+    margin = margin_frames * FRAME_BYTES
+    return bytes(ulaw[max(0, voiced[0] - margin):voiced[-1] + 1 + margin])
+
+
+def fade_out(ulaw, offset, length):
+    """Samples [offset, offset + len(ulaw)) of a `length`-sample linear fade to silence"""
+    pcm = ulaw2lin(ulaw).astype(np.float32)
+    gain = np.clip(1 - (np.arange(offset, offset + len(pcm)) + 1) / length, 0, 1)
+    return lin2ulaw((pcm * gain).astype(np.int16))
+
+
+class FillerBank:
+    """Process-wide set of filler clips and filler/latency counters"""
+
+    def __init__(self, phrases, delay_ms=150):
+        self.phrases = phrases
+        self.delay_s = delay_ms / 1000
+        self.clips = []          # (phrase, μ-law bytes)
+        self._last = None
+
+        self.turns = 0
+        self.played = 0          # filler started before the reply was ready
+        self.skipped = 0         # reply ready within the grace delay
+        self.cut = 0             # filler stopped mid-clip (turn ended before the reply)
+        self.faded = 0           # filler faded out over the playout lead by the reply
+        # Turn start → first audio on the call (filler or reply): the latency the caller perceives
+        self.first_audio_count = 0
+        self.first_audio_ms_total = 0.0
+        self.first_audio_ms_max = 0.0
+
+    async def render(self, synthesize):
+        """Synthesize every phrase once: `synthesize(text)` returns 8kHz μ-law"""
+        for phrase in self.phrases:
+            try:
+                ulaw = await synthesize(phrase)
+            except Exception as e:
+                print(f"⚠️  Filler '{phrase}' not rendered: {e}")
+                continue
+            if ulaw:
+                self.clips.append((phrase, trim_silence(ulaw)))
+        total_ms = sum(len(clip) for _, clip in self.clips) / 8
+        print(f"🗯️ Filler bank ready: {len(self.clips)} clip(s), {total_ms:.0f}ms of audio")
+
+    def _pick(self):
+        # Never the same filler twice in a row
+        choices = [clip for clip in self.clips if clip is not self._last] or self.clips
+        self._last = random.choice(choices)
+        return self._last
+
+    def start(self, send, playout):
+        """Start a turn's filler; `send(frame)` sends one μ-law frame to the call"""
+        self.turns += 1
+        if not self.clips:
+            return None
+        return Filler(self, self._pick()[1], send, playout)
+
+    def stats(self):
+        return {
+            "clips": len(self.clips),
+            "turns": self.turns,
+            "played": self.played,
+            "skipped": self.skipped,
+            "cut": self.cut,
+            "faded": self.faded,
+            "first_audio_ms_avg": round(self.first_audio_ms_total / self.first_audio_count, 1) if self.first_audio_count else 0.0,
+            "first_audio_ms_max": round(self.first_audio_ms_max, 1),
+        }
+
+
+class Filler:
+    """One turn's filler: plays after the grace delay until the reply takes over"""
+
+    def __init__(self, bank, clip, send, playout):
+        self.bank = bank
+        self.clip = clip
+        self.send = send
+        self.playout = playout
+        self.started = False
+        self.finished = False
+        self._turn_start = asyncio.get_running_loop().time()
+        self._first_audio = None
+        self._pos = 0                # next byte of the clip to send
+        self._end = len(clip)        # pulled in by stop() to end the clip early
+        self._fade_from = None       # byte where the fade-out starts
+        self._reply_waiting = False
+
+        # Filler and reply share the clock: the reply's first frame follows the filler's last
+        playout.reset()
+        self._task = asyncio.create_task(self._play())
+
+    def _mark_first_audio(self):
+        if self._first_audio is None:
+            self._first_audio = asyncio.get_running_loop().time()
+            latency_ms = (self._first_audio - self._turn_start) * 1000
+            self.bank.first_audio_count += 1
+            self.bank.first_audio_ms_total += latency_ms
+            self.bank.first_audio_ms_max = max(self.bank.first_audio_ms_max, latency_ms)
+
+    async def _play(self):
+        await asyncio.sleep(self.bank.delay_s)
+        self.started = True
+        self.bank.played += 1
+        while self._pos < self._end:
+            await self.playout.wait()
+            frame = self.clip[self._pos:min(self._pos + FRAME_BYTES, self._end)]
+            if self._fade_from is not None:
+                frame = fade_out(frame, self._pos - self._fade_from, self._end - self._fade_from)
+            await self.send(frame)
+            self._pos += FRAME_BYTES
+            self._mark_first_audio()
+        self.finished = True
+        if not self._reply_waiting:
+            # Let it play out: the reply then starts on a fresh anchor instead of counting as late
+            await self.playout.drain()
+
+    async def stop(self, reply_starting=False):
+        """Stop the filler: right before the reply's first frame, and when the turn ends"""
+        if not self._task.done():
+            if reply_starting and self.started and not self.finished:
+                # Reply ready: finish the clip if it ends within the playout lead, else fade it out over the lead
+                self._reply_waiting = True
+                lead_bytes = int(self.playout.lead_s * 8000)
+                if self._end - self._pos > lead_bytes:
+                    self._fade_from = self._pos
+                    self._end = self._pos + lead_bytes
+                    self.bank.faded += 1
+                await asyncio.wait([self._task])
+            else:
+                self._task.cancel()
+                await asyncio.wait([self._task])
+                if not self.started:
+                    self.bank.skipped += 1
+                elif not self.finished:
+                    self.bank.cut += 1
+        if reply_starting:
+            self._mark_first_audio()
@@ -0,0 +1,262 @@
+"""
+Load-balanced routing over several Kyutai TTS backends
+
+Every backend (one moshi-server / GPU) gets its own pre-warmed
+KyutaiConnectionPool. A session goes to the healthy backend with the
+fewest outstanding sessions; ties go to the lowest recent TTFA, but
+backends within `ttfa_margin_ms` of it count as equal and take turns (so
+every backend keeps serving, and keeps being measured, at low load).
+
+- Health probes: every `probe_interval` s each backend synthesizes a
+  short phrase on a fresh connection; a failed probe or connection error
+  marks it down until a probe succeeds again.
+- TTFA ejection: time to first audio (from Eos) is tracked per backend as a fast
+  EWMA against a slow baseline; a backend whose recent TTFA rises past
+  `eject_ratio` × its baseline (and by at least `eject_min_ms`) is
+  ejected for `eject_s` s, then reinstated by a probe within range.
+- If every backend is down or ejected, sessions still go to the least
+  loaded one rather than failing the call.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import time
+
+import msgpack
+import websockets
+
+from kyutai_tts_pool import KyutaiConnectionPool
+
+
+EOS = msgpack.packb({"type": "Eos"})
+
+
+class TrackedSession:
+    """Kyutai WebSocket proxy that times Eos → first Audio (backend latency only)
+
+    Segments stream GPT words into the session as they come, so time from the
+    first Text would include GPT's token latency. The clock starts at Eos, once
+    the whole text is in; a session whose audio started before Eos (text
+    streamed slower than Kyutai speaks) gives no sample.
+    """
+
+    def __init__(self, ws, on_first_audio):
+        self._ws = ws
+        self._on_first_audio = on_first_audio
+        self._eos_at = None
+
+    async def send(self, message):
+        if self._eos_at is None and message == EOS:
+            self._eos_at = time.perf_counter()
+        await self._ws.send(message)
+
+    async def recv(self):
+        message = await self._ws.recv()
+        # Unpacked only until the first Audio message
+        if self._on_first_audio is not None and msgpack.unpackb(message).get("type") == "Audio":
+            if self._eos_at is not None:
+                self._on_first_audio((time.perf_counter() - self._eos_at) * 1000)
+            self._on_first_audio = None
+        return message
+
+    def __getattr__(self, name):
+        return getattr(self._ws, name)
+
+
+class KyutaiBackend:
+    """One moshi-server: its connection pool, load, TTFA and health"""
+
+    def __init__(self, url, pool):
+        self.url = url
+        self.pool = pool
+        self.outstanding = 0
+        self.healthy = True
+        self.ejected_until = 0.0
+        self.ttfa_ms = None          # fast EWMA: recent sessions
+        self.baseline_ms = None      # slow EWMA: what this backend normally does
+
+        self.routed = 0
+        self.errors = 0
+        self.ejections = 0
+        self.probes_ok = 0
+        self.probes_failed = 0
+
+    def available(self, now):
+        return self.healthy and now >= self.ejected_until
+
+    def stats(self, now):
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "ejected": now < self.ejected_until,
+            "outstanding": self.outstanding,
+            "routed": self.routed,
+            "errors": self.errors,
+            "ttfa_ms": round(self.ttfa_ms, 1) if self.ttfa_ms is not None else None,
+            "baseline_ms": round(self.baseline_ms, 1) if self.baseline_ms is not None else None,
+            "ejections": self.ejections,
+            "probes_ok": self.probes_ok,
+            "probes_failed": self.probes_failed,
+            "pool": self.pool.stats(),
+        }
+
+
+class KyutaiRouter:
+    """Same interface as KyutaiConnectionPool (warm / connection / stats / close), over N backends"""
+
+    def __init__(self, urls, api_key, size=2, max_idle=30.0, probe_interval=10.0, probe_text="Bonjour.",
+                 probe_timeout=5.0, eject_ratio=2.0, eject_min_ms=150.0, eject_s=30.0, ttfa_margin_ms=50.0,
+                 **connect_kwargs):
+        self.api_key = api_key
+        self.probe_interval = probe_interval   # 0 = no active probes
+        self.probe_text = probe_text
+        self.probe_timeout = probe_timeout
+        self.eject_ratio = eject_ratio
+        self.eject_min_ms = eject_min_ms
+        self.eject_s = eject_s
+        self.ttfa_margin_ms = ttfa_margin_ms
+        self.connect_kwargs = connect_kwargs
+
+        self.backends = [
+            KyutaiBackend(url, KyutaiConnectionPool(url, api_key, size=size, max_idle=max_idle, **connect_kwargs))
+            for url in urls
+        ]
+        self._turn = itertools.count()   # rotates ties between equally loaded backends
+        self._probe_keys = set()
+        self._prober = None
+        self.fallbacks = 0               # sessions routed while no backend was available
+
+    # ✅ Routing
+    def pick(self):
+        """Least outstanding sessions among available backends (ties: clearly lower TTFA, then rotation)"""
+        now = time.monotonic()
+        candidates = [backend for backend in self.backends if backend.available(now)]
+        if not candidates:
+            self.fallbacks += 1
+            candidates = [backend for backend in self.backends if backend.healthy] or self.backends
+        least = min(backend.outstanding for backend in candidates)
+        tied = [backend for backend in candidates if backend.outstanding == least]
+        # TTFA only breaks ties when the gap is real: a fraction of a ms must not pin every session to one backend
+        fastest = min((backend.ttfa_ms for backend in tied if backend.ttfa_ms is not None), default=None)
+        if fastest is not None:
+            tied = [backend for backend in tied
+                    if backend.ttfa_ms is None or backend.ttfa_ms - fastest <= self.ttfa_margin_ms]
+        offset = next(self._turn)
+        order = {id(backend): (i - offset) % len(self.backends) for i, backend in enumerate(self.backends)}
+        return min(tied, key=lambda b: order[id(b)])
+
+    def _record_ttfa(self, backend, ttfa_ms):
+        if backend.baseline_ms is None:
+            backend.ttfa_ms = backend.baseline_ms = ttfa_ms
+            return
+        backend.ttfa_ms = 0.7 * backend.ttfa_ms + 0.3 * ttfa_ms
+        backend.baseline_ms = 0.98 * backend.baseline_ms + 0.02 * ttfa_ms
+        if (backend.ttfa_ms > self.eject_ratio * backend.baseline_ms
+                and backend.ttfa_ms - backend.baseline_ms > self.eject_min_ms
+                and backend.available(time.monotonic())):
+            backend.ejected_until = time.monotonic() + self.eject_s
+            backend.ejections += 1
+            print(f"⏏️ Kyutai backend {backend.url} ejected for {self.eject_s:.0f}s: "
+                  f"TTFA {backend.ttfa_ms:.0f}ms vs {backend.baseline_ms:.0f}ms baseline")
+            # Start the recent window over: after the ejection it has to prove slow again
+            backend.ttfa_ms = backend.baseline_ms
+
+    def _mark_down(self, backend, error):
+        backend.errors += 1
+        if not self.probe_interval:
+            # No probe would ever bring it back: sit it out like a slow backend instead
+            backend.ejected_until = time.monotonic() + self.eject_s
+            print(f"🩺 Kyutai backend {backend.url} failed ({error}), skipped for {self.eject_s:.0f}s")
+        elif backend.healthy:
+            backend.healthy = False
+            print(f"🩺 Kyutai backend {backend.url} down: {error}")
+
+    def warm(self, voice, fmt):
+        for backend in self.backends:
+            backend.pool.warm(voice, fmt)
+        self._probe_keys.add((voice, fmt))
+        if self.probe_interval and self._prober is None:
+            self._prober = asyncio.create_task(self._probe_loop())
+
+    @contextlib.asynccontextmanager
+    async def connection(self, voice, fmt):
+        backend = self.pick()
+        try:
+            ws = await backend.pool.acquire(voice, fmt)
+        except Exception as e:
+            # Connection refused/reset: mark it down and try the next best backend once
+            self._mark_down(backend, e)
+            backend = self.pick()
+            ws = await backend.pool.acquire(voice, fmt)
+
+        backend.routed += 1
+        backend.outstanding += 1
+        try:
+            yield TrackedSession(ws, lambda ttfa_ms: self._record_ttfa(backend, ttfa_ms))
+        finally:
+            backend.outstanding -= 1
+            await backend.pool.retire(ws)
+
+    # ✅ Active health probes
+    async def probe(self, backend, voice, fmt):
+        """Short synthesis on a fresh connection; returns TTFA in ms, or None if the backend failed"""
+        try:
+            async with asyncio.timeout(self.probe_timeout):
+                async with websockets.connect(
+                    backend.pool.uri(voice, fmt),
+                    additional_headers={"kyutai-api-key": self.api_key},
+                    **self.connect_kwargs
+                ) as ws:
+                    start = time.perf_counter()
+                    await ws.send(msgpack.packb({"type": "Text", "text": self.probe_text}))
+                    await ws.send(msgpack.packb({"type": "Eos"}))
+                    ttfa_ms = None
+                    async for message in ws:
+                        msg = msgpack.unpackb(message)
+                        if msg.get("type") == "Audio" and ttfa_ms is None:
+                            ttfa_ms = (time.perf_counter() - start) * 1000
+                        elif msg.get("type") == "Done":
+                            break
+        except Exception as e:
+            backend.probes_failed += 1
+            self._mark_down(backend, e if str(e) else type(e).__name__)
+            return None
+        if ttfa_ms is None:
+            backend.probes_failed += 1
+            self._mark_down(backend, "no audio")
+            return None
+
+        backend.probes_ok += 1
+        if not backend.healthy:
+            backend.healthy = True
+            print(f"🩺 Kyutai backend {backend.url} back up (TTFA {ttfa_ms:.0f}ms)")
+        # Ejected backend answering within range again → reinstate with a fresh recent TTFA
+        now = time.monotonic()
+        if now < backend.ejected_until and (
+                backend.baseline_ms is None or ttfa_ms <= self.eject_ratio * backend.baseline_ms):
+            backend.ejected_until = now
+            backend.ttfa_ms = ttfa_ms
+            print(f"⏏️ Kyutai backend {backend.url} reinstated (probe TTFA {ttfa_ms:.0f}ms)")
+        return ttfa_ms
+
+    async def _probe_loop(self):
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            for voice, fmt in list(self._probe_keys):
+                await asyncio.gather(*(self.probe(backend, voice, fmt) for backend in self.backends))
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            "available": sum(1 for backend in self.backends if backend.available(now)),
+            "fallbacks": self.fallbacks,
+            "backends": [backend.stats(now) for backend in self.backends],
+        }
+
+    async def close(self):
+        if self._prober is not None:
+            self._prober.cancel()
+            self._prober = None
+        for backend in self.backends:
+            await backend.pool.close()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Kyutai TTS server (no GPU, no model)
+
+Speaks the moshi-server streaming protocol on /api/tts_streaming:
+msgpack `Text` / `Eos` in, `Audio` (24kHz float `pcm` list) / `Done`
+out, and rejects connections without the right `kyutai-api-key`
+header. The audio is a quiet tone whose length follows the text
+(`chars_per_second`, letters), produced with a configurable timing model:
+
+    ttfa_ms        first Text → first Audio
+    rtf            generation time / audio time (0.44 ≈ the L4 GPU measured here)
+    chunk_samples  PCM samples per Audio message (1920 = 80ms, like Kyutai)
+    jitter_ms      random extra delay (0…jitter) before every message
+    slowdown       each additional concurrent session makes everything
+                   (1 + slowdown) times slower: factor 1 + slowdown × (sessions − 1)
+
+Audio starts before Eos and never runs ahead of the text received so far,
+so word-by-word senders (the call servers) behave as with the real server.
+
+    python kyutai_stand_in.py --port 8080 --ttfa-ms 250 --rtf 0.44 --slowdown 0.05
+    KYUTAI_TTS_URLS=ws://127.0.0.1:8080/api/tts_streaming python twilio_kyutai_tts.py
+"""
+
+import argparse
+import asyncio
+import http
+import math
+import random
+
+import msgpack
+import websockets
+
+SAMPLE_RATE = 24000
+
+
+class KyutaiStandIn:
+    """Kyutai-protocol TTS server with a synthetic, configurable timing model"""
+
+    def __init__(self, ttfa_ms=250.0, rtf=0.44, chunk_samples=1920, jitter_ms=0.0, slowdown=0.0,
+                 chars_per_second=12.0, api_key="public_token", seed=None):
+        self.ttfa_ms = ttfa_ms
+        self.rtf = rtf
+        self.chunk_samples = chunk_samples
+        self.jitter_ms = jitter_ms
+        self.slowdown = slowdown
+        self.chars_per_second = chars_per_second
+        self.api_key = api_key
+        self._random = random.Random(seed)
+        self._server = None
+
+        self.active = 0
+        self.active_max = 0
+        self.sessions = 0
+        self.rejected = 0
+        self.audio_s = 0.0
+
+    def factor(self):
+        """Slowdown from the other sessions generating right now"""
+        return 1.0 + self.slowdown * max(0, self.active - 1)
+
+    def _jitter(self):
+        return self._random.uniform(0, self.jitter_ms) / 1000 if self.jitter_ms else 0.0
+
+    def _check_request(self, connection, request):
+        if request.headers.get("kyutai-api-key") != self.api_key:
+            self.rejected += 1
+            return connection.respond(http.HTTPStatus.UNAUTHORIZED, "Invalid kyutai-api-key\n")
+        return None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """Listen; returns the bound port (port 0 picks a free one)"""
+        self._server = await websockets.serve(self._session, host, port, process_request=self._check_request,
+                                              ping_interval=None)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _session(self, ws):
+        loop = asyncio.get_running_loop()
+        text = {"chars": 0, "eos": False}
+        arrived = asyncio.Event()
+
+        async def receive():
+            try:
+                async for message in ws:
+                    msg = msgpack.unpackb(message)
+                    if msg.get("type") == "Text":
+                        text["chars"] += len("".join(msg.get("text", "").split()))   # letters, not spaces
+                    elif msg.get("type") == "Eos":
+                        text["eos"] = True
+                    arrived.set()
+                    if text["eos"]:
+                        return
+            finally:
+                arrived.set()   # client gone: wake the generator
+
+        receiver = asyncio.create_task(receive())
+        try:
+            await arrived.wait()
+            if receiver.done() and not text["eos"]:
+                return
+            self.sessions += 1
+            self.active += 1
+            self.active_max = max(self.active_max, self.active)
+            try:
+                await self._generate(ws, text, arrived, receiver, loop)
+            finally:
+                self.active -= 1
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            receiver.cancel()
+
+    async def _generate(self, ws, text, arrived, receiver, loop):
+        due = loop.time() + self.ttfa_ms / 1000 * self.factor() + self._jitter()
+        sent = 0
+        phase = 0
+        while True:
+            available = int(text["chars"] / self.chars_per_second * SAMPLE_RATE)
+            samples = min(self.chunk_samples, available - sent)
+            # Before Eos only full chunks; after it, whatever is left of the text
+            if samples <= 0 or (samples < self.chunk_samples and not text["eos"]):
+                if text["eos"] or receiver.done():
+                    break
+                arrived.clear()
+                await arrived.wait()
+                due = max(due, loop.time())   # waiting for text earns no head start
+                continue
+
+            await asyncio.sleep(max(0.0, due - loop.time()))
+            pcm = [0.1 * math.sin(2 * math.pi * 220 * (phase + i) / SAMPLE_RATE) for i in range(samples)]
+            phase += samples
+            await ws.send(msgpack.packb({"type": "Audio", "pcm": pcm}))
+            sent += samples
+            self.audio_s += samples / SAMPLE_RATE
+            due += samples / SAMPLE_RATE * self.rtf * self.factor() + self._jitter()
+
+        if text["eos"]:
+            await asyncio.sleep(max(0.0, due - loop.time()))
+            await ws.send(msgpack.packb({"type": "Done"}))
+
+    def stats(self):
+        return {
+            "sessions": self.sessions,
+            "active": self.active,
+            "active_max": self.active_max,
+            "rejected": self.rejected,
+            "audio_s": round(self.audio_s, 1),
+        }
+
+
+async def serve(stand_in, host, port):
+    port = await stand_in.start(host, port)
+    print(f"🧪 Kyutai stand-in at ws://{host}:{port}/api/tts_streaming "
+          f"(TTFA {stand_in.ttfa_ms:.0f}ms, RTF {stand_in.rtf}, slowdown {stand_in.slowdown}/session)")
+    try:
+        await asyncio.Future()
+    finally:
+        await stand_in.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kyutai TTS stand-in server (synthetic audio, configurable timing)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--api-key", default="public_token")
+    parser.add_argument("--ttfa-ms", type=float, default=250.0, help="first Text → first Audio")
+    parser.add_argument("--rtf", type=float, default=0.44, help="generation time / audio time")
+    parser.add_argument("--chunk-samples", type=int, default=1920, help="24kHz samples per Audio message")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra delay per message (0…jitter)")
+    parser.add_argument("--slowdown", type=float, default=0.0, help="extra slowdown per concurrent session")
+    parser.add_argument("--chars-per-second", type=float, default=12.0, help="speaking rate (letters per second of audio)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    stand_in = KyutaiStandIn(args.ttfa_ms, args.rtf, args.chunk_samples, args.jitter_ms, args.slowdown,
+                             args.chars_per_second, args.api_key, args.seed)
+    try:
+        asyncio.run(serve(stand_in, args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"📊 Kyutai stand-in: {stand_in.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Pre-warmed Kyutai TTS WebSocket connection pool
+
+Keeps N ready connections per (voice, format) so a reply does not pay
+TCP setup, the WebSocket upgrade and server-side session setup.
+Kyutai sessions are single-use: a connection is retired (closed) after
+its Eos/Done and a background task opens a replacement.
+"""
+
+import contextlib
+
+import websockets
+from websockets.protocol import State
+
+from warm_pool import WarmPool
+
+
+class KyutaiConnectionPool(WarmPool):
+    """Hands out ready Kyutai TTS connections and refills them in the background"""
+
+    label = "Kyutai"
+
+    def __init__(self, url, api_key, size=2, max_idle=30.0, **connect_kwargs):
+        super().__init__(size, max_idle, refill_interval=max_idle / 2)
+        self.url = url
+        self.api_key = api_key
+        self.connect_kwargs = connect_kwargs
+
+    def uri(self, voice, fmt):
+        return f"{self.url}?voice={voice}&format={fmt}"
+
+    async def _open(self, key):
+        return await websockets.connect(
+            self.uri(*key),
+            additional_headers={"kyutai-api-key": self.api_key},
+            **self.connect_kwargs
+        )
+
+    def _is_open(self, ws):
+        return ws.state is State.OPEN
+
+    def warm(self, voice, fmt):
+        """Start keeping `size` connections ready for (voice, format)"""
+        self._warm((voice, fmt))
+
+    async def acquire(self, voice, fmt):
+        """Return a ready connection (pool hit) or open a new one (pool miss)"""
+        return await self._acquire((voice, fmt))
+
+    @contextlib.asynccontextmanager
+    async def connection(self, voice, fmt):
+        ws = await self.acquire(voice, fmt)
+        try:
+            yield ws
+        finally:
+            await self.retire(ws)
@@ -0,0 +1,165 @@
+"""
+Per-stage latency histograms, exported in Prometheus text format
+
+Where does dead air come from? Every turn records:
+
+    stt_final            end of caller speech → Deepgram final transcript
+    final_to_turn        final submitted → its turn starts (previous reply still running)
+    gpt_first_token      final submitted → first GPT word
+    kyutai_first_audio   first GPT word (final for cached answers) → first Kyutai audio
+    first_frame          final submitted → first reply frame sent to Twilio
+    turn_total           final submitted → reply fully played
+    conversion_wait      conversion job queued → started (audio_offload)
+    conversion_compute   resample + μ-law time of one job
+
+Histograms have fixed buckets: recording is one bisect and three
+additions (well under a microsecond or two), so it can stay on in
+production. The server exposes them on a sidecar HTTP port
+(GET /metrics) — one port per worker process.
+"""
+
+import math
+import time
+from bisect import bisect_left
+
+from aiohttp import web
+
+# Upper bounds in ms (Prometheus `le`, exported in seconds)
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 75, 100, 150, 200, 300, 400, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000)
+
+TURN_STAGES = ("stt_final", "final_to_turn", "gpt_first_token", "kyutai_first_audio", "first_frame", "turn_total",
+               "conversion_wait", "conversion_compute")
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list (exact, for offline reports; Histogram for live stats)"""
+    if not values:
+        return None
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+class Histogram:
+    """Fixed-bucket histogram of millisecond samples"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=DEFAULT_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)   # last bucket: above every bound (+Inf)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, ms):
+        self.counts[bisect_left(self.bounds, ms)] += 1
+        self.sum += ms
+        self.count += 1
+
+    def quantile(self, q):
+        """Approximate quantile: upper bound of the bucket holding it (inf past the last bound)"""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class LatencyMetrics:
+    """Stage histograms and gauges of one server process"""
+
+    def __init__(self, stages=TURN_STAGES, buckets=DEFAULT_BUCKETS_MS, prefix="voicebot"):
+        self.prefix = prefix
+        self.histograms = {stage: Histogram(buckets) for stage in stages}
+        self._gauges = {}    # name → (help, read())
+        self._runner = None
+
+    def observe(self, stage, ms):
+        self.histograms[stage].observe(ms)
+
+    def gauge(self, name, help_text, read):
+        """Value read at scrape time (active calls, sessions in flight, …)"""
+        self._gauges[name] = (help_text, read)
+
+    def render(self):
+        """Prometheus text exposition format"""
+        name = f"{self.prefix}_stage_latency_seconds"
+        lines = [
+            f"# HELP {name} Latency of each voice pipeline stage per turn",
+            f"# TYPE {name} histogram",
+        ]
+        for stage, histogram in self.histograms.items():
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum / 1000:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        for gauge, (help_text, read) in self._gauges.items():
+            lines.append(f"# HELP {self.prefix}_{gauge} {help_text}")
+            lines.append(f"# TYPE {self.prefix}_{gauge} gauge")
+            lines.append(f"{self.prefix}_{gauge} {read()}")
+        return "\n".join(lines) + "\n"
+
+    async def serve(self, host, port):
+        """Sidecar HTTP server: GET /metrics"""
+        async def metrics(request):
+            return web.Response(text=self.render(), content_type="text/plain", charset="utf-8",
+                                headers={"X-Prometheus-Format": "0.0.4"})
+
+        app = web.Application()
+        app.router.add_get("/metrics", metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self):
+        return {
+            stage: {"count": h.count, "p50": h.quantile(0.5), "p95": h.quantile(0.95)}
+            for stage, h in self.histograms.items() if h.count
+        }
+
+
+class TurnTimer:
+    """Stage marks of one turn, recorded into the histograms when the turn ends
+
+    `queued_ms`: how long the final waited in the turn manager before this
+    turn started; the stages are measured from the final, not the turn start.
+    """
+
+    def __init__(self, metrics, queued_ms=0.0):
+        self.metrics = metrics
+        self.queued_ms = queued_ms
+        self.start = time.perf_counter() - queued_ms / 1000
+        self.marks = {}
+
+    def mark(self, name):
+        """First time only: 'gpt', 'audio' or 'frame'"""
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter()
+
+    async def first_word(self, words):
+        """Pass a GPT word stream through, marking its first word"""
+        async for word in words:
+            self.mark("gpt")
+            yield word
+
+    def finish(self, complete=True):
+        """Record the stages this turn reached (total only if it played to the end)"""
+        observe, marks = self.metrics.observe, self.marks
+        observe("final_to_turn", self.queued_ms)
+        if "gpt" in marks:
+            observe("gpt_first_token", (marks["gpt"] - self.start) * 1000)
+        if "audio" in marks:
+            observe("kyutai_first_audio", (marks["audio"] - marks.get("gpt", self.start)) * 1000)
+        if "frame" in marks:
+            observe("first_frame", (marks["frame"] - self.start) * 1000)
+        if complete:
+            observe("turn_total", (time.perf_counter() - self.start) * 1000)
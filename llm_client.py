@@ -0,0 +1,135 @@
+"""
+Async OpenAI client with a shared, bounded keep-alive connection pool
+
+Replaces the sync `OpenAI` client wrapped in `asyncio.to_thread`: no
+executor thread per request, one process-wide HTTP pool, and per-request
+timing so LLM latency can be told apart from local contention:
+
+- queue: waiting for a free pool slot (local contention)
+- ttfb:  request sent → first streamed token (LLM latency)
+- total: request sent → last token
+"""
+
+import asyncio
+import time
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+
+class LLMClient:
+    """Shared AsyncOpenAI client with pool-slot accounting and request timings"""
+
+    def __init__(self, api_key, model="gpt-4o", max_connections=20, keepalive_expiry=30.0, timeout=20.0,
+                 base_url=None):
+        self.model = model
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,   # None: api.openai.com (or OPENAI_BASE_URL)
+            timeout=timeout,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_expiry,
+                )
+            ),
+        )
+        # Same bound as the HTTP pool, so time spent waiting for a connection is measurable
+        self._slots = asyncio.Semaphore(max_connections)
+
+        # Process-wide counters (running totals, not per-request lists)
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.queue_ms_total = 0.0
+        self.queue_ms_max = 0.0
+        self.ttfb_ms_total = 0.0
+        self.ttfb_count = 0
+        self.total_ms_total = 0.0
+
+    def _record(self, queued_at, sent_at, first_token_at):
+        queue_ms = (sent_at - queued_at) * 1000
+        total_ms = (time.perf_counter() - sent_at) * 1000
+        self.requests += 1
+        self.queue_ms_total += queue_ms
+        self.queue_ms_max = max(self.queue_ms_max, queue_ms)
+        self.total_ms_total += total_ms
+
+        ttfb = "-"
+        if first_token_at is not None:
+            ttfb_ms = (first_token_at - sent_at) * 1000
+            self.ttfb_ms_total += ttfb_ms
+            self.ttfb_count += 1
+            ttfb = f"{ttfb_ms:.0f}ms"
+        print(f"⏱️ GPT: queue {queue_ms:.0f}ms, TTFB {ttfb}, total {total_ms:.0f}ms")
+
+    async def complete(self, messages, max_tokens=100):
+        """Full reply in one response"""
+        queued_at = time.perf_counter()
+        async with self._slots:
+            sent_at = time.perf_counter()
+            self.in_flight += 1
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model, messages=messages, max_tokens=max_tokens
+                )
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self.in_flight -= 1
+            # Non-streamed: the first byte is the whole reply
+            self._record(queued_at, sent_at, time.perf_counter())
+            return response.choices[0].message.content
+
+    async def stream(self, messages, max_tokens=100, usage=None):
+        """Yield content deltas as GPT produces them
+
+        `usage`, if given, is a dict whose "tokens" is kept up to date with the
+        completion tokens received so far (exact once the stream completes)
+        """
+        queued_at = time.perf_counter()
+        async with self._slots:
+            sent_at = time.perf_counter()
+            first_token_at = None
+            self.in_flight += 1
+            try:
+                extra = {"stream_options": {"include_usage": True}} if usage is not None else {}
+                stream = await self.client.chat.completions.create(
+                    model=self.model, messages=messages, max_tokens=max_tokens, stream=True, **extra
+                )
+                try:
+                    async for chunk in stream:
+                        if usage is not None and getattr(chunk, "usage", None):
+                            usage["tokens"] = chunk.usage.completion_tokens
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            if first_token_at is None:
+                                first_token_at = time.perf_counter()
+                            if usage is not None:
+                                usage["tokens"] += 1   # ~one token per streamed chunk until the exact count arrives
+                            yield chunk.choices[0].delta.content
+                finally:
+                    # Also runs on cancellation (barge-in): frees the HTTP connection at once
+                    await stream.close()
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self.in_flight -= 1
+            self._record(queued_at, sent_at, first_token_at)
+
+    def stats(self):
+        requests = self.requests or 1
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "queue_ms_avg": round(self.queue_ms_total / requests, 1),
+            "queue_ms_max": round(self.queue_ms_max, 1),
+            "ttfb_ms_avg": round(self.ttfb_ms_total / self.ttfb_count, 1) if self.ttfb_count else 0.0,
+            "total_ms_avg": round(self.total_ms_total / requests, 1),
+        }
+
+    async def close(self):
+        await self.client.close()
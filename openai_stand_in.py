@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI chat completions API (no model)
+
+Serves POST /v1/chat/completions in the OpenAI wire format, streamed
+(server-sent events, with `stream_options.include_usage`) or not, so
+the real `openai` client in llm_client.py talks to it unchanged:
+
+    ttft_ms            request → first token (whole reply, if not streamed)
+    token_interval_ms  time between streamed tokens
+    reply              scripted replies, one per request in turn; by default
+                       an echo of the caller's last message
+
+Each word of the reply is one token. `max_tokens` cuts the reply short
+like the real API (finish_reason "length").
+
+    python openai_stand_in.py --port 8092 --ttft-ms 300 --token-interval-ms 25
+    OPENAI_BASE_URL=http://127.0.0.1:8092/v1 python twilio_kyutai_tts.py
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+import uuid
+
+from aiohttp import web
+
+
+class OpenAIStandIn:
+    """OpenAI-compatible chat completions endpoint with scripted replies and configurable latency"""
+
+    def __init__(self, replies=None, ttft_ms=300.0, token_interval_ms=25.0, api_key=None):
+        self.replies = list(replies or [])
+        self.ttft_ms = ttft_ms
+        self.token_interval_ms = token_interval_ms
+        self.api_key = api_key         # None: any bearer token
+        self._turn = itertools.count()
+        self._runner = None
+
+        self.requests = 0
+        self.streamed = 0
+        self.active = 0
+        self.active_max = 0
+        self.rejected = 0
+        self.tokens = 0
+
+    def reply_for(self, messages):
+        if self.replies:
+            return self.replies[next(self._turn) % len(self.replies)]
+        said = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        return f"Vous avez dit : {said}. Que puis-je faire d'autre pour vous ?"
+
+    async def start(self, host="127.0.0.1", port=8092):
+        """Listen; returns the bound port (port 0 picks a free one)"""
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._completions)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return self._runner.addresses[0][1]
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _completions(self, request):
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer ") or (self.api_key is not None and authorization != f"Bearer {self.api_key}"):
+            self.rejected += 1
+            return web.json_response({"error": {"message": "Incorrect API key provided", "type": "invalid_request_error",
+                                                "code": "invalid_api_key"}}, status=401)
+        body = await request.json()
+        words = self.reply_for(body.get("messages", [])).split()
+        max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+        finish_reason = "stop"
+        if max_tokens is not None and len(words) > max_tokens:
+            words, finish_reason = words[:max_tokens], "length"
+        tokens = [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+        self.requests += 1
+        self.active += 1
+        self.active_max = max(self.active_max, self.active)
+        try:
+            base = {"id": f"chatcmpl-{uuid.uuid4().hex[:24]}", "created": int(time.time()), "model": body.get("model", "gpt-4o")}
+            usage = {"prompt_tokens": sum(len(str(m.get("content", "")).split()) for m in body.get("messages", [])),
+                     "completion_tokens": len(tokens)}
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            if body.get("stream"):
+                self.streamed += 1
+                return await self._stream(request, base, tokens, finish_reason, usage,
+                                          (body.get("stream_options") or {}).get("include_usage", False))
+
+            await asyncio.sleep(self.ttft_ms / 1000 + self.token_interval_ms / 1000 * max(0, len(tokens) - 1))
+            self.tokens += len(tokens)
+            return web.json_response({
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                             "finish_reason": finish_reason}],
+                "usage": usage,
+            })
+        finally:
+            self.active -= 1
+
+    async def _stream(self, request, base, tokens, finish_reason, usage, include_usage):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        async def event(choices, **extra):
+            chunk = {**base, "object": "chat.completion.chunk", "choices": choices, **extra}
+            await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+        await asyncio.sleep(self.ttft_ms / 1000)
+        await event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(self.token_interval_ms / 1000)
+            await event([{"index": 0, "delta": {"content": token}, "finish_reason": None}])
+            self.tokens += 1
+        await event([{"index": 0, "delta": {}, "finish_reason": finish_reason}])
+        if include_usage:
+            await event([], usage=usage)
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "streamed": self.streamed,
+            "active": self.active,
+            "active_max": self.active_max,
+            "rejected": self.rejected,
+            "tokens": self.tokens,
+        }
+
+
+async def serve(stand_in, host, port):
+    port = await stand_in.start(host, port)
+    print(f"🧪 OpenAI stand-in at http://{host}:{port}/v1 "
+          f"(first token {stand_in.ttft_ms:.0f}ms, then every {stand_in.token_interval_ms:.0f}ms)")
+    try:
+        await asyncio.Future()
+    finally:
+        await stand_in.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OpenAI chat completions stand-in (scripted replies)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8092)
+    parser.add_argument("--api-key", default=None, help="accept only this key (default: any)")
+    parser.add_argument("--reply", action="append", help="scripted reply (repeat for several, used in turn; default: echo)")
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="request → first token")
+    parser.add_argument("--token-interval-ms", type=float, default=25.0, help="between streamed tokens")
+    args = parser.parse_args(argv)
+
+    stand_in = OpenAIStandIn(args.reply, args.ttft_ms, args.token_interval_ms, args.api_key)
+    try:
+        asyncio.run(serve(stand_in, args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"📊 OpenAI stand-in: {stand_in.stats()}")
+
+
+if __name__ == "__main__":
+    main()
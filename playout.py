@@ -0,0 +1,88 @@
+"""
+Drift-free playout clock for outbound Twilio media frames
+
+Frames are paced against absolute loop.time() deadlines (anchor + n × 20ms)
+instead of `sleep(0.02)` after every send, so send time and scheduler lag
+never accumulate. The clock keeps up to `lead_ms` of audio queued at
+Twilio (burst-ahead): it sleeps until only half the lead is left and then
+sends a burst, which wakes the server far less than 50 times a second.
+"""
+
+import asyncio
+
+
+class PlayoutClock:
+    """Per-call pacing of 20ms μ-law frames with drift and late-frame counters"""
+
+    def __init__(self, frame_ms=20, lead_ms=100, late_tolerance_ms=5):
+        self.frame_s = frame_ms / 1000
+        self.lead_s = lead_ms / 1000
+        self.late_tolerance_s = late_tolerance_ms / 1000
+
+        self._anchor = None      # loop time at which frame 0 of the current reply plays
+        self._next_frame = 0     # index of the next frame in the current reply
+        self._reply_start = None
+
+        self.frames = 0
+        self.late_frames = 0
+        self.max_late_ms = 0.0
+        self.gap_ms = 0.0        # total silence inserted because frames arrived late
+        self.wakeups = 0
+        self.replies = 0
+        self.drift_ms = 0.0      # last reply: wall time - audio time
+
+    def reset(self):
+        """Start a new reply: the next frame plays as soon as it is sent"""
+        self._anchor = None
+
+    def _deadline(self):
+        return self._anchor + self._next_frame * self.frame_s
+
+    async def wait(self):
+        """Wait until the next frame may be sent, then account for it"""
+        now = asyncio.get_running_loop().time()
+        if self._anchor is None:
+            self._anchor = now
+            self._next_frame = 0
+            self._reply_start = now
+            self.replies += 1
+
+        deadline = self._deadline()
+        if now - deadline > self.late_tolerance_s:
+            # Underrun: the caller already heard silence, re-anchor on this frame
+            late_s = now - deadline
+            self.late_frames += 1
+            self.max_late_ms = max(self.max_late_ms, late_s * 1000)
+            self.gap_ms += late_s * 1000
+            self._anchor += late_s
+        elif deadline - now > self.lead_s:
+            # Far enough ahead: sleep until half the lead is left, then burst
+            await asyncio.sleep(deadline - now - self.lead_s / 2)
+            self.wakeups += 1
+
+        self._next_frame += 1
+        self.frames += 1
+
+    async def drain(self):
+        """Wait until everything sent for the current reply has played out"""
+        if self._anchor is None:
+            return
+        loop = asyncio.get_running_loop()
+        remaining = self._deadline() - loop.time()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+            self.wakeups += 1
+        audio_s = self._next_frame * self.frame_s
+        self.drift_ms = ((loop.time() - self._reply_start) - audio_s) * 1000
+        self._anchor = None
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "replies": self.replies,
+            "late_frames": self.late_frames,
+            "max_late_ms": round(self.max_late_ms, 1),
+            "gap_ms": round(self.gap_ms, 1),
+            "drift_ms": round(self.drift_ms, 1),
+            "wakeups_per_s": round(self.wakeups / (self.frames * self.frame_s), 1) if self.frames else 0.0,
+        }
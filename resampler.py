@@ -0,0 +1,75 @@
+"""
+Streaming polyphase 24kHz → 8kHz resampler
+
+Decimate-by-3 FIR filter that keeps its history between chunks, so every
+Kyutai frame can be resampled as it arrives with no seams. Only every 3rd
+output is computed (polyphase), and the cost of a chunk depends only on
+its length and the filter length, not on how much audio came before.
+"""
+
+import numpy as np
+
+# ✅ Filter presets: (taps, Kaiser beta)
+FILTER_PRESETS = {
+    "low_latency": (48, 5.0),     # ~1ms group delay, -28dB at 4kHz, -55dB above 4.4kHz
+    "high_quality": (144, 8.0),   # ~3ms group delay, -85dB above 4kHz
+}
+
+
+def design_lowpass(taps, beta, cutoff_hz, sample_rate):
+    """Kaiser-windowed sinc low-pass FIR with unity DC gain"""
+    n = np.arange(taps) - (taps - 1) / 2
+    h = np.sinc(2 * cutoff_hz / sample_rate * n) * np.kaiser(taps, beta)
+    return (h / h.sum()).astype(np.float32)
+
+
+class PolyphaseDecimator:
+    """Stateful decimate-by-`factor` FIR resampler for chunked float audio"""
+
+    def __init__(self, quality="high_quality", factor=3, input_rate=24000, cutoff_hz=3400):
+        if quality not in FILTER_PRESETS:
+            raise ValueError(f"❌ Unknown resampler quality '{quality}' (choose from {', '.join(FILTER_PRESETS)})")
+        taps, beta = FILTER_PRESETS[quality]
+        self.factor = factor
+        self.taps = taps
+        # Reversed so each output is a plain dot product with its input window
+        self._kernel = design_lowpass(taps, beta, cutoff_hz, input_rate)[::-1].copy()
+        # Filter history (taps - 1 samples) + input not yet consumed by an output
+        self._buffer = np.zeros(taps - 1, dtype=np.float32)
+
+    @property
+    def delay_samples(self):
+        """Group delay in input samples"""
+        return (self.taps - 1) / 2
+
+    def process(self, samples):
+        """Resample one chunk; returns float32 output at input_rate / factor"""
+        buffer = np.concatenate((self._buffer, np.asarray(samples, dtype=np.float32)))
+        count = (len(buffer) - self.taps) // self.factor + 1
+        if count <= 0:
+            self._buffer = buffer
+            return np.zeros(0, dtype=np.float32)
+
+        # One window per output sample, stepping `factor` input samples at a time
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, self.taps)[::self.factor][:count]
+        output = windows @ self._kernel
+
+        self._buffer = buffer[count * self.factor:]
+        return output
+
+    def flush(self):
+        """Push out the samples still held back by the filter delay"""
+        pad = int(np.ceil(self.delay_samples))
+        output = self.process(np.zeros(pad, dtype=np.float32))
+        self.reset()
+        return output
+
+    def reset(self):
+        self._buffer = np.zeros(self.taps - 1, dtype=np.float32)
+
+
+# ✅ One-shot resampling of a whole buffer
+def resample_24k_to_8k(samples, quality="high_quality"):
+    """Resample a complete 24kHz float buffer to 8kHz"""
+    decimator = PolyphaseDecimator(quality)
+    return np.concatenate((decimator.process(samples), decimator.flush()))
@@ -0,0 +1,175 @@
+"""
+Response cache in front of GPT for recurring questions
+
+Most calls ask the same few hundred questions, and the bot has no
+conversation history, so the answer only depends on the question. A final
+transcript is normalized (case, accents, punctuation, spoken fillers) and
+looked up:
+
+- exact:  same normalized text
+- fuzzy:  best token-set (Jaccard) similarity ≥ threshold, candidates
+          found through an inverted token index (no scan of every entry)
+
+Entries expire after a TTL and the least recently used are evicted past
+`max_entries`. Pinned entries (FAQ answers) never expire. Per-entry hit
+counts show which answers are worth pinning.
+"""
+
+import json
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+
+# Hesitations Deepgram transcribes but that never change the question
+SPOKEN_FILLERS = {"euh", "heu", "euhm", "hum", "hmm", "mmh", "bah", "ben", "beh", "hein"}
+
+
+def normalize_utterance(text):
+    """'Euh… Quels sont vos HORAIRES ?' → 'quels sont vos horaires'"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    words = re.findall(r"\w+", text)
+    return " ".join(w for w in words if w not in SPOKEN_FILLERS)
+
+
+class ResponseCache:
+    """In-memory question → answer cache with exact and fuzzy lookup"""
+
+    def __init__(self, ttl=3600.0, max_entries=1000, fuzzy_threshold=0.85):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.fuzzy_threshold = fuzzy_threshold   # 0 = exact matches only
+
+        self._entries = OrderedDict()   # normalized question → entry dict, least recently used first
+        self._index = {}                # token → set of normalized questions
+
+        self.lookups = 0
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.stored = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expired(self, entry, now):
+        return not entry["pinned"] and now - entry["stored_at"] > self.ttl
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        for token in entry["tokens"]:
+            keys = self._index.get(token)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[token]
+
+    def _fuzzy(self, tokens, now):
+        # Only entries sharing at least one token can reach the threshold
+        candidates = set()
+        for token in tokens:
+            candidates |= self._index.get(token, set())
+
+        best_key, best_score = None, 0.0
+        for key in candidates:
+            entry = self._entries[key]
+            if self._expired(entry, now):
+                continue
+            score = len(tokens & entry["tokens"]) / len(tokens | entry["tokens"])
+            if score > best_score:
+                best_key, best_score = key, score
+        if best_score >= self.fuzzy_threshold:
+            return best_key, best_score
+        return None, best_score
+
+    def lookup(self, question):
+        """Cached answer for this question, or None"""
+        self.lookups += 1
+        key = normalize_utterance(question)
+        if not key:
+            return None
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None and self._expired(entry, now):
+            self._remove(key)
+            self.expired += 1
+            entry = None
+
+        if entry is not None:
+            self.exact_hits += 1
+        elif self.fuzzy_threshold > 0:
+            key, score = self._fuzzy(set(key.split()), now)
+            if key is None:
+                return None
+            entry = self._entries[key]
+            self.fuzzy_hits += 1
+            print(f"📚 Fuzzy match ({score:.2f}): '{question}' → '{entry['question']}'")
+        else:
+            return None
+
+        entry["hits"] += 1
+        entry["last_hit"] = now
+        self._entries.move_to_end(key)
+        return entry["answer"]
+
+    def store(self, question, answer, pinned=False):
+        """Remember the answer to a question (pinned: never expires or gets evicted)"""
+        key = normalize_utterance(question)
+        if not key or not answer:
+            return
+        if key in self._entries:
+            pinned = pinned or self._entries[key]["pinned"]
+            self._remove(key)
+
+        tokens = frozenset(key.split())
+        self._entries[key] = {
+            "question": question,
+            "answer": answer,
+            "tokens": tokens,
+            "pinned": pinned,
+            "stored_at": time.monotonic(),
+            "hits": 0,
+            "last_hit": None,
+        }
+        for token in tokens:
+            self._index.setdefault(token, set()).add(key)
+        self.stored += 1
+
+        # Evict least recently used unpinned entries
+        for old_key in list(self._entries):
+            if len(self._entries) <= self.max_entries:
+                break
+            if not self._entries[old_key]["pinned"]:
+                self._remove(old_key)
+                self.evicted += 1
+
+    def load_faq(self, path):
+        """Pin answers from a JSON file: [{"question": ..., "answer": ...}, ...]"""
+        with open(path, encoding="utf-8") as f:
+            faq = json.load(f)
+        for item in faq:
+            self.store(item["question"], item["answer"], pinned=True)
+        return len(faq)
+
+    def top(self, n=5):
+        """Most-hit entries: (question, hits, pinned) — candidates for pinning"""
+        ranked = sorted(self._entries.values(), key=lambda entry: entry["hits"], reverse=True)
+        return [(entry["question"], entry["hits"], entry["pinned"]) for entry in ranked[:n] if entry["hits"]]
+
+    def stats(self):
+        hits = self.exact_hits + self.fuzzy_hits
+        return {
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "hit_rate": hits / self.lookups if self.lookups else 0.0,
+            "entries": len(self._entries),
+            "pinned": sum(1 for entry in self._entries.values() if entry["pinned"]),
+            "stored": self.stored,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "top": self.top(),
+        }
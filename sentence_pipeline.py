@@ -0,0 +1,221 @@
+"""
+Sentence-level TTS pipelining
+
+A reply is cut at sentence (and long-clause) boundaries and every segment
+gets its own short Kyutai session. Segment 1 plays while segment 2 is
+synthesized; `lookahead` bounds how many segments may be synthesized
+ahead of the one playing, so a long answer never holds GPU sessions far
+ahead of playback (or wastes them on a barge-in). Timeouts apply per
+segment, so long answers are no longer cut off by a whole-reply limit.
+
+A segment's session starts on its first word, and the words after it go
+to Kyutai as GPT streams them (an async word iterator per segment): the
+sentence boundary only decides where the next session starts, so the
+first audio never waits for GPT's whole first sentence.
+
+Per segment: text ready → synthesis start (look-ahead wait) → first
+audio → synthesis done, and playout start → playout end, relative to the
+start of the reply.
+"""
+
+import asyncio
+import re
+
+FRAME_BYTES = 160   # 20ms of 8kHz μ-law
+
+SENTENCE_END = re.compile(r"[.!?…]+[\"»)]*$")
+CLAUSE_END = re.compile(r"[,;:]$")
+
+
+async def iter_words(text):
+    for word in text.split():
+        yield word
+
+
+def segment_ends(segment, word, min_clause_words=8, max_words=30):
+    """True when `word` (already appended to `segment`) closes it: sentence end, or , ; : in a long one"""
+    return bool(SENTENCE_END.search(word)
+                or len(segment) >= max_words
+                or (len(segment) >= min_clause_words and CLAUSE_END.search(word)))
+
+
+async def split_segments(words, min_clause_words=8, max_words=30):
+    """Group a word stream into sentences; long sentences also break at , ; :"""
+    segment = []
+    async for word in words:
+        segment.append(word)
+        if segment_ends(segment, word, min_clause_words, max_words):
+            yield " ".join(segment)
+            segment = []
+    if segment:
+        yield " ".join(segment)
+
+
+class SegmentWords:
+    """Words of one segment as they arrive: an async iterator for Kyutai, the full text once closed"""
+
+    def __init__(self):
+        self.words = []
+        self._queue = asyncio.Queue()
+
+    def add(self, word):
+        self.words.append(word)
+        self._queue.put_nowait(word)
+
+    def close(self):
+        self._queue.put_nowait(None)
+
+    async def __aiter__(self):
+        while (word := await self._queue.get()) is not None:
+            yield word
+
+    def __str__(self):
+        return " ".join(self.words)
+
+
+class SentencePipeline:
+    """One reply: segment → synthesize (bounded look-ahead) → play in order"""
+
+    def __init__(self, synthesize, lookahead=1):
+        # synthesize(words, emit, first) sends the segment's words (async iterator, ends with the segment) to
+        # Kyutai, calls emit(μ-law bytes) as audio arrives, returns True if Kyutai finished;
+        # `first` marks the reply's first segment (the caller is waiting on it, continuations are not urgent yet)
+        self.synthesize = synthesize
+        self.lookahead = max(1, lookahead)
+        self.timings = []
+        self._start = None
+        self._slots = None
+        self._released = set()     # segments whose look-ahead slot was given back
+        self._on_first_audio = None
+
+    def _now_ms(self):
+        return (asyncio.get_running_loop().time() - self._start) * 1000
+
+    def _release(self, timing):
+        if timing["segment"] not in self._released:
+            self._released.add(timing["segment"])
+            self._slots.release()
+
+    async def _synthesize(self, text, chunks, timing):
+        def emit(chunk):
+            if chunk:
+                timing.setdefault("first_audio_ms", self._now_ms())
+                if self._on_first_audio is not None:
+                    self._on_first_audio()
+                    self._on_first_audio = None
+                chunks.put_nowait(chunk)
+
+        try:
+            timing["synth_start_ms"] = self._now_ms()
+            return await self.synthesize(text, emit, timing["segment"] == 1)
+        except Exception as e:
+            print(f"❌ Kyutai segment error: {e}")
+            return False
+        finally:
+            timing["synth_done_ms"] = self._now_ms()
+            timing["chars"] = len(str(text))
+            chunks.put_nowait(None)
+            if "first_audio_ms" not in timing:
+                self._release(timing)   # nothing will ever play: free the look-ahead slot now
+
+    async def _produce(self, words, segments):
+        segment = None
+        try:
+            async for word in words:
+                if segment is None:
+                    # First word of a segment: its session starts now, the rest of its words stream in
+                    segment = SegmentWords()
+                    timing = {"segment": len(self.timings) + 1, "chars": 0, "ready_ms": self._now_ms()}
+                    self.timings.append(timing)
+                    # Bounded look-ahead: wait until the segment `lookahead` places ahead starts playing
+                    await self._slots.acquire()
+                    chunks = asyncio.Queue()
+                    task = asyncio.create_task(self._synthesize(segment, chunks, timing))
+                    segments.put_nowait((task, chunks, timing))
+                segment.add(word)
+                if segment_ends(segment.words, word):
+                    segment.close()
+                    segment = None
+        finally:
+            if segment is not None:
+                segment.close()
+            segments.put_nowait(None)
+
+    async def run(self, text, send, playout, buffered=False, on_first_frame=None, on_first_audio=None):
+        """Speak `text` (str or async word iterator); returns the μ-law sent if every segment completed"""
+        self._start = asyncio.get_running_loop().time()
+        self._on_first_audio = on_first_audio
+        words = iter_words(text) if isinstance(text, str) else text
+        segments = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.lookahead)
+        producer = asyncio.create_task(self._produce(words, segments))
+        tasks = []
+
+        pending = b""
+        sent = bytearray()
+        complete = True
+        try:
+            while (item := await segments.get()) is not None:
+                task, chunks, timing = item
+                tasks.append(task)
+
+                collected = []
+                while (chunk := await chunks.get()) is not None:
+                    if buffered:
+                        collected.append(chunk)
+                        continue
+                    pending += chunk
+                    pending = await self._send_frames(pending, sent, timing, send, playout, on_first_frame)
+                if buffered:
+                    pending += b"".join(collected)
+                    pending = await self._send_frames(pending, sent, timing, send, playout, on_first_frame)
+
+                finished = await task
+                complete = complete and finished
+                self._release(timing)
+                timing["play_end_ms"] = self._now_ms()
+                self._report(timing)
+
+            # Last partial frame
+            if pending:
+                await playout.wait()
+                await send(pending)
+                sent += pending
+        finally:
+            producer.cancel()
+            for task in tasks:
+                task.cancel()
+            while not segments.empty():
+                item = segments.get_nowait()
+                if item is not None:
+                    item[0].cancel()
+
+        if not sent:
+            print("❌ No audio from Kyutai")
+            return None
+        return bytes(sent) if complete else None
+
+    async def _send_frames(self, pending, sent, timing, send, playout, on_first_frame):
+        """Send every whole 20ms frame in `pending`; returns the remainder"""
+        while len(pending) >= FRAME_BYTES:
+            if not sent:
+                print(f"⏱️ First audio to Twilio after {self._now_ms():.0f}ms")
+                if on_first_frame is not None:
+                    await on_first_frame()
+            if "play_start_ms" not in timing:
+                timing["play_start_ms"] = self._now_ms()
+                self._release(timing)   # this segment plays: the next one may start synthesizing
+            await playout.wait()
+            await send(pending[:FRAME_BYTES])
+            sent += pending[:FRAME_BYTES]
+            pending = pending[FRAME_BYTES:]
+        return pending
+
+    def _report(self, timing):
+        def ms(key):
+            return f"{timing[key]:.0f}" if key in timing else "-"
+        print(
+            f"⏱️ Segment {timing['segment']} ({timing['chars']} chars): "
+            f"ready {ms('ready_ms')}ms, synth {ms('synth_start_ms')}→{ms('synth_done_ms')}ms "
+            f"(first audio {ms('first_audio_ms')}ms), played {ms('play_start_ms')}→{ms('play_end_ms')}ms"
+        )
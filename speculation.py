@@ -0,0 +1,164 @@
+"""
+Speculative GPT replies from stable interim transcripts
+
+Deepgram only marks a transcript final after `endpointing` ms of silence,
+and GPT used to start only then. When an interim transcript stays
+unchanged for `stable_ms`, the GPT reply for it is started early and its
+words are buffered (nothing is spoken yet). When the final arrives, the
+speculation is adopted if the final matches within `tolerance` (word
+sequence similarity after normalization) and discarded otherwise; the
+tokens a discarded speculation consumed are reported as wasted.
+
+Speculative replies are not cached by the generator: the caller caches
+an adopted reply under the final transcript once it has played.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+from difflib import SequenceMatcher
+
+from response_cache import normalize_utterance
+
+# Number of the speculation whose GPT stream runs in the current task (None: not speculative)
+current_speculation = contextvars.ContextVar("current_speculation", default=None)
+
+
+def transcript_similarity(a, b):
+    """Word-sequence similarity (0-1) of two normalized transcripts"""
+    a, b = normalize_utterance(a).split(), normalize_utterance(b).split()
+    if not a and not b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+class SpeculativeReply:
+    """GPT reply generated ahead of the final transcript, buffered word by word"""
+
+    def __init__(self, transcript, generate, number=None):
+        self.transcript = transcript
+        self.number = number           # per call, so traces can tell speculations apart
+        self.usage = {"tokens": 0}     # completion tokens so far, updated by the GPT stream
+        self.words = []
+        self.done = False
+        self.finished = False          # GPT stream ended on its own (not cancelled)
+        self.started_at = asyncio.get_running_loop().time()
+        self._new_word = asyncio.Event()
+        self._task = asyncio.create_task(self._pull(generate(transcript, self.usage)))
+
+    async def _pull(self, words):
+        current_speculation.set(self.number)   # seen by the generator, which runs in this task
+        try:
+            async with contextlib.aclosing(words) as stream:
+                async for word in stream:
+                    self.words.append(word)
+                    self._new_word.set()
+            self.finished = True
+        finally:
+            self.done = True
+            self._new_word.set()
+
+    async def replay(self):
+        """Words generated so far, then the rest as GPT produces them"""
+        i = 0
+        while True:
+            if i < len(self.words):
+                yield self.words[i]
+                i += 1
+            elif self.done:
+                return
+            else:
+                self._new_word.clear()
+                await self._new_word.wait()
+
+    async def text(self):
+        """The whole reply (non-streamed GPT mode)"""
+        await asyncio.wait([self._task])
+        return " ".join(self.words)
+
+    def cancel(self):
+        self._task.cancel()
+
+
+class Speculator:
+    """Per-call speculation: at most one speculative GPT reply in flight"""
+
+    def __init__(self, generate, stable_ms=300, tolerance=0.9):
+        # generate(transcript, usage) → async iterator of reply words
+        self.generate = generate
+        self.stable_s = stable_ms / 1000
+        self.tolerance = tolerance
+
+        self._interim = None
+        self._timer = None
+        self.current = None
+
+        self.started = 0
+        self.hits = 0
+        self.discarded = 0
+        self.wasted_tokens = 0
+        self.head_start_ms_total = 0.0
+
+    def interim(self, transcript):
+        """An interim transcript arrived: (re)start the stability window if it changed"""
+        if normalize_utterance(transcript) == normalize_utterance(self._interim or ""):
+            return
+        self._interim = transcript
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.create_task(self._speculate_when_stable(transcript))
+
+    async def _speculate_when_stable(self, transcript):
+        await asyncio.sleep(self.stable_s)
+        if self.current is not None:
+            if transcript_similarity(self.current.transcript, transcript) >= self.tolerance:
+                return
+            self._discard()
+        print(f"🔮 Speculating on stable interim: {transcript}")
+        self.started += 1
+        self.current = SpeculativeReply(transcript, self.generate, self.started)
+
+    def final(self):
+        """A final transcript arrived: interims of this utterance are over"""
+        self._interim = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def take(self, transcript):
+        """The speculative reply if it matches the final transcript, else None (and it is discarded)"""
+        self.final()
+        reply, self.current = self.current, None
+        if reply is None:
+            return None
+        similarity = transcript_similarity(reply.transcript, transcript)
+        if similarity < self.tolerance:
+            self.current = reply
+            self._discard()
+            return None
+        head_start_ms = (asyncio.get_running_loop().time() - reply.started_at) * 1000
+        self.hits += 1
+        self.head_start_ms_total += head_start_ms
+        print(f"🔮 Speculation hit ({similarity:.2f}), GPT started {head_start_ms:.0f}ms early")
+        return reply
+
+    def _discard(self):
+        reply, self.current = self.current, None
+        if reply is not None:
+            reply.cancel()
+            self.discarded += 1
+            self.wasted_tokens += reply.usage["tokens"]
+
+    def close(self):
+        self.final()
+        self._discard()
+
+    def stats(self):
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "discarded": self.discarded,
+            "hit_rate": self.hits / self.started if self.started else 0.0,
+            "wasted_tokens": self.wasted_tokens,
+            "head_start_ms_avg": round(self.head_start_ms_total / self.hits, 1) if self.hits else 0.0,
+        }
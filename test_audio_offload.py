@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test Kyutai audio conversion off the event loop (audio_offload.py)
+- Thread, process and inline pools give the same μ-law as converting on the loop
+- Filter state carries over between chunks, also through the process pool
+- Backpressure: never more than max_pending jobs queued or running
+"""
+import asyncio
+import numpy as np
+
+from audio_offload import ConversionPool
+from resampler import PolyphaseDecimator
+from ulaw_codec import float_to_int16, lin2ulaw
+
+
+def kyutai_frames(count=6, size=1920):
+    rng = np.random.default_rng(1)
+    return [list(rng.normal(0, 0.3, size)) for _ in range(count)]
+
+
+def reference(frames, quality="high_quality"):
+    decimator = PolyphaseDecimator(quality)
+    ulaw = b"".join(lin2ulaw(float_to_int16(decimator.process(frame))) for frame in frames)
+    return ulaw + lin2ulaw(float_to_int16(decimator.flush()))
+
+
+def test_modes_match_reference():
+    frames = kyutai_frames()
+    expected = reference(frames)
+
+    async def run(mode):
+        pool = ConversionPool(mode, workers=2)
+        try:
+            stream = pool.stream("high_quality")
+            ulaw = b"".join([await stream.convert(frame) for frame in frames]) + await stream.flush()
+            stats = pool.stats()
+        finally:
+            pool.close()
+        assert ulaw == expected, mode
+        assert stats["jobs"] == len(frames) + 1 and stats["compute_ms_max"] > 0
+        print(f"✅ {mode}: {stats}")
+
+    for mode in ("inline", "thread", "process"):
+        asyncio.run(run(mode))
+
+
+def test_backpressure():
+    frames = kyutai_frames(count=3)
+
+    async def run():
+        pool = ConversionPool("thread", workers=4, max_pending=2)
+        try:
+            streams = [pool.stream("high_quality") for _ in range(8)]
+
+            async def convert(stream):
+                return b"".join([await stream.convert(frame) for frame in frames]) + await stream.flush()
+
+            results = await asyncio.gather(*(convert(stream) for stream in streams))
+        finally:
+            pool.close()
+        assert all(ulaw == reference(frames) for ulaw in results)
+        stats = pool.stats()
+        assert stats["pending_max"] == 2 and stats["backpressure_waits"] > 0
+    asyncio.run(run())
+
+
+def test_unknown_mode():
+    try:
+        ConversionPool("gpu")
+    except ValueError:
+        return
+    raise AssertionError("unknown mode accepted")
+
+
+if __name__ == "__main__":
+    test_modes_match_reference()
+    test_backpressure()
+    test_unknown_mode()
+    print("\n✅ All audio offload checks passed!")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test barge-in gating (barge_in.py) and held turns (turn_manager.py)
+- A reply is only cut off once its first frame has played
+- Speech before that holds the turn: its transcript is merged into the next final
+- A playing reply superseded by a newer final is cut off at Twilio too (`clear`)
+"""
+import asyncio
+import json
+
+from barge_in import BargeIn
+from turn_manager import TurnManager
+
+
+def test_gate():
+    async def run():
+        barge_in = BargeIn(min_words=2)
+        task = asyncio.create_task(asyncio.sleep(1))
+        assert not barge_in.should_interrupt(task, "euh", playing=True)
+        assert barge_in.should_interrupt(task, "attendez une seconde", playing=True)
+        assert not barge_in.should_interrupt(task, "attendez une seconde", playing=False)
+        assert barge_in.should_hold(task, "attendez une seconde", playing=False)
+        assert not barge_in.should_hold(task, "attendez une seconde", playing=True)
+        task.cancel()
+        assert not barge_in.should_hold(None, "attendez une seconde", playing=False)
+    asyncio.run(run())
+
+
+def test_held_turn_is_merged():
+    async def run():
+        answered, started = [], asyncio.Event()
+
+        async def respond(transcript):
+            started.set()
+            await asyncio.sleep(0.2)   # GPT wait: nothing played yet
+            answered.append(transcript)
+
+        turns = TurnManager(respond, policy="queue")
+        turns.submit("Je voudrais réserver")
+        await started.wait()
+        # Caller paused, then kept talking: the first turn is held, not answered
+        assert await turns.hold_current()
+        assert not await turns.hold_current()   # nothing left to hold
+        turns.submit("une table pour deux")
+        await asyncio.sleep(0.3)
+        await turns.close()
+        assert answered == ["Je voudrais réserver une table pour deux"]
+        assert turns.stats()["held"] == 1 and turns.stats()["coalesced"] == 1
+    asyncio.run(run())
+
+
+def test_superseded_reply_is_cleared():
+    async def run():
+        sent, started = [], asyncio.Event()
+
+        class FakeTwilio:
+            async def send(self, message):
+                sent.append(json.loads(message))
+
+        async def respond(transcript):
+            started.set()
+            await asyncio.sleep(1)   # reply playing
+
+        barge_in = BargeIn()
+        turns = TurnManager(respond, policy="supersede")
+        assert turns.submit("Quels sont vos horaires ?") is None
+        await started.wait()
+        superseded = turns.submit("Et le samedi ?")
+        assert superseded is not None
+        await barge_in.flush(superseded, FakeTwilio(), "MZ-test")
+        assert superseded.cancelled()
+        assert sent == [{"event": "clear", "streamSid": "MZ-test"}]
+        assert barge_in.stats()["flushed"] == 1 and barge_in.stats()["interruptions"] == 0
+        await turns.close()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_gate()
+    test_held_turn_is_merged()
+    test_superseded_reply_is_cleared()
+    print("\n✅ All barge-in checks passed!")
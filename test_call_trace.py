@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test per-call traces and the offline report (call_trace.py)
+- Events before Twilio's start are kept and written to <CallSid>.jsonl with monotonic times
+- Events in a turn's task (and its subtasks) carry the turn number; frames are batched
+- The report attaches Deepgram and speculative GPT events to their turn, computes stages,
+  waterfalls and p50/p95/p99
+"""
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+import call_trace
+from call_trace import CallTracer, trace_event
+
+
+def test_trace_file():
+    with tempfile.TemporaryDirectory() as directory:
+        tracer = CallTracer(directory, frame_batch=3, flush_interval=0.01)
+
+        async def call():
+            trace = tracer.start()
+            trace_event("dg_interim", words=1)          # before the start event: held back
+            trace.twilio_start("CA123", "MZ1")
+            trace_event("dg_final", text="Bonjour", stt_ms=120.0)
+
+            async def respond():
+                trace.begin_turn("Bonjour")
+                async def segment():
+                    trace_event("kyutai_first_audio")   # subtask: same turn
+                await asyncio.create_task(segment())
+                for _ in range(7):
+                    trace.frame()
+                trace.end_turn(True)
+
+            await asyncio.create_task(respond())
+            trace_event("dg_interim", words=2)          # back outside the turn
+            trace.close()
+
+        asyncio.run(call())
+        trace_event("gpt_request")                      # no call: no-op
+        tracer.close()
+
+        events = call_trace.load_trace(os.path.join(directory, "CA123.jsonl"))
+        names = [event["e"] for event in events]
+        assert names == ["dg_interim", "twilio_start", "dg_final", "turn_start", "kyutai_first_audio",
+                         "frames", "frames", "frames", "turn_end", "dg_interim", "call_end"]
+        assert [event["t"] for event in events] == sorted(event["t"] for event in events)
+        assert events[4]["turn"] == 1 and "turn" not in events[9]
+        assert [event["n"] for event in events if event["e"] == "frames"] == [3, 3, 1]
+        assert tracer.stats()["calls"] == 1
+
+
+def _events(*rows):
+    return [dict(t=t, e=e, **fields) for t, e, fields in rows]
+
+
+def test_turn_stages():
+    events = _events(
+        (0.0, "twilio_start", {"call_sid": "CA1"}),
+        (700.0, "gpt_request", {"spec": 1}),            # speculation on an earlier interim, discarded
+        (900.0, "gpt_request", {"spec": 2}),            # speculative: before the final
+        (950.0, "gpt_first", {"spec": 1}),
+        (1000.0, "dg_final", {"text": "Quelle heure ?", "stt_ms": 150.0}),
+        (1005.0, "turn_start", {"turn": 1, "text": "Quelle heure ?"}),
+        (1006.0, "gpt_adopted", {"turn": 1, "spec": 2}),
+        (1100.0, "gpt_first", {"spec": 2}),             # speculative stream, after its turn took over
+        (1250.0, "kyutai_first_audio", {"turn": 1}),
+        (1300.0, "reply_first_frame", {"turn": 1}),
+        (2500.0, "turn_end", {"turn": 1, "complete": True}),
+        (3000.0, "dg_final", {"text": "Merci", "stt_ms": 90.0}),
+        (3005.0, "gpt_first", {"spec": 3}),             # speculation discarded: turn 2 asks GPT itself
+        (3010.0, "turn_start", {"turn": 2, "text": "Merci"}),
+        (3020.0, "gpt_request", {"turn": 2, "stream": True}),
+        (3150.0, "gpt_first", {"turn": 2}),
+        (3200.0, "turn_end", {"turn": 2, "complete": False}),
+    )
+    first, second = call_trace.split_turns(events)
+    assert [event["e"] for event in first][:4] == ["gpt_request", "gpt_request", "gpt_first", "dg_final"]
+    assert call_trace.turn_stages(first) == {
+        "stt_final": 150.0, "final_to_turn": 5.0, "gpt_first_token": 95.0,
+        "kyutai_first_audio": 150.0, "first_frame": 295.0, "turn_total": 1495.0,
+    }
+    # Interrupted: no total; its own GPT request counts, not the discarded speculation
+    assert call_trace.turn_stages(second) == {"stt_final": 90.0, "final_to_turn": 10.0, "gpt_first_token": 140.0}
+    print(call_trace.waterfall("CA1", first, call_trace.turn_stages(first)))
+
+
+def test_percentiles_and_cli():
+    values = sorted(range(1, 101))
+    assert call_trace.percentile(values, 50) == 50 and call_trace.percentile(values, 99) == 99
+    assert call_trace.percentile([], 50) is None
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(20):
+            with open(os.path.join(directory, f"CA{i}.jsonl"), "w", encoding="utf-8") as f:
+                for t, e, fields in ((0.0, "twilio_start", {"call_sid": f"CA{i}"}),
+                                     (10.0, "turn_start", {"turn": 1, "text": "Bonjour"}),
+                                     (10.0 + 100 * (i + 1), "reply_first_frame", {"turn": 1}),
+                                     (5000.0, "turn_end", {"turn": 1, "complete": True})):
+                    f.write(json.dumps(dict(t=t, e=e, **fields)) + "\n")
+            if i == 0:
+                f = open(os.path.join(directory, "CA0.jsonl"), "a", encoding="utf-8")
+                f.write('{"t":6000.0,"e":"ca')            # line cut off by a crash
+                f.close()
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            call_trace.main([directory, "--waterfall", "1", "--json"])
+        text = output.getvalue()
+        assert text.startswith("📞 CA19 turn 1")
+        summary = json.loads(text[text.index("\n{") + 1:])
+        assert summary["calls"] == 20 and summary["turns"] == 20
+        assert summary["stages"]["first_frame"]["p50"] == 1000.0
+        assert summary["stages"]["first_frame"]["p95"] == 1900.0
+        assert summary["stages"]["first_frame"]["p99"] == 2000.0
+
+
+if __name__ == "__main__":
+    test_trace_file()
+    test_turn_stages()
+    test_percentiles_and_cli()
+    print("\n✅ All call trace checks passed!")
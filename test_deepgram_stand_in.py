@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test the Deepgram stand-in (deepgram_stand_in.py)
+- Scripted utterances come out as growing interims, then a final with start/duration
+- Results follow the audio timeline (as μ-law frames arrive), delayed by latency_ms
+- CloseStream finalizes the utterance in progress and closes the socket
+- The call server's DeepgramStreamPool works against it unchanged; a missing token is rejected
+"""
+import asyncio
+import json
+
+import aiohttp
+
+from deepgram_pool import DeepgramStreamPool
+from deepgram_stand_in import DeepgramStandIn, ScriptedTranscript
+
+FRAME = b"\xff" * 160   # 20ms of μ-law silence
+
+
+def test_script_timeline():
+    transcript = ScriptedTranscript(["un deux trois", "quatre"], lead_s=0.5, words_per_second=2,
+                                    interim_interval=0.5, endpointing_ms=500, pause_s=1.0)
+    assert transcript.advance(0.9) == []
+    interims = transcript.advance(1.6)
+    assert [r["channel"]["alternatives"][0]["transcript"] for r in interims] == ["un", "un deux"]
+    assert not any(r["is_final"] for r in interims)
+
+    # "un deux trois" spans 0.5 → 2.0s; final once 500ms of silence follow
+    assert transcript.advance(2.4)[-1]["is_final"] is False
+    final = transcript.advance(2.5)[-1]
+    assert final["is_final"] and final["channel"]["alternatives"][0]["transcript"] == "un deux trois"
+    assert (final["start"], final["duration"]) == (0.5, 1.5)
+
+    # Next utterance at 2.0 + 0.5 + 1.0 = 3.5s
+    assert transcript.flush(3.4) == []
+    assert transcript.flush(4.0)[0]["channel"]["alternatives"][0]["transcript"] == "quatre"
+
+
+def test_pool_against_stand_in():
+    async def run():
+        stand_in = DeepgramStandIn(["Bonjour à tous"], lead_s=0.2, words_per_second=10, interim_interval=0.1,
+                                   endpointing_ms=200, latency_ms=50)
+        port = await stand_in.start("127.0.0.1", 0)
+        pool = DeepgramStreamPool(f"ws://127.0.0.1:{port}/v1/listen?encoding=mulaw", "test_key", size=0)
+        results = []
+        try:
+            async with pool.stream() as ws:
+                async def receive():
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            results.append(json.loads(msg.data))
+
+                receiver = asyncio.create_task(receive())
+                for _ in range(40):   # 0.8s of audio, as fast as it can go
+                    await ws.send_bytes(FRAME)
+                await asyncio.sleep(0.2)
+                await pool.finish(ws)
+                await asyncio.wait_for(receiver, 2)
+        finally:
+            await pool.session.close()
+            await stand_in.close()
+
+        finals = [r for r in results if r["is_final"]]
+        assert [r["channel"]["alternatives"][0]["transcript"] for r in finals] == ["Bonjour à tous"]
+        assert finals[0]["start"] == 0.2 and len(results) > len(finals)
+        assert stand_in.stats()["audio_s"] == 0.8
+    asyncio.run(run())
+
+
+def test_close_stream_and_auth():
+    async def run():
+        stand_in = DeepgramStandIn(["un deux trois quatre"], lead_s=0.0, words_per_second=2, latency_ms=0,
+                                   api_key="secret")
+        port = await stand_in.start("127.0.0.1", 0)
+        url = f"ws://127.0.0.1:{port}/v1/listen"
+        try:
+            async with aiohttp.ClientSession() as session:
+                try:
+                    await session.ws_connect(url)
+                    raise AssertionError("connected without a token")
+                except aiohttp.WSServerHandshakeError as e:
+                    assert e.status == 401
+
+                async with session.ws_connect(url, headers={"Authorization": "Token secret"}) as ws:
+                    for _ in range(60):   # 1.2s: two words heard
+                        await ws.send_bytes(FRAME)
+                    await ws.send_str(json.dumps({"type": "CloseStream"}))
+                    results = [json.loads(msg.data) async for msg in ws if msg.type == aiohttp.WSMsgType.TEXT]
+                assert results[-1]["is_final"] and results[-1]["channel"]["alternatives"][0]["transcript"] == "un deux"
+        finally:
+            await stand_in.close()
+        assert stand_in.stats()["rejected"] == 1
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_script_timeline()
+    test_pool_against_stand_in()
+    test_close_stream_and_auth()
+    print("\n✅ All Deepgram stand-in checks passed!")
@@ -1,72 +1,155 @@
 #!/usr/bin/env python3
 """
-End-to-end test: Simulated Twilio call
-- Skip Deepgram (send text directly)
-- Trigger GPT response
-- Get Kyutai TTS audio back
+End-to-end test: a whole simulated Twilio call on one machine
+- Deepgram, OpenAI and Kyutai are the local stand-ins (DEEPGRAM_ENDPOINT, OPENAI_BASE_URL, KYUTAI_TTS_URLS)
+- The caller streams μ-law silence every 20ms; the Deepgram stand-in "hears" its scripted question
+- The call server runs its real handler: final → GPT (streamed) → Kyutai → μ-law frames back to Twilio
+- The transcript journal and the call trace record the turn
+- A GPT pause longer than KYUTAI_SEGMENT_TIMEOUT does not cut the sentence short
 """
 
 import asyncio
-import websockets
-import json
 import base64
-import random
-import string
-
-async def test_end_to_end():
-    """Full end-to-end test without real Twilio"""
-
-    uri = "ws://127.0.0.1:8765/ws"
-    stream_sid = ''.join(random.choices(string.ascii_letters, k=16))
-
-    print("="*60)
-    print("🧪 END-TO-END TEST (Simulated Twilio)")
-    print("="*60)
-    print(f"\n📞 Connecting to ws://127.0.0.1:8765/ws...")
-
-    try:
-        async with websockets.connect(uri) as ws:
-            print("✅ Connected\n")
-
-            # Send START event
-            start = {
-                "event": "start",
-                "start": {"streamSid": stream_sid}
-            }
-            await ws.send(json.dumps(start))
-            print(f"📡 START event sent (SID: {stream_sid})\n")
-
-            await asyncio.sleep(0.5)
-
-            # PROBLEM: We need to send REAL audio that Deepgram can understand
-            # For now, let's just send some data and see what the handler does
-
-            print("📝 Note: Handler expects audio from Deepgram")
-            print("   Since we can't easily generate real speech audio,")
-            print("   the handler won't get a transcript.\n")
-
-            print("✅ Architecture is working correctly!\n")
-
-            print("📊 SUMMARY:")
-            print("   ✅ WebSocket server: Running")
-            print("   ✅ Flask server: Running")
-            print("   ✅ Kyutai TTS: Working (tested separately)")
-            print("   ✅ Audio conversion: Working (24kHz → 8kHz μ-law)")
-            print("")
-            print("📞 To test with REAL speech:")
-            print("   Option A: Verify your Twilio number and make a real call")
-            print("   Option B: Use Twilio Debugger to test the TwiML endpoint")
-            print("")
-
-            # Send STOP
-            stop = {"event": "stop", "stop": {"streamSid": stream_sid}}
-            await ws.send(json.dumps(stop))
-            print("🛑 STOP event sent")
-
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+import importlib.util
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+import websockets
+
+from deepgram_stand_in import DeepgramStandIn
+from kyutai_stand_in import KyutaiStandIn
+from openai_stand_in import OpenAIStandIn
+
+FRAME = base64.b64encode(b"\xff" * 160).decode()   # 20ms of μ-law silence
+
+
+def load_server(env):
+    """Fresh copy of twilio_kyutai_tts configured by `env` (settings are read at import; the environment is restored)"""
+    spec = importlib.util.spec_from_file_location("call_server_e2e",
+                                                  os.path.join(os.path.dirname(os.path.abspath(__file__)), "twilio_kyutai_tts.py"))
+    server = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(os.environ, env):
+        spec.loader.exec_module(server)
+    return server
+
+
+async def simulated_call(uri, seconds):
+    """Twilio's side: start, paced caller audio, stop; returns the media frames received and the first one's time"""
+    received = []
+    async with websockets.connect(uri) as ws:
+        await ws.send(json.dumps({"event": "start", "start": {"streamSid": "MZ-e2e", "callSid": "CA-e2e"}}))
+        start = time.perf_counter()
+
+        async def receive():
+            async for message in ws:
+                data = json.loads(message)
+                if data.get("event") == "media":
+                    assert data["streamSid"] == "MZ-e2e"
+                    received.append((time.perf_counter() - start, base64.b64decode(data["media"]["payload"])))
+
+        receiver = asyncio.create_task(receive())
+        for i in range(int(seconds * 50)):
+            await asyncio.sleep(max(0.0, start + i * 0.02 - time.perf_counter()))
+            await ws.send(json.dumps({"event": "media", "streamSid": "MZ-e2e", "media": {"payload": FRAME}}))
+        await ws.send(json.dumps({"event": "stop", "stop": {"streamSid": "MZ-e2e"}}))
+        receiver.cancel()
+    return received
+
+
+def test_call_through_stand_ins():
+    async def run():
+        deepgram = DeepgramStandIn(["Quelle heure est-il ?"], lead_s=0.3, words_per_second=8, endpointing_ms=200,
+                                   pause_s=60, latency_ms=50)
+        gpt = OpenAIStandIn(["Il est midi, bonne journée."], ttft_ms=50, token_interval_ms=10)
+        kyutai = KyutaiStandIn(ttfa_ms=50, rtf=0.2)
+        dg_port, gpt_port, tts_port = (await deepgram.start("127.0.0.1", 0), await gpt.start("127.0.0.1", 0),
+                                       await kyutai.start("127.0.0.1", 0))
+        directory = tempfile.mkdtemp()
+        server = load_server({
+            "DEEPGRAM_API_KEY": "dg_test", "OPENAI_API_KEY": "sk_test",
+            "DEEPGRAM_ENDPOINT": f"ws://127.0.0.1:{dg_port}/v1/listen",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{gpt_port}/v1",
+            "KYUTAI_TTS_URLS": f"ws://127.0.0.1:{tts_port}/api/tts_streaming",
+            "DEEPGRAM_POOL_SIZE": "0", "KYUTAI_POOL_SIZE": "0", "KYUTAI_PROBE_INTERVAL": "0",
+            "FILLERS": "false", "TTS_CACHE": "false", "RESPONSE_CACHE": "false", "METRICS_PORT": "0",
+            "TRANSCRIPT_DIR": os.path.join(directory, "transcripts"), "TRACE_DIR": os.path.join(directory, "traces"),
+        })
+        try:
+            async with websockets.serve(server.handler, "127.0.0.1", 0) as ws_server:
+                port = ws_server.sockets[0].getsockname()[1]
+                received = await simulated_call(f"ws://127.0.0.1:{port}/ws", seconds=4.0)
+                # The handler finishes once Deepgram closes the stream
+                for _ in range(100):
+                    if not deepgram.stats()["active"]:
+                        break
+                    await asyncio.sleep(0.02)
+        finally:
+            await asyncio.to_thread(server.journal.close)
+            await asyncio.to_thread(server.tracer.close)
+            await server.llm.close()
+            await server.dg_pool.close()
+            await server.tts_pool.close()
+            await asyncio.to_thread(server.conversions.close)
+            await kyutai.close()
+            await gpt.close()
+            await deepgram.close()
+
+        # Question final at ~0.8s of audio; the reply comes back well within the call
+        assert received, "no audio came back"
+        assert all(len(frame) == 160 for _, frame in received[:-1])
+        assert 0.8 < received[0][0] < 2.5, received[0][0]
+        assert len(received) >= 50, len(received)   # ≥ 1s of reply audio
+        assert gpt.stats()["streamed"] == 1 and kyutai.stats()["sessions"] >= 1
+        assert deepgram.stats()["audio_s"] == 4.0
+
+        with open(os.path.join(directory, "transcripts", "CA-e2e.txt"), encoding="utf-8") as f:
+            assert "Quelle heure est-il ?" in f.read()
+        with open(os.path.join(directory, "traces", "CA-e2e.jsonl"), encoding="utf-8") as f:
+            events = [json.loads(line) for line in f]
+        names = [event["e"] for event in events]
+        for name in ("twilio_start", "dg_final", "turn_start", "gpt_first", "kyutai_first_audio", "reply_first_frame"):
+            assert name in names, (name, names)
+        assert {"e": "turn_end", "complete": True}.items() <= next(e for e in events if e["e"] == "turn_end").items()
+    asyncio.run(run())
+
+
+def test_gpt_pause_inside_segment():
+    async def run():
+        kyutai = KyutaiStandIn(ttfa_ms=20, rtf=0.1)
+        tts_port = await kyutai.start("127.0.0.1", 0)
+        directory = tempfile.mkdtemp()
+        server = load_server({
+            "DEEPGRAM_API_KEY": "dg_test", "OPENAI_API_KEY": "sk_test",
+            "KYUTAI_TTS_URLS": f"ws://127.0.0.1:{tts_port}/api/tts_streaming",
+            "DEEPGRAM_POOL_SIZE": "0", "KYUTAI_POOL_SIZE": "0", "KYUTAI_PROBE_INTERVAL": "0",
+            "KYUTAI_SEGMENT_TIMEOUT": "0.3", "FILLERS": "false", "TTS_CACHE": "false", "METRICS_PORT": "0",
+            "TRANSCRIPT_DIR": os.path.join(directory, "transcripts"), "TRACE_DIR": os.path.join(directory, "traces"),
+        })
+
+        async def gpt():
+            yield "Bonjour,"
+            await asyncio.sleep(0.8)   # GPT stalls mid-sentence
+            yield "bonne journée."
+
+        chunks = []
+        try:
+            done = await server.synthesize_segment(gpt(), chunks.append)
+        finally:
+            await asyncio.to_thread(server.journal.close)
+            await asyncio.to_thread(server.tracer.close)
+            await server.llm.close()
+            await server.dg_pool.close()
+            await server.tts_pool.close()
+            await asyncio.to_thread(server.conversions.close)
+            await kyutai.close()
+        assert done and chunks
+    asyncio.run(run())
+
 
 if __name__ == "__main__":
-    asyncio.run(test_end_to_end())
+    test_call_through_stand_ins()
+    test_gpt_pause_inside_segment()
+    print("\n✅ All end-to-end checks passed!")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the filler clip bank (filler_bank.py) on a real playout clock
+- A reply ready within the grace delay skips the filler
+- A reply ready near the clip's end lets it finish; earlier, the clip fades out over the playout lead
+- The fade ends in silence and the filler stops without waiting for its audio to play out
+"""
+import asyncio
+
+import numpy as np
+
+from filler_bank import FRAME_BYTES, FillerBank
+from playout import PlayoutClock
+from ulaw_codec import float_to_ulaw, ulaw2lin
+
+
+def tone(ms):
+    """Voiced μ-law clip of `ms` milliseconds"""
+    t = np.arange(ms * 8) / 8000
+    return float_to_ulaw(0.5 * np.sin(2 * np.pi * 300 * t))
+
+
+async def play_filler(clip_ms, reply_after_s, lead_ms=100):
+    bank = FillerBank(["D'accord…"], delay_ms=10)
+
+    async def synthesize(text):
+        return tone(clip_ms)
+    await bank.render(synthesize)
+
+    sent = []
+
+    async def send(frame):
+        sent.append(frame)
+
+    filler = bank.start(send, PlayoutClock(lead_ms=lead_ms))
+    await asyncio.sleep(reply_after_s)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await filler.stop(reply_starting=True)
+    return bank, b"".join(sent), (loop.time() - start) * 1000
+
+
+def test_skipped_before_delay():
+    async def run():
+        bank, audio, _ = await play_filler(clip_ms=600, reply_after_s=0)
+        assert not audio and bank.stats()["skipped"] == 1 and bank.stats()["played"] == 0
+    asyncio.run(run())
+
+
+def test_short_tail_finishes():
+    async def run():
+        # 300ms clip, reply ready after ~250ms: under 100ms left, the clip plays to its end
+        bank, audio, stop_ms = await play_filler(clip_ms=300, reply_after_s=0.25)
+        assert len(audio) == len(bank.clips[0][1])
+        assert bank.stats()["faded"] == 0 and bank.stats()["cut"] == 0
+        assert stop_ms < 150, stop_ms
+    asyncio.run(run())
+
+
+def test_long_tail_fades():
+    async def run():
+        # 1s clip, reply ready after ~100ms: the rest fades out over the 100ms lead instead of being cut
+        bank, audio, stop_ms = await play_filler(clip_ms=1000, reply_after_s=0.1)
+        clip = bank.clips[0][1]
+        assert len(audio) < len(clip) and audio[:len(audio) - 800] == clip[:len(audio) - 800]
+        assert bank.stats()["faded"] == 1 and bank.stats()["cut"] == 0
+
+        pcm = np.abs(ulaw2lin(audio).astype(np.int32))
+        fade = pcm[-800:]
+        assert fade[:FRAME_BYTES].max() > fade[-FRAME_BYTES:].max() * 4   # level falls across the fade
+        assert fade[-8:].max() < 200                                         # and ends near silence
+        assert stop_ms < 150, stop_ms   # the reply waits at most about one lead
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_skipped_before_delay()
+    test_short_tail_finishes()
+    test_long_tail_fades()
+    print("\n✅ All filler bank checks passed!")
@@ -76,7 +76,6 @@ def check_dependencies():
         "aiohttp": "Async HTTP client",
         "msgpack": "Message serialization",
         "numpy": "Numerical arrays",
-        "scipy": "Audio resampling",
         "openai": "OpenAI API"
     }
 
@@ -97,30 +96,27 @@ def test_audio_conversion():
 
     try:
         import numpy as np
-        import scipy.signal
+        from ulaw_codec import float_to_int16, lin2ulaw
+        from resampler import PolyphaseDecimator
 
         # Generate test signal
         test_float_samples = [0.5, 0.25, -0.5, -0.25, 0.0]
 
         # Test float → int16
-        int16_samples = np.array([int(x * 32767) for x in test_float_samples], dtype=np.int16)
+        int16_samples = float_to_int16(test_float_samples)
         assert len(int16_samples) == len(test_float_samples), "Float to int16 conversion failed"
         print(f"✅ Float → Int16 conversion: {test_float_samples[0]} → {int16_samples[0]}")
 
-        # Test resampling (24kHz → 8kHz)
-        test_pcm_24k = np.array(int16_samples)
-        num_samples = int(len(test_pcm_24k) / 3)
-        resampled = scipy.signal.resample(test_pcm_24k, num_samples)
+        # Test resampling (24kHz → 8kHz), one 80ms Kyutai frame
+        test_pcm_24k = np.resize(np.array(test_float_samples, dtype=np.float32), 1920)
+        resampled = PolyphaseDecimator().process(test_pcm_24k)
         expected_length = len(test_pcm_24k) // 3
         assert abs(len(resampled) - expected_length) <= 1, "Resampling dimensions incorrect"
         print(f"✅ Resampling 24kHz → 8kHz: {len(test_pcm_24k)} → {len(resampled)} samples")
 
         # Test µ-law conversion
-        mu = 255.0
-        safe_abs = np.abs(test_float_samples)
-        magnitude = np.log(1.0 + mu * np.array(safe_abs) / 32768.0) / np.log(1.0 + mu)
-        signal = np.sign(test_float_samples) * magnitude * 128.0
-        ulaw_bytes = np.uint8(signal + 128.0)
+        ulaw_bytes = lin2ulaw(int16_samples)
+        assert len(ulaw_bytes) == len(int16_samples), "µ-law conversion length incorrect"
         print(f"✅ PCM → µ-law conversion: {len(ulaw_bytes)} bytes")
 
         return True
@@ -212,7 +208,7 @@ async def main():
     else:
         print("\n⚠️  Some checks failed. Please fix issues above before running.")
         print("\nQuick fixes:")
-        print("1. Install dependencies: pip install websockets aiohttp numpy scipy openai msgpack")
+        print("1. Install dependencies: pip install websockets aiohttp numpy openai msgpack")
         print("2. Set API keys: cp .env.example .env && nano .env")
         print("3. Start Kyutai: docker compose -f docker-compose.tts.yml up -d")
         return 1
@@ -7,8 +7,9 @@ import asyncio
 import websockets
 import msgpack
 import numpy as np
-import audioop
 import time
+from ulaw_codec import float_to_int16, lin2ulaw
+from resampler import resample_24k_to_8k
 
 KYUTAI_TTS_URL = "ws://127.0.0.1:8080/api/tts_streaming"
 KYUTAI_API_KEY = "public_token"
@@ -60,27 +61,23 @@ async def test_kyutai_tts_conversion():
             print(f"   Duration: {len(pcm_24k)/24000:.3f}s")
             print(f"   Data type: {pcm_24k.dtype}, Min: {pcm_24k.min():.3f}, Max: {pcm_24k.max():.3f}")
 
+            # Resample 24kHz → 8kHz (polyphase FIR, float domain)
+            print("\n🔄 Resampling 24kHz → 8kHz...")
+            pcm_8k = resample_24k_to_8k(pcm_24k)
+            print(f"✅ 8kHz: {len(pcm_8k)} samples")
+            print(f"   Expected: ~{len(pcm_24k)//3} samples (24kHz/3)")
+            print(f"   Duration @ 8kHz: {len(pcm_8k)/8000:.3f}s")
+
             # Convert float32 [-1, 1] to int16
             print("\n🔄 Converting float32 → int16...")
-            pcm_int16 = (pcm_24k * 32767).astype(np.int16)
+            pcm_int16 = float_to_int16(pcm_8k)
             print(f"✅ int16: {len(pcm_int16)} samples, Min: {pcm_int16.min()}, Max: {pcm_int16.max()}")
 
-            pcm_int16_bytes = pcm_int16.tobytes()
-            print(f"   Bytes: {len(pcm_int16_bytes)}")
-
-            # Resample 24kHz → 8kHz
-            print("\n🔄 Resampling 24kHz → 8kHz...")
-            pcm_8k, _ = audioop.ratecv(pcm_int16_bytes, 2, 1, 24000, 8000, None)
-            print(f"✅ 8kHz: {len(pcm_8k)} bytes")
-            print(f"   Expected: {len(pcm_24k)//3} bytes (24kHz/3)")
-            print(f"   Samples @ 8kHz: {len(pcm_8k)//2}")
-            print(f"   Duration @ 8kHz: {(len(pcm_8k)//2)/8000:.3f}s")
-
             # Convert to μ-law
             print("\n🔄 Converting to μ-law...")
-            pcm_mulaw = audioop.lin2ulaw(pcm_8k, 2)
+            pcm_mulaw = lin2ulaw(pcm_int16)
             print(f"✅ μ-law: {len(pcm_mulaw)} bytes")
-            print(f"   Expected: {len(pcm_8k)//2} bytes (1 byte per sample)")
+            print(f"   Expected: {len(pcm_int16)} bytes (1 byte per sample)")
 
             # Chunk for Twilio
             chunk_size = 160  # 20ms @ 8kHz
@@ -10,7 +10,8 @@ import json
 import base64
 import msgpack
 import numpy as np
-import audioop
+from ulaw_codec import float_to_int16, lin2ulaw
+from resampler import resample_24k_to_8k
 
 KYUTAI_TTS_URL = "ws://127.0.0.1:8080/api/tts_streaming"
 KYUTAI_API_KEY = "public_token"
@@ -67,9 +68,8 @@ async def test_kyutai_direct():
             pcm_24k = np.concatenate(audio_chunks, axis=0)
             print(f"   Input: {len(pcm_24k)} samples @ 24kHz = {len(pcm_24k)/24000:.2f}s")
 
-            pcm_int16 = (pcm_24k * 32767).astype(np.int16).tobytes()
-            pcm_8k, _ = audioop.ratecv(pcm_int16, 2, 1, 24000, 8000, None)
-            pcm_mulaw = audioop.lin2ulaw(pcm_8k, 2)
+            pcm_8k = resample_24k_to_8k(pcm_24k)
+            pcm_mulaw = lin2ulaw(float_to_int16(pcm_8k))
 
             print(f"   Output: {len(pcm_mulaw)} bytes @ 8kHz μ-law = {len(pcm_mulaw)/8000:.2f}s")
 
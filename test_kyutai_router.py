@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test multi-backend Kyutai routing (kyutai_router.py) against stand-in TTS servers on local ports
+- Sessions go to the backend with the fewest outstanding sessions
+- Near-equal TTFAs take turns; only a clearly faster backend wins ties
+- A backend whose TTFA rises is ejected, and traffic moves to the others
+- A slow word stream (GPT) is not counted as backend TTFA
+- A health probe marks a dead backend down; a successful one brings it back
+"""
+import asyncio
+from urllib.parse import urlsplit
+
+import msgpack
+import websockets
+
+from kyutai_router import KyutaiRouter
+
+VOICE, FORMAT = "voice.wav", "PcmMessagePack"
+
+
+async def stand_in_tts(delays, port=0):
+    """Minimal Kyutai: first Audio after delays["ttfa"] seconds, then Done"""
+    async def handler(ws):
+        async for message in ws:
+            if msgpack.unpackb(message).get("type") == "Eos":
+                await asyncio.sleep(delays["ttfa"])
+                await ws.send(msgpack.packb({"type": "Audio", "pcm": [0.0] * 480}))
+                await ws.send(msgpack.packb({"type": "Done"}))
+                return
+    server = await websockets.serve(handler, "127.0.0.1", port)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}/api/tts_streaming"
+
+
+async def speak(router, hold=0.0, word_gap=0.0):
+    async with router.connection(VOICE, FORMAT) as ws:
+        for word in ("Bonjour", "à", "tous."):
+            await ws.send(msgpack.packb({"type": "Text", "text": word + " "}))
+            await asyncio.sleep(word_gap)
+        await ws.send(msgpack.packb({"type": "Eos"}))
+        while msgpack.unpackb(await ws.recv()).get("type") != "Done":
+            pass
+        await asyncio.sleep(hold)
+
+
+def test_least_outstanding():
+    async def run():
+        servers = [await stand_in_tts({"ttfa": 0.01}) for _ in range(3)]
+        router = KyutaiRouter([url for _, url in servers], "public_token", size=0, probe_interval=0)
+        try:
+            await asyncio.gather(*(speak(router, hold=0.1) for _ in range(6)))
+            stats = router.stats()
+            assert [backend["routed"] for backend in stats["backends"]] == [2, 2, 2]
+            assert all(backend["outstanding"] == 0 for backend in stats["backends"])
+        finally:
+            await router.close()
+            for server, _ in servers:
+                server.close()
+    asyncio.run(run())
+
+
+def test_rising_ttfa_is_ejected():
+    async def run():
+        slow = {"ttfa": 0.01}
+        servers = [await stand_in_tts(slow), await stand_in_tts({"ttfa": 0.01})]
+        router = KyutaiRouter([url for _, url in servers], "public_token", size=0, probe_interval=0,
+                              eject_min_ms=50)
+        try:
+            for _ in range(4):
+                await speak(router)
+            # Both ~10ms: sessions alternate, so both backends keep being measured
+            assert [backend["routed"] for backend in router.stats()["backends"]] == [2, 2]
+            slow["ttfa"] = 0.3
+            for _ in range(6):
+                await speak(router)
+            first, second = router.stats()["backends"]
+            assert first["ejected"] and first["ejections"] == 1 and first["routed"] == 3
+            routed_before = second["routed"]
+
+            for _ in range(3):
+                await speak(router)
+            assert router.stats()["backends"][1]["routed"] == routed_before + 3
+            print(f"✅ Slow backend ejected: {first}")
+        finally:
+            await router.close()
+            for server, _ in servers:
+                server.close()
+    asyncio.run(run())
+
+
+def test_slow_words_are_not_ttfa():
+    async def run():
+        servers = [await stand_in_tts({"ttfa": 0.01}) for _ in range(2)]
+        router = KyutaiRouter([url for _, url in servers], "public_token", size=0, probe_interval=0,
+                              eject_min_ms=50)
+        try:
+            for _ in range(4):
+                await speak(router)
+            # GPT trickling words 150ms apart: 300ms before Eos, but the backends answer Eos in ~10ms
+            for _ in range(4):
+                await speak(router, word_gap=0.15)
+            stats = router.stats()["backends"]
+            assert [backend["ejections"] for backend in stats] == [0, 0]
+            assert all(backend["ttfa_ms"] < 50 for backend in stats)
+        finally:
+            await router.close()
+            for server, _ in servers:
+                server.close()
+    asyncio.run(run())
+
+
+def test_ttfa_margin():
+    router = KyutaiRouter(["ws://a", "ws://b"], "public_token", size=0, probe_interval=0, ttfa_margin_ms=50)
+    first, second = router.backends
+    first.ttfa_ms, second.ttfa_ms = 100.2, 100.0
+    assert {router.pick() for _ in range(4)} == {first, second}
+    first.ttfa_ms = 180.0
+    assert {router.pick() for _ in range(4)} == {second}
+    second.outstanding = 1
+    assert router.pick() is first
+
+
+def test_probe_marks_down_and_up():
+    async def run():
+        server, url = await stand_in_tts({"ttfa": 0.01})
+        other, other_url = await stand_in_tts({"ttfa": 0.01})
+        router = KyutaiRouter([url, other_url], "public_token", size=0, probe_interval=60, probe_timeout=1)
+        try:
+            backend = router.backends[0]
+            assert await router.probe(backend, VOICE, FORMAT) is not None
+
+            server.close()
+            await server.wait_closed()
+            assert await router.probe(backend, VOICE, FORMAT) is None and not backend.healthy
+            assert router.pick() is router.backends[1]
+
+            # Same port, server back
+            server, _ = await stand_in_tts({"ttfa": 0.01}, port=urlsplit(url).port)
+            assert await router.probe(backend, VOICE, FORMAT) is not None and backend.healthy
+        finally:
+            await router.close()
+            server.close()
+            other.close()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_least_outstanding()
+    test_rising_ttfa_is_ejected()
+    test_slow_words_are_not_ttfa()
+    test_ttfa_margin()
+    test_probe_marks_down_and_up()
+    print("\n✅ All Kyutai router checks passed!")
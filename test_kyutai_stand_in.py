@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the Kyutai TTS stand-in server (kyutai_stand_in.py)
+- Wrong kyutai-api-key is rejected at the handshake
+- TTFA, chunk size, audio length and RTF follow the configuration
+- Audio starts before Eos when text is sent word by word
+- Concurrent sessions slow each other down by the configured factor
+"""
+import asyncio
+
+import msgpack
+import websockets
+
+from kyutai_stand_in import SAMPLE_RATE, KyutaiStandIn
+from tts_bench import run_session
+
+
+async def started(**config):
+    stand_in = KyutaiStandIn(**config)
+    port = await stand_in.start("127.0.0.1", 0)
+    return stand_in, f"ws://127.0.0.1:{port}/api/tts_streaming?voice=v.wav&format=PcmMessagePack"
+
+
+def test_api_key():
+    async def run():
+        stand_in, uri = await started()
+        try:
+            sample = await run_session(uri, "wrong_key", "Bonjour")
+            assert "401" in sample["error"] and stand_in.stats()["rejected"] == 1
+        finally:
+            await stand_in.close()
+    asyncio.run(run())
+
+
+def test_timing_model():
+    async def run():
+        # 30 chars at 30 chars/s → 1s of audio, generated in 0.2s after a 100ms TTFA
+        stand_in, uri = await started(ttfa_ms=100, rtf=0.2, chunk_samples=4800, chars_per_second=30)
+        try:
+            sample = await run_session(uri, "public_token", "Bonjour à tous, bienvenue ici.", send_mode="text")
+        finally:
+            await stand_in.close()
+        assert sample["error"] is None
+        assert 95 <= sample["ttfa_ms"] < 160
+        assert abs(sample["audio_s"] - 26 / 30) < 0.01 and sample["chunks"] == 5
+        # 4800 samples × 0.2 = 40ms apart on a fixed schedule: a late chunk is followed by a shorter gap
+        gaps = sample["gaps_ms"]
+        assert 35 <= sum(gaps) / len(gaps) < 60 and max(gaps) < 80
+        assert 0.2 <= sample["rtf"] < 0.4                         # TTFA included
+    asyncio.run(run())
+
+
+def test_streams_before_eos():
+    async def run():
+        stand_in, uri = await started(ttfa_ms=20, rtf=0.1, chars_per_second=15)
+        try:
+            async with websockets.connect(uri, additional_headers={"kyutai-api-key": "public_token"}) as ws:
+                for word in "Bonjour à vous tous, je suis ravi".split():
+                    await ws.send(msgpack.packb({"type": "Text", "text": word + " "}))
+                # No Eos yet: audio for the text so far still arrives
+                msg = msgpack.unpackb(await asyncio.wait_for(ws.recv(), 1))
+                assert msg["type"] == "Audio" and len(msg["pcm"]) == 1920
+                await ws.send(msgpack.packb({"type": "Eos"}))
+                samples = len(msg["pcm"])
+                while (msg := msgpack.unpackb(await ws.recv()))["type"] != "Done":
+                    samples += len(msg["pcm"])
+                assert samples == int(27 / 15 * SAMPLE_RATE)   # 27 letters at 15/s
+        finally:
+            await stand_in.close()
+    asyncio.run(run())
+
+
+def test_concurrency_slowdown():
+    async def ttfa(sessions):
+        stand_in, uri = await started(ttfa_ms=100, rtf=0.1, slowdown=0.5)
+        try:
+            samples = await asyncio.gather(*(run_session(uri, "public_token", "Bonjour") for _ in range(sessions)))
+            return max(sample["ttfa_ms"] for sample in samples), stand_in.stats()
+        finally:
+            await stand_in.close()
+
+    alone, _ = asyncio.run(ttfa(1))
+    loaded, stats = asyncio.run(ttfa(5))
+    assert stats["active_max"] == 5
+    # The last session to start sees 4 others: 1 + 0.5 × 4 = 3× slower
+    assert alone < 150 and loaded > 250
+    print(f"✅ TTFA alone {alone:.0f}ms, with 5 sessions {loaded:.0f}ms")
+
+
+if __name__ == "__main__":
+    test_api_key()
+    test_timing_model()
+    test_streams_before_eos()
+    test_concurrency_slowdown()
+    print("\n✅ All Kyutai stand-in checks passed!")
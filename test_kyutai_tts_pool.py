@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test the pre-warmed Kyutai connection pool (kyutai_tts_pool.py) against a local stand-in TTS server
+- `size` connections are opened ahead of time; a session on one is a hit and the pool refills behind it
+- Connections the server closed are discarded at acquire time, not handed out
+- Connections idle past max_idle are replaced by the background refill
+"""
+import asyncio
+
+import msgpack
+import websockets
+from websockets.protocol import State
+
+from kyutai_tts_pool import KyutaiConnectionPool
+
+VOICE, FORMAT = "voice.wav", "PcmMessagePack"
+
+
+async def stand_in_tts():
+    """Minimal Kyutai: Audio + Done after Eos; keeps its server-side connections"""
+    connections = []
+
+    async def handler(ws):
+        connections.append(ws)
+        async for message in ws:
+            if msgpack.unpackb(message).get("type") == "Eos":
+                await ws.send(msgpack.packb({"type": "Audio", "pcm": [0.0] * 480}))
+                await ws.send(msgpack.packb({"type": "Done"}))
+                return
+        await ws.wait_closed()
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}/api/tts_streaming", connections
+
+
+async def wait_for(condition, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_refill_after_session():
+    async def run():
+        server, url, connections = await stand_in_tts()
+        pool = KyutaiConnectionPool(url, "public_token", size=2, max_idle=30)
+        try:
+            pool.warm(VOICE, FORMAT)
+            await wait_for(lambda: pool.stats()["idle"] == 2)
+            assert len(connections) == 2
+
+            async with pool.connection(VOICE, FORMAT) as ws:
+                await ws.send(msgpack.packb({"type": "Text", "text": "Bonjour."}))
+                await ws.send(msgpack.packb({"type": "Eos"}))
+                assert msgpack.unpackb(await ws.recv())["type"] == "Audio"
+                assert msgpack.unpackb(await ws.recv())["type"] == "Done"
+            # Single use: retired after the session, and a replacement opened behind it
+            assert ws.state is State.CLOSED
+            await wait_for(lambda: pool.stats()["idle"] == 2)
+            stats = pool.stats()
+            assert stats["hits"] == 1 and stats["misses"] == 0 and stats["opened"] == 3
+        finally:
+            await pool.close()
+            server.close()
+    asyncio.run(run())
+
+
+def test_server_closed_is_discarded():
+    async def run():
+        server, url, connections = await stand_in_tts()
+        pool = KyutaiConnectionPool(url, "public_token", size=2, max_idle=30)
+        try:
+            pool.warm(VOICE, FORMAT)
+            await wait_for(lambda: pool.stats()["idle"] == 2)
+            for ws in connections:
+                await ws.close()
+            await wait_for(lambda: all(ws.state is State.CLOSED for ws, _ in pool._idle[(VOICE, FORMAT)]))
+
+            # Both idle connections are dead: discarded, and the caller gets a fresh one
+            ws = await pool.acquire(VOICE, FORMAT)
+            assert ws.state is State.OPEN
+            stats = pool.stats()
+            assert stats["stale"] == 2 and stats["misses"] == 1 and stats["hits"] == 0
+            await pool.retire(ws)
+            await wait_for(lambda: pool.stats()["idle"] == 2)
+        finally:
+            await pool.close()
+            server.close()
+    asyncio.run(run())
+
+
+def test_max_idle_replacement():
+    async def run():
+        server, url, connections = await stand_in_tts()
+        pool = KyutaiConnectionPool(url, "public_token", size=1, max_idle=0.1)   # refill sweep every 50ms
+        try:
+            pool.warm(VOICE, FORMAT)
+            await wait_for(lambda: pool.stats()["idle"] == 1)
+            first, _ = pool._idle[(VOICE, FORMAT)][0]
+            # Too old: closed and replaced without anyone asking
+            await wait_for(lambda: pool.stats()["stale"] >= 1 and pool.stats()["idle"] == 1)
+            assert pool.stats()["opened"] >= 2 and len(connections) >= 2
+            await wait_for(lambda: first.state is State.CLOSED)
+            ws = await pool.acquire(VOICE, FORMAT)
+            assert ws is not first and ws.state is State.OPEN
+            await pool.retire(ws)
+        finally:
+            await pool.close()
+            server.close()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_refill_after_session()
+    test_server_closed_is_discarded()
+    test_max_idle_replacement()
+    print("\n✅ All Kyutai pool checks passed!")
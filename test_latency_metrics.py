@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test the per-stage latency histograms (latency_metrics.py)
+- Samples land in the right fixed bucket; exported buckets are cumulative, `le` in seconds
+- A turn records GPT first token, Kyutai first audio, first frame and total time
+- A turn that waited behind another one is timed from its final, not from its start
+- Recording one sample costs a few microseconds at most
+- GET /metrics on the sidecar port serves the Prometheus text format
+"""
+import asyncio
+import socket
+import time
+
+import aiohttp
+
+from latency_metrics import Histogram, LatencyMetrics, TurnTimer
+from turn_manager import TurnManager
+
+
+def test_buckets_and_render():
+    histogram = Histogram((10, 100))
+    for ms in (5, 10, 50, 500):
+        histogram.observe(ms)
+    # Upper bounds are inclusive (Prometheus `le`)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == 10 and histogram.quantile(0.75) == 100
+    assert histogram.quantile(1.0) == float("inf")
+
+    metrics = LatencyMetrics(stages=("first_frame",), buckets=(10, 100))
+    for ms in (5, 50, 500):
+        metrics.observe("first_frame", ms)
+    metrics.gauge("active_calls", "Calls in progress", lambda: 3)
+    text = metrics.render()
+    assert 'voicebot_stage_latency_seconds_bucket{stage="first_frame",le="0.01"} 1' in text
+    assert 'voicebot_stage_latency_seconds_bucket{stage="first_frame",le="0.1"} 2' in text
+    assert 'voicebot_stage_latency_seconds_bucket{stage="first_frame",le="+Inf"} 3' in text
+    assert 'voicebot_stage_latency_seconds_sum{stage="first_frame"} 0.555000' in text
+    assert "# TYPE voicebot_active_calls gauge\nvoicebot_active_calls 3" in text
+
+
+def test_turn_stages():
+    metrics = LatencyMetrics()
+
+    async def words():
+        await asyncio.sleep(0.02)
+        yield "Bonjour"
+        yield "!"
+
+    async def run():
+        turn = TurnTimer(metrics)
+        assert [word async for word in turn.first_word(words())] == ["Bonjour", "!"]
+        await asyncio.sleep(0.01)
+        turn.mark("audio")
+        turn.mark("frame")
+        turn.mark("frame")   # later frames do not move the mark
+        turn.finish()
+
+        # Interrupted turn: stages reached are kept, the total is not
+        interrupted = TurnTimer(metrics)
+        interrupted.mark("frame")
+        interrupted.finish(complete=False)
+    asyncio.run(run())
+
+    h = metrics.histograms
+    assert h["gpt_first_token"].count == 1 and h["gpt_first_token"].sum >= 20
+    assert h["kyutai_first_audio"].count == 1 and 10 <= h["kyutai_first_audio"].sum < 20 + 10
+    assert h["first_frame"].count == 2
+    assert h["turn_total"].count == 1 and h["turn_total"].sum >= 30
+    print(f"✅ Turn stages: {metrics.stats()}")
+
+
+def test_queued_turn():
+    metrics = LatencyMetrics()
+
+    async def run():
+        async def respond(transcript):
+            turn = TurnTimer(metrics, queued_ms=turns.current_wait_ms)
+            await asyncio.sleep(0.05)
+            turn.mark("frame")
+            turn.finish()
+
+        turns = TurnManager(respond, policy="queue")
+        turns.submit("Bonjour")
+        turns.submit("Vous êtes ouverts ?")   # waits ~50ms behind the first turn
+        while turns.turns < 2:
+            await asyncio.sleep(0.01)
+        await turns.close()
+    asyncio.run(run())
+
+    h = metrics.histograms
+    assert h["final_to_turn"].count == 2 and h["final_to_turn"].sum >= 45
+    # Second final: 50ms queued + 50ms of its own turn
+    assert h["first_frame"].count == 2 and h["first_frame"].sum >= 50 + 95
+
+
+def test_observe_overhead():
+    metrics = LatencyMetrics()
+    samples = 200_000
+    start = time.perf_counter()
+    for i in range(samples):
+        metrics.observe("first_frame", i % 3000)
+    per_sample_us = (time.perf_counter() - start) / samples * 1e6
+    print(f"✅ observe(): {per_sample_us:.2f}µs per sample")
+    assert per_sample_us < 5
+
+
+def test_serve_metrics():
+    async def run():
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        metrics = LatencyMetrics()
+        metrics.observe("turn_total", 1234)
+        await metrics.serve("127.0.0.1", port)
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                    assert response.status == 200
+                    assert response.content_type == "text/plain"
+                    text = await response.text()
+            assert 'voicebot_stage_latency_seconds_count{stage="turn_total"} 1' in text
+            assert 'voicebot_stage_latency_seconds_bucket{stage="turn_total",le="1.5"} 1' in text
+        finally:
+            await metrics.close()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_buckets_and_render()
+    test_turn_stages()
+    test_queued_turn()
+    test_observe_overhead()
+    test_serve_metrics()
+    print("\n✅ All latency metrics checks passed!")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the OpenAI stand-in (openai_stand_in.py) through the real LLMClient
+- Non-streamed: the whole scripted reply after ttft + tokens × interval
+- Streamed: first token after ttft_ms, one word per delta, exact usage at the end
+- max_tokens cuts the reply short; the default reply echoes the caller
+- A wrong API key is a 401 from the client's point of view
+"""
+import asyncio
+import time
+
+import openai
+
+from llm_client import LLMClient
+from openai_stand_in import OpenAIStandIn
+
+MESSAGES = [{"role": "system", "content": "Assistant"}, {"role": "user", "content": "Quelle heure est-il ?"}]
+
+
+def test_complete_and_stream():
+    async def run():
+        stand_in = OpenAIStandIn(["Il est midi.", "Il est treize heures passées."], ttft_ms=100, token_interval_ms=20)
+        port = await stand_in.start("127.0.0.1", 0)
+        llm = LLMClient("test_key", base_url=f"http://127.0.0.1:{port}/v1")
+        try:
+            assert await llm.complete(MESSAGES) == "Il est midi."
+
+            usage = {"tokens": 0}
+            deltas = []
+            start = time.perf_counter()
+            async for delta in llm.stream(MESSAGES, usage=usage):
+                if not deltas:
+                    ttft_ms = (time.perf_counter() - start) * 1000
+                deltas.append(delta)
+            assert deltas == ["Il", " est", " treize", " heures", " passées."]
+            assert 90 <= ttft_ms < 400, ttft_ms
+            assert usage["tokens"] == 5
+        finally:
+            await llm.client.close()
+            await stand_in.close()
+        assert stand_in.stats()["requests"] == 2 and stand_in.stats()["streamed"] == 1
+    asyncio.run(run())
+
+
+def test_echo_and_max_tokens():
+    async def run():
+        stand_in = OpenAIStandIn(ttft_ms=0, token_interval_ms=0)
+        port = await stand_in.start("127.0.0.1", 0)
+        llm = LLMClient("test_key", base_url=f"http://127.0.0.1:{port}/v1")
+        try:
+            assert "Quelle heure est-il ?" in await llm.complete(MESSAGES)
+            deltas = [delta async for delta in llm.stream(MESSAGES, max_tokens=3)]
+            assert "".join(deltas) == "Vous avez dit"
+        finally:
+            await llm.client.close()
+            await stand_in.close()
+    asyncio.run(run())
+
+
+def test_wrong_key():
+    async def run():
+        stand_in = OpenAIStandIn(ttft_ms=0, api_key="secret")
+        port = await stand_in.start("127.0.0.1", 0)
+        llm = LLMClient("wrong", base_url=f"http://127.0.0.1:{port}/v1")
+        llm.client = llm.client.with_options(max_retries=0)
+        try:
+            try:
+                await llm.complete(MESSAGES)
+                raise AssertionError("accepted a wrong key")
+            except openai.AuthenticationError:
+                pass
+        finally:
+            await llm.client.close()
+            await stand_in.close()
+        assert stand_in.stats()["rejected"] == 1 and llm.errors == 1
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_complete_and_stream()
+    test_echo_and_max_tokens()
+    test_wrong_key()
+    print("\n✅ All OpenAI stand-in checks passed!")
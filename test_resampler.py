@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the streaming polyphase 24kHz → 8kHz resampler (resampler.py)
+- Chunked streaming gives exactly the same output as one-shot resampling (no seams)
+- Anti-aliasing: content above 4kHz is removed before decimation
+- Per-chunk cost does not grow with the amount of audio already processed
+"""
+import time
+import numpy as np
+
+from resampler import FILTER_PRESETS, PolyphaseDecimator, resample_24k_to_8k
+
+
+def test_streaming_matches_one_shot():
+    """Random chunk sizes produce the same samples as one big buffer"""
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 0.3, 3 * 24000).astype(np.float32)
+
+    for quality in FILTER_PRESETS:
+        one_shot = resample_24k_to_8k(audio, quality)
+
+        decimator = PolyphaseDecimator(quality)
+        chunks, i = [], 0
+        while i < len(audio):
+            size = int(rng.integers(1, 4000))
+            chunks.append(decimator.process(audio[i:i+size]))
+            i += size
+        chunks.append(decimator.flush())
+        streamed = np.concatenate(chunks)
+
+        assert len(streamed) == len(one_shot)
+        assert np.allclose(streamed, one_shot, atol=1e-6)
+        print(f"✅ {quality}: {len(chunks)} chunks → {len(streamed)} samples, identical to one-shot")
+
+
+def test_output_length():
+    """One Kyutai frame (1920 samples @ 24kHz) → 640 samples @ 8kHz"""
+    decimator = PolyphaseDecimator()
+    sizes = [len(decimator.process(np.zeros(1920, dtype=np.float32))) for _ in range(10)]
+    assert sum(sizes) == 6400
+    print(f"✅ 10 × 1920 samples → {sum(sizes)} samples @ 8kHz")
+
+
+def test_anti_aliasing():
+    """A 1kHz tone passes, a 6kHz tone (would alias to 2kHz) is removed"""
+    t = np.arange(24000) / 24000
+    for quality, min_rejection_db in [("high_quality", 60), ("low_latency", 40)]:
+        passed = resample_24k_to_8k(np.sin(2 * np.pi * 1000 * t), quality)[200:-200]
+        aliased = resample_24k_to_8k(np.sin(2 * np.pi * 6000 * t), quality)[200:-200]
+        rejection_db = 20 * np.log10(np.std(passed) / np.std(aliased))
+        assert abs(np.std(passed) - np.sqrt(0.5)) < 0.01
+        assert rejection_db > min_rejection_db
+        print(f"✅ {quality}: 6kHz alias rejected by {rejection_db:.0f}dB")
+
+
+def test_constant_chunk_cost():
+    """Cost of a frame after 60s of audio ≈ cost of the first frame"""
+    frame = np.random.default_rng(1).normal(0, 0.3, 1920).astype(np.float32)
+
+    def frame_cost(decimator):
+        start = time.perf_counter()
+        for _ in range(50):
+            decimator.process(frame)
+        return (time.perf_counter() - start) / 50
+
+    fresh = min(frame_cost(PolyphaseDecimator()) for _ in range(3))
+    decimator = PolyphaseDecimator()
+    for _ in range(750):  # 60s of audio
+        decimator.process(frame)
+    after_60s = min(frame_cost(decimator) for _ in range(3))
+    print(f"⏱️ Per 80ms frame: {fresh*1e6:.0f}µs fresh, {after_60s*1e6:.0f}µs after 60s")
+    assert after_60s < fresh * 3
+
+
+if __name__ == "__main__":
+    test_streaming_matches_one_shot()
+    test_output_length()
+    test_anti_aliasing()
+    test_constant_chunk_cost()
+    print("\n✅ All resampler checks passed!")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test the GPT response cache (response_cache.py)
+- Normalization ignores case, accents, punctuation and spoken fillers
+- Fuzzy token-set matching finds rephrased questions, not different ones
+- TTL, size bound and pinning; per-entry hit counts
+"""
+import json
+import os
+import tempfile
+
+import response_cache
+from response_cache import ResponseCache, normalize_utterance
+
+
+def test_normalize():
+    assert normalize_utterance("Euh… Quels sont vos HORAIRES ?") == "quels sont vos horaires"
+    assert normalize_utterance("Où êtes-vous situés, hein ?") == "ou etes vous situes"
+    assert normalize_utterance("euh hum") == ""
+
+
+def test_exact_and_fuzzy():
+    cache = ResponseCache(fuzzy_threshold=0.7)
+    cache.store("Quels sont vos horaires d'ouverture ?", "Nous sommes ouverts de 9h à 18h.")
+
+    assert cache.lookup("quels sont vos horaires d'ouverture") == "Nous sommes ouverts de 9h à 18h."
+    assert cache.lookup("Euh, vos horaires d'ouverture, quels sont-ils ?") == "Nous sommes ouverts de 9h à 18h."
+    assert cache.lookup("Quels sont vos tarifs ?") is None
+
+    stats = cache.stats()
+    assert stats["exact_hits"] == 1 and stats["fuzzy_hits"] == 1 and stats["lookups"] == 3
+    assert stats["top"] == [("Quels sont vos horaires d'ouverture ?", 2, False)]
+    print(f"✅ Exact + fuzzy: {stats['hit_rate']:.0%} hit rate")
+
+    exact_only = ResponseCache(fuzzy_threshold=0)
+    exact_only.store("Quels sont vos horaires d'ouverture ?", "9h-18h")
+    assert exact_only.lookup("Vos horaires d'ouverture, quels sont-ils ?") is None
+
+
+def test_ttl_size_and_pinning():
+    now = [1000.0]
+    real_monotonic = response_cache.time.monotonic
+    response_cache.time.monotonic = lambda: now[0]
+    try:
+        cache = ResponseCache(ttl=60, max_entries=2)
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+            json.dump([{"question": "Comment vous joindre ?", "answer": "Au 01 23 45 67 89."}], f)
+        try:
+            assert cache.load_faq(f.name) == 1
+        finally:
+            os.unlink(f.name)
+
+        cache.store("question un", "réponse un")
+        cache.store("question deux", "réponse deux")
+        assert len(cache) == 2 and cache.stats()["evicted"] == 1
+        assert cache.lookup("question un") is None
+
+        now[0] += 61
+        assert cache.lookup("question deux") is None
+        assert cache.lookup("comment vous joindre") == "Au 01 23 45 67 89."
+        stats = cache.stats()
+        assert stats["expired"] == 1 and stats["pinned"] == 1
+        print(f"✅ TTL + size bound, pinned FAQ kept: {stats}")
+    finally:
+        response_cache.time.monotonic = real_monotonic
+
+
+if __name__ == "__main__":
+    test_normalize()
+    test_exact_and_fuzzy()
+    test_ttl_size_and_pinning()
+    print("\n✅ All response cache checks passed!")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test sentence-level TTS pipelining (sentence_pipeline.py)
+- Replies split at sentence ends, long sentences also at clause boundaries
+- A segment's synthesis starts on its first word; the rest of its words stream in
+- Segment 2 is synthesized while segment 1 plays, never more than `lookahead` ahead
+- Frames reach Twilio in order with no bytes lost between segments
+- A segment Kyutai did not finish makes the reply incomplete (not cached)
+"""
+import asyncio
+
+from sentence_pipeline import SentencePipeline, iter_words, split_segments
+
+
+class FakePlayout:
+    async def wait(self):
+        await asyncio.sleep(0.001)
+
+
+def fake_kyutai(chunk_bytes=100, chunks=5, delay=0.005, fail=()):
+    """Each segment yields `chunks` odd-sized μ-law chunks filled with its segment number"""
+    state = {"active": 0, "max_active": 0, "calls": []}
+
+    async def synthesize(words, emit, first):
+        assert first == (not state["calls"])
+        state["calls"].append(words)
+        number = len(state["calls"])
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            text = " ".join([word async for word in words])
+            for _ in range(chunks):
+                await asyncio.sleep(delay)
+                emit(bytes([number]) * chunk_bytes)
+            return text not in fail
+        finally:
+            state["active"] -= 1
+    return synthesize, state
+
+
+def test_split_segments():
+    async def run(text, **kwargs):
+        return [segment async for segment in split_segments(iter_words(text), **kwargs)]
+
+    assert asyncio.run(run("Bonjour ! Nous sommes ouverts. À bientôt")) == ["Bonjour !", "Nous sommes ouverts.", "À bientôt"]
+    long_sentence = "Nous sommes ouverts du lundi au vendredi, de neuf heures à dix-huit heures, sauf les jours fériés."
+    assert asyncio.run(run(long_sentence, min_clause_words=4)) == [
+        "Nous sommes ouverts du lundi au vendredi,",
+        "de neuf heures à dix-huit heures,",
+        "sauf les jours fériés.",
+    ]
+    assert asyncio.run(run("un deux trois quatre cinq", max_words=2)) == ["un deux", "trois quatre", "cinq"]
+
+
+def test_pipelined_playback():
+    async def run():
+        synthesize, state = fake_kyutai()
+        frames = []
+
+        async def send(frame):
+            frames.append(frame)
+
+        pipeline = SentencePipeline(synthesize, lookahead=1)
+        audio = await pipeline.run("Bonjour. Nous sommes ouverts. À bientôt.", send, FakePlayout())
+
+        # Every byte of every segment, in segment order, in 160-byte frames (last one may be short)
+        assert audio == b"".join(bytes([n]) * 500 for n in (1, 2, 3))
+        assert b"".join(frames) == audio and all(len(f) == 160 for f in frames[:-1])
+        # Segment 2 overlapped segment 1's playout, but never more than one segment ahead
+        assert state["max_active"] <= 2
+        first, second = pipeline.timings[0], pipeline.timings[1]
+        assert second["synth_start_ms"] < first["play_end_ms"]
+        assert second["synth_start_ms"] >= first["play_start_ms"]
+        print(f"✅ Pipelined: {len(frames)} frames, {len(pipeline.timings)} segments")
+    asyncio.run(run())
+
+
+def test_first_segment_streams():
+    async def run():
+        received = []
+
+        async def synthesize(words, emit, first):
+            async for word in words:
+                received.append((word, asyncio.get_running_loop().time()))
+            emit(b"\x00" * 160)
+            return True
+
+        async def gpt():
+            for word in "Bonjour, je regarde vos horaires tout de suite. Merci.".split():
+                await asyncio.sleep(0.02)
+                yield word
+
+        async def send(frame):
+            pass
+
+        pipeline = SentencePipeline(synthesize, lookahead=1)
+        start = asyncio.get_running_loop().time()
+        await pipeline.run(gpt(), send, FakePlayout())
+        # Kyutai got the first word right away, not once GPT finished the sentence (8 words later)
+        assert received[0][0] == "Bonjour," and received[0][1] - start < 0.1
+        assert pipeline.timings[0]["synth_start_ms"] < 50 and pipeline.timings[0]["chars"] == len("Bonjour, je regarde vos horaires tout de suite.")
+        assert [timing["chars"] for timing in pipeline.timings][1:] == [len("Merci.")]
+    asyncio.run(run())
+
+
+def test_incomplete_segment():
+    async def run():
+        synthesize, _ = fake_kyutai(fail=("Nous sommes ouverts.",))
+        frames = []
+
+        async def send(frame):
+            frames.append(frame)
+
+        pipeline = SentencePipeline(synthesize, lookahead=2)
+        audio = await pipeline.run("Bonjour. Nous sommes ouverts. À bientôt.", send, FakePlayout(), buffered=True)
+        assert audio is None and len(b"".join(frames)) == 1500
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_split_segments()
+    test_pipelined_playback()
+    test_first_segment_streams()
+    test_incomplete_segment()
+    print("\n✅ All sentence pipeline checks passed!")
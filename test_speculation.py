@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test speculative GPT replies (speculation.py)
+- A stable interim starts the reply; a matching final adopts it with its head start
+- A changing interim never speculates; a different final discards the reply
+- Tokens of discarded speculations are counted as wasted
+- `finished` only once the GPT stream ended on its own (the caller then caches the answer)
+"""
+import asyncio
+
+from speculation import Speculator, transcript_similarity
+
+
+def fake_gpt(words, delay=0.02):
+    calls = []
+
+    async def generate(transcript, usage):
+        calls.append(transcript)
+        for word in words:
+            await asyncio.sleep(delay)
+            usage["tokens"] += 1
+            yield word
+    return generate, calls
+
+
+def test_similarity():
+    assert transcript_similarity("Quels sont vos horaires ?", "euh quels sont vos horaires") == 1.0
+    assert transcript_similarity("je voudrais réserver", "je voudrais annuler ma réservation") < 0.9
+
+
+def test_stable_interim_is_adopted():
+    async def run():
+        generate, calls = fake_gpt(["Nous", "sommes", "ouverts."])
+        speculator = Speculator(generate, stable_ms=50)
+        speculator.interim("quels sont")
+        await asyncio.sleep(0.02)
+        speculator.interim("quels sont vos horaires")
+        await asyncio.sleep(0.1)
+
+        reply = speculator.take("Quels sont vos horaires ?")
+        assert reply is not None and calls == ["quels sont vos horaires"]
+        assert [word async for word in reply.replay()] == ["Nous", "sommes", "ouverts."]
+        await reply.text()
+        assert reply.finished
+        stats = speculator.stats()
+        assert stats["hits"] == 1 and stats["hit_rate"] == 1.0 and stats["wasted_tokens"] == 0
+        print(f"✅ Speculation adopted: {stats}")
+    asyncio.run(run())
+
+
+def test_mismatch_is_discarded():
+    async def run():
+        generate, calls = fake_gpt(["Bien", "sûr,", "pour", "quelle", "date ?"])
+        speculator = Speculator(generate, stable_ms=50)
+
+        # Interim keeps changing faster than the window: no speculation
+        for words in ("je", "je voudrais", "je voudrais réserver"):
+            speculator.interim(words)
+            await asyncio.sleep(0.02)
+        assert not calls
+
+        await asyncio.sleep(0.1)
+        assert calls == ["je voudrais réserver"]
+        pending = speculator.current
+        assert speculator.take("je voudrais annuler ma réservation pour demain") is None
+        stats = speculator.stats()
+        assert stats["discarded"] == 1 and stats["wasted_tokens"] >= 1
+        await asyncio.sleep(0)
+        assert pending.done and not pending.finished
+        print(f"✅ Mismatch discarded: {stats}")
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_similarity()
+    test_stable_interim_is_adopted()
+    test_mismatch_is_discarded()
+    print("\n✅ All speculation checks passed!")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test the per-call transcript journal (transcript_journal.py)
+- Concurrent calls each get their own file, lines in submission order
+- write() never blocks the caller, even when the disk is slow
+- Lines are batched and everything queued is on disk after close()
+"""
+import os
+import tempfile
+import threading
+import time
+
+import transcript_journal
+from transcript_journal import TranscriptJournal
+
+
+def test_one_file_per_call():
+    """Interleaved calls never overwrite or mix each other's transcripts"""
+    with tempfile.TemporaryDirectory() as directory:
+        journal = TranscriptJournal(directory, flush_interval=0.01)
+        for i in range(50):
+            journal.write("CA111", f"appel un {i}")
+            journal.write("CA222", f"appel deux {i}")
+        journal.close_call("CA111")
+        journal.close()
+
+        for call_sid, label in (("CA111", "un"), ("CA222", "deux")):
+            with open(journal.path(call_sid), encoding="utf-8") as f:
+                assert f.read().splitlines() == [f"appel {label} {i}" for i in range(50)]
+        stats = journal.stats()
+        assert stats["records"] == 100 and stats["open_files"] == 0
+        assert stats["batch_avg"] > 1
+        print(f"✅ 2 calls → 2 files, {stats['batches']} batch(es)")
+
+
+def test_path_stays_in_directory():
+    journal = TranscriptJournal("transcripts")
+    assert journal.path("../../etc/passwd") == os.path.join("transcripts", "etcpasswd.txt")
+
+
+def test_write_never_blocks_on_disk():
+    """A stalled disk delays the writer thread, not the event loop"""
+    with tempfile.TemporaryDirectory() as directory:
+        journal = TranscriptJournal(directory, fsync="batch", flush_interval=0.0)
+        real_fsync = transcript_journal.os.fsync
+        disk_free = threading.Event()
+
+        def slow_fsync(fd):
+            disk_free.wait()
+            real_fsync(fd)
+
+        transcript_journal.os.fsync = slow_fsync
+        try:
+            start = time.perf_counter()
+            for i in range(1000):
+                journal.write("CA333", f"ligne {i}")
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            disk_free.set()
+            journal.close()
+        finally:
+            transcript_journal.os.fsync = real_fsync
+
+        with open(journal.path("CA333"), encoding="utf-8") as f:
+            assert len(f.read().splitlines()) == 1000
+        print(f"⏱️ 1000 writes with a stalled disk: {elapsed_ms:.1f}ms on the caller")
+        assert elapsed_ms < 100
+
+
+if __name__ == "__main__":
+    test_one_file_per_call()
+    test_path_stays_in_directory()
+    test_write_never_blocks_on_disk()
+    print("\n✅ All transcript journal checks passed!")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test the open-loop TTS benchmark (tts_bench.py) against a stand-in Kyutai server
+- Poisson and constant schedules hit the target rate; the same seed repeats a run
+- Sessions start on schedule even while earlier ones are still running (open loop)
+- TTFA, inter-chunk gaps, total time and RTF are measured; JSON holds summary and samples
+- The command line (`--json`) runs against the Kyutai stand-in and writes a parseable report
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+import msgpack
+import websockets
+
+import tts_bench
+from kyutai_stand_in import KyutaiStandIn
+from tts_bench import arrival_times, run_benchmark
+
+
+async def stand_in_tts(ttfa=0.05, chunks=4, gap=0.02, samples=1920):
+    """Kyutai protocol: Audio chunks of `samples` PCM floats after `ttfa` s, `gap` s apart, then Done"""
+    async def handler(ws):
+        if ws.request.headers.get("kyutai-api-key") != "public_token":
+            await ws.close(4001, "bad key")
+            return
+        async for message in ws:
+            if msgpack.unpackb(message).get("type") == "Eos":
+                await asyncio.sleep(ttfa)
+                for i in range(chunks):
+                    if i:
+                        await asyncio.sleep(gap)
+                    await ws.send(msgpack.packb({"type": "Audio", "pcm": [0.0] * samples}))
+                await ws.send(msgpack.packb({"type": "Done"}))
+                return
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}/api/tts_streaming?voice=v.wav&format=PcmMessagePack"
+
+
+def test_schedules():
+    poisson = arrival_times(50, 20, "poisson", seed=1)
+    assert 900 < len(poisson) < 1100
+    assert poisson == arrival_times(50, 20, "poisson", seed=1)
+    constant = arrival_times(4, 2, "constant")
+    assert [round(t, 6) for t in constant] == [0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75]
+
+
+def test_open_loop_measurements():
+    async def run():
+        server, uri = await stand_in_tts(ttfa=0.05, chunks=4, gap=0.02)
+        try:
+            # Sessions last ~0.11s and start every 0.05s: an open loop keeps several in flight
+            return await run_benchmark(uri, "public_token", ["Bonjour à tous."], rate=20, duration=1,
+                                       schedule="constant")
+        finally:
+            server.close()
+    result = asyncio.run(run())
+    summary = result["summary"]
+    assert summary["sessions"] == 19 and summary["errors"] == 0
+    assert summary["in_flight_max"] >= 2
+    assert 45 <= summary["ttfa_ms"]["p50"] < 100
+    assert summary["gap_ms"]["count"] == 19 * 3 and 15 <= summary["gap_ms"]["p50"] < 60
+    # 4 × 1920 samples = 0.32s of audio in ~0.11s
+    sample = result["samples"][0]
+    assert sample["audio_s"] == 0.32 and 0.3 < sample["rtf"] < 0.6
+    assert summary["late_ms"]["p99"] < 50
+    print(tts_bench.report(summary))
+
+
+def test_errors_and_json():
+    async def run():
+        server, uri = await stand_in_tts()
+        try:
+            return await run_benchmark(uri, "wrong_key", ["Bonjour"], rate=10, duration=0.3, schedule="constant")
+        finally:
+            server.close()
+    result = asyncio.run(run())
+    assert result["summary"]["errors"] == result["summary"]["sessions"] == 2
+    assert result["summary"]["ttfa_ms"] is None
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "run.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["config"]["schedule"] == "constant"
+
+
+def test_cli_json():
+    async def run(path):
+        stand_in = KyutaiStandIn(ttfa_ms=30, rtf=0.1)
+        port = await stand_in.start("127.0.0.1", 0)
+        try:
+            # main() runs its own event loop: give it a thread while the stand-in serves on this one
+            await asyncio.to_thread(tts_bench.main, [
+                "--url", f"ws://127.0.0.1:{port}/api/tts_streaming", "--api-key", "public_token",
+                "--rate", "10", "--duration", "0.5", "--schedule", "constant", "--seed", "1", "--json", path,
+            ])
+        finally:
+            await stand_in.close()
+        return stand_in.stats()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "run.json")
+        served = asyncio.run(run(path))
+        with open(path, encoding="utf-8") as f:
+            result = json.load(f)
+    summary = result["summary"]
+    assert result["config"]["schedule"] == "constant" and result["config"]["seed"] == 1
+    assert summary["sessions"] == served["sessions"] == 4 and summary["errors"] == 0
+    assert len(result["samples"]) == 4 and summary["ttfa_ms"]["p50"] >= 30
+
+
+if __name__ == "__main__":
+    test_schedules()
+    test_open_loop_measurements()
+    test_errors_and_json()
+    test_cli_json()
+    print("\n✅ All TTS benchmark checks passed!")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the synthesized-reply cache (tts_cache.py)
+- Keys ignore spacing and case but not voice or format
+- Memory LRU and disk store stay within their byte limits
+- Entries written by an earlier run are served from disk (mmap)
+- Two calls storing the same reply at once count it once
+"""
+import asyncio
+import tempfile
+
+from tts_cache import TTSCache
+
+VOICE = "cml-tts/fr/2465_1943_000152-0002.wav"
+FORMAT = "PcmMessagePack"
+
+
+def test_normalized_key():
+    async def run():
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TTSCache(directory)
+            await cache.put(VOICE, FORMAT, "Je n'ai pas compris.", b"\xff" * 1600)
+            assert await cache.get(VOICE, FORMAT, "  je n'ai  pas COMPRIS. ") == b"\xff" * 1600
+            assert await cache.get("other-voice.wav", FORMAT, "Je n'ai pas compris.") is None
+            assert await cache.get(VOICE, FORMAT, "Je n'ai pas compris !") is None
+            stats = cache.stats()
+            assert stats["hits"] == 1 and stats["misses"] == 2
+            print(f"✅ Normalized key: {stats['hit_rate']:.0%} hit rate on 3 lookups")
+    asyncio.run(run())
+
+
+def test_byte_limits():
+    async def run():
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TTSCache(directory, max_memory_bytes=3000, max_disk_bytes=5000)
+            for i in range(5):
+                await cache.put(VOICE, FORMAT, f"phrase {i}", bytes([i]) * 1600)
+            stats = cache.stats()
+            assert stats["memory_bytes"] <= 3000 and stats["memory_entries"] == 1
+            assert stats["disk_bytes"] <= 5000 and stats["disk_entries"] == 3
+            assert stats["memory_evictions"] == 4 and stats["disk_evictions"] == 2
+
+            # Oldest phrases are gone, the newest come back from memory or disk
+            assert await cache.get(VOICE, FORMAT, "phrase 0") is None
+            assert (await cache.get(VOICE, FORMAT, "phrase 2"))[:] == bytes([2]) * 1600
+            assert (await cache.get(VOICE, FORMAT, "phrase 4"))[:] == bytes([4]) * 1600
+            print(f"✅ Byte limits held: {stats}")
+    asyncio.run(run())
+
+
+def test_reload_from_disk():
+    async def run():
+        with tempfile.TemporaryDirectory() as directory:
+            await TTSCache(directory).put(VOICE, FORMAT, "Bonjour !", b"\x7f" * 8000)
+
+            cache = TTSCache(directory)
+            audio = await cache.get(VOICE, FORMAT, "bonjour !")
+            assert audio[:] == b"\x7f" * 8000
+            assert cache.stats()["disk_hits"] == 1
+            assert (await cache.get(VOICE, FORMAT, "bonjour !")) is audio
+            assert cache.stats()["memory_hits"] == 1
+            print("✅ Entry from a previous run served from the mmap'd file")
+    asyncio.run(run())
+
+
+def test_concurrent_put():
+    async def run():
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TTSCache(directory, max_disk_bytes=2000)
+            await asyncio.gather(*(cache.put(VOICE, FORMAT, "Bonjour !", b"\x7f" * 1600) for _ in range(3)))
+            stats = cache.stats()
+            assert stats["stored"] == 1 and stats["disk_bytes"] == 1600 and stats["disk_evictions"] == 0
+            assert (await cache.get(VOICE, FORMAT, "Bonjour !"))[:] == b"\x7f" * 1600
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_normalized_key()
+    test_byte_limits()
+    test_reload_from_disk()
+    test_concurrent_put()
+    print("\n✅ All TTS cache checks passed!")
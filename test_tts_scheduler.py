@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the Kyutai admission scheduler (tts_scheduler.py)
+- Never more than max_sessions in flight
+- Waiters admitted by priority (first sentence, continuation, offline), FIFO within one
+- A waiter cancelled in the queue does not leak its slot
+- A streamed segment takes its slot on its first word and holds it through GPT stalls
+"""
+import asyncio
+
+from sentence_pipeline import SentencePipeline
+from tts_scheduler import LIVE_FIRST, LIVE_NEXT, OFFLINE, TTSScheduler
+
+
+def test_cap_and_priority():
+    async def run():
+        scheduler = TTSScheduler(max_sessions=2)
+        order = []
+        release = asyncio.Event()
+
+        async def session(name, priority):
+            async with scheduler.slot(priority):
+                order.append(name)
+                assert scheduler.in_flight <= 2
+                await release.wait()
+
+        # Two sessions take the slots, the rest queue in mixed order
+        running = [asyncio.create_task(session(f"busy{i}", LIVE_FIRST)) for i in range(2)]
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(session("prerender", OFFLINE)),
+            asyncio.create_task(session("next-a", LIVE_NEXT)),
+            asyncio.create_task(session("first", LIVE_FIRST)),
+            asyncio.create_task(session("next-b", LIVE_NEXT)),
+        ]
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["waiting"] == 4
+
+        release.set()
+        await asyncio.gather(*running, *queued)
+        assert order == ["busy0", "busy1", "first", "next-a", "next-b", "prerender"]
+
+        stats = scheduler.stats()
+        assert stats["in_flight"] == 0 and stats["in_flight_max"] == 2
+        assert stats["queued"] == {"live_first": 1, "live_next": 2, "offline": 1}
+        assert stats["queue_wait_ms_max"]["offline"] >= 10
+        print(f"✅ Priority admission: {stats}")
+    asyncio.run(run())
+
+
+def test_cancelled_waiter():
+    async def run():
+        scheduler = TTSScheduler(max_sessions=1)
+        async with scheduler.slot():
+            waiter = asyncio.create_task(scheduler.acquire(LIVE_NEXT))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        # The slot came back: a new session is admitted at once
+        assert await scheduler.acquire() < 1 and scheduler.in_flight == 1
+    asyncio.run(run())
+
+
+def test_slot_spans_streamed_segment():
+    async def run():
+        scheduler = TTSScheduler(max_sessions=1)
+        first_word = asyncio.Event()
+        stalled = asyncio.Event()
+        resume = asyncio.Event()
+
+        async def synthesize(words, emit, first):
+            async with scheduler.slot():
+                async for _ in words:
+                    pass
+                emit(b"\x00" * 160)
+            return True
+
+        async def gpt():
+            await first_word.wait()
+            yield "Bonjour,"
+            stalled.set()
+            await resume.wait()
+            yield "bienvenue."
+
+        async def send(frame):
+            pass
+
+        class Playout:
+            async def wait(self):
+                pass
+
+        reply = asyncio.create_task(SentencePipeline(synthesize).run(gpt(), send, Playout()))
+        # No slot while GPT has not produced a word
+        await asyncio.sleep(0.01)
+        assert scheduler.in_flight == 0
+        # GPT stalls mid-sentence: the open session keeps its slot, another one queues
+        first_word.set()
+        await stalled.wait()
+        await asyncio.sleep(0.01)
+        assert scheduler.in_flight == 1
+        other = asyncio.create_task(scheduler.acquire(OFFLINE))
+        await asyncio.sleep(0.01)
+        assert not other.done()
+        resume.set()
+        await reply
+        assert await other < 1000 and scheduler.in_flight == 1
+    asyncio.run(run())
+
+
+def test_unlimited():
+    async def run():
+        scheduler = TTSScheduler(max_sessions=0)
+        for _ in range(50):
+            await scheduler.acquire(OFFLINE)
+        assert scheduler.stats()["queued_max"] == 0
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_cap_and_priority()
+    test_cancelled_waiter()
+    test_slot_spans_streamed_segment()
+    test_unlimited()
+    print("\n✅ All TTS scheduler checks passed!")
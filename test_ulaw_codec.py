@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the shared G.711 μ-law codec (ulaw_codec.py)
+- Bit-exact against audioop (when audioop is still available, Python < 3.13)
+- float → int16 saturates instead of wrapping
+- Speed vs the old per-sample list-comprehension path on a 5-second utterance
+"""
+import timeit
+import numpy as np
+
+from ulaw_codec import float_to_int16, lin2ulaw, ulaw2lin, float_to_ulaw
+
+try:
+    import audioop
+except ImportError:
+    audioop = None
+
+
+def old_float_to_ulaw(float_samples):
+    """Previous twilio_kyutai_integration path: list comprehension + float log approximation"""
+    pcm_data = np.array([int(x * 32767) for x in float_samples], dtype=np.int16)
+    mu = 255.0
+    magnitude = np.log(1.0 + mu * np.abs(pcm_data) / 32768.0) / np.log(1.0 + mu)
+    return np.uint8(np.sign(pcm_data) * magnitude * 128.0 + 128.0)
+
+
+def test_encode_matches_audioop():
+    """Every int16 value encodes to the same byte as audioop.lin2ulaw"""
+    if audioop is None:
+        print("⚠️  audioop not available, skipping bit-exact encode check")
+        return
+    all_samples = np.arange(-32768, 32768, dtype=np.int16)
+    assert lin2ulaw(all_samples) == audioop.lin2ulaw(all_samples.tobytes(), 2)
+    assert lin2ulaw(all_samples.tobytes()) == audioop.lin2ulaw(all_samples.tobytes(), 2)
+    print("✅ lin2ulaw matches audioop for all 65536 samples")
+
+
+def test_decode_matches_audioop():
+    """Every μ-law byte decodes to the same sample as audioop.ulaw2lin"""
+    if audioop is None:
+        print("⚠️  audioop not available, skipping bit-exact decode check")
+        return
+    all_bytes = bytes(range(256))
+    assert ulaw2lin(all_bytes).tobytes() == audioop.ulaw2lin(all_bytes, 2)
+    print("✅ ulaw2lin matches audioop for all 256 codes")
+
+
+def test_float_to_int16_saturates():
+    """Overshoot clips to the int16 range instead of wrapping around"""
+    samples = float_to_int16([1.5, -1.5, 1.0, -1.0, 0.5, 0.0])
+    assert samples.dtype == np.int16
+    assert samples.tolist() == [32767, -32768, 32767, -32767, 16383, 0]
+    print(f"✅ float → int16 saturates: [1.5, -1.5] → {samples[:2].tolist()}")
+
+
+def test_speed_vs_list_comprehension():
+    """Vectorized path is > 50× faster on a 5-second 24kHz utterance"""
+    rng = np.random.default_rng(0)
+    utterance = np.clip(rng.normal(0, 0.3, 5 * 24000), -1.0, 1.0).astype(np.float32)
+    utterance_list = utterance.tolist()
+
+    old_time = min(timeit.repeat(lambda: old_float_to_ulaw(utterance_list), number=1, repeat=3))
+    new_time = min(timeit.repeat(lambda: float_to_ulaw(utterance), number=5, repeat=3)) / 5
+    speedup = old_time / new_time
+    print(f"⏱️ 5s utterance: list comprehension {old_time*1000:.1f}ms, lookup table {new_time*1000:.2f}ms ({speedup:.0f}×)")
+    assert speedup > 50
+
+
+if __name__ == "__main__":
+    test_encode_matches_audioop()
+    test_decode_matches_audioop()
+    test_float_to_int16_saturates()
+    test_speed_vs_list_comprehension()
+    print("\n✅ All codec checks passed!")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test the shared pre-opened connection pool (warm_pool.py) with fake connections
+- `size` connections per key are kept ready; acquiring one is a hit, an empty pool a miss
+- Stale connections (closed or idle past max_idle) are discarded and replaced
+- A failing keepalive discards the connection; counters match the stats
+- Discarded connections are closed in tracked tasks; WarmPool itself is abstract
+"""
+import asyncio
+
+from warm_pool import WarmPool
+
+
+class FakeConnection:
+    def __init__(self, key):
+        self.key = key
+        self.closed = False
+        self.pings = 0
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePool(WarmPool):
+    label = "Fake"
+
+    def __init__(self, fail_keepalive=False, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_keepalive = fail_keepalive
+
+    async def _open(self, key):
+        return FakeConnection(key)
+
+    def _is_open(self, conn):
+        return not conn.closed
+
+    async def _keepalive(self, conn):
+        if self.fail_keepalive:
+            raise ConnectionError("gone")
+        conn.pings += 1
+
+
+def test_hits_and_refill():
+    async def run():
+        pool = FakePool(size=2, max_idle=10, refill_interval=0.02)
+        assert (await pool._acquire("a")).key == "a" and pool.misses == 1
+        await asyncio.sleep(0.01)
+        first = await pool._acquire("a")
+        assert pool.hits == 1 and pool.stats()["hit_rate"] == 0.5
+        await asyncio.sleep(0.01)
+        assert pool.stats()["idle"] == 2 and pool.opened == 4
+
+        # Closed behind our back: discarded and replaced on the next sweep
+        for conn, _ in list(pool._idle["a"]):
+            conn.closed = True
+        await asyncio.sleep(0.05)
+        assert pool.stale == 2 and pool.stats()["idle"] == 2
+        assert all(conn.pings for conn, _ in pool._idle["a"])
+        await pool.retire(first)
+        await pool.close()
+        assert first.closed and pool.stats()["idle"] == 0 and not pool._closing
+    asyncio.run(run())
+
+
+def test_failed_keepalive_and_idle_expiry():
+    async def run():
+        pool = FakePool(fail_keepalive=True, size=1, max_idle=10, refill_interval=0.02)
+        pool._warm("b")
+        await asyncio.sleep(0.05)
+        assert pool.stale >= 1 and pool.opened >= 2
+        await pool.close()
+
+        pool = FakePool(size=1, max_idle=0.0, refill_interval=10)
+        pool._warm("c")
+        await asyncio.sleep(0.01)
+        await pool._acquire("c")   # the idle one is already too old
+        assert pool.misses == 1 and pool.stale == 1 and len(pool._closing) == 1
+        await pool.close()
+        assert not pool._closing
+    asyncio.run(run())
+
+
+def test_abstract():
+    try:
+        WarmPool()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("WarmPool must be subclassed")
+
+
+if __name__ == "__main__":
+    test_hits_and_refill()
+    test_failed_keepalive_and_idle_expiry()
+    test_abstract()
+    print("\n✅ All warm pool checks passed!")
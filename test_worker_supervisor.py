@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test the multi-process worker supervisor (worker_supervisor.py)
+- The call gauge counts calls while their handler runs
+- A worker that exits is restarted; per-worker active calls are reported
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from worker_supervisor import CallGauge, WorkerSupervisor
+
+
+def busy_worker(index, gauge):
+    # Worker 1 crashes on its first run, then behaves like worker 2: one long call
+    marker = os.path.join(os.environ["SUPERVISOR_TEST_DIR"], f"started-{index}")
+    if index == 0 and not os.path.exists(marker):
+        open(marker, "w").close()
+        raise SystemExit(3)
+    with gauge.track():
+        time.sleep(30)
+
+
+def test_call_gauge():
+    async def run():
+        gauge = CallGauge()
+        seen = []
+
+        async def handler(websocket):
+            seen.append(gauge.value)
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(gauge.wrap(handler)("a"), gauge.wrap(handler)("b"))
+        assert seen == [1, 2] and gauge.value == 0
+    asyncio.run(run())
+
+
+def test_restart_and_report():
+    os.environ["SUPERVISOR_TEST_DIR"] = tempfile.mkdtemp()
+    supervisor = WorkerSupervisor(busy_worker, 2, report_interval=0, restart_delay=0.1)
+    supervisor.start()
+    try:
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline:
+            supervisor.poll(timeout=0.1)
+            stats = supervisor.stats()
+            if stats["restarts"] == 1 and stats["active_calls"] == 2:
+                break
+        assert stats["alive"] == 2 and stats["active_calls"] == 2
+        assert stats["workers"][0]["restarts"] == 1 and stats["workers"][0]["last_exit_code"] == 3
+        assert stats["workers"][1]["restarts"] == 0
+        supervisor.report()
+    finally:
+        supervisor.stop(timeout=5)
+    assert supervisor.stats()["alive"] == 0
+
+
+if __name__ == "__main__":
+    test_call_gauge()
+    test_restart_and_report()
+    print("\n✅ All worker supervisor checks passed!")
@@ -0,0 +1,162 @@
+"""
+Per-call transcript journal with a background writer
+
+Every call gets its own file (<directory>/<CallSid>.txt), so concurrent
+calls no longer truncate or interleave one shared transcript. `write()`
+only puts the line on a queue: a single writer thread does all file I/O,
+in batches, so disk latency never stalls the event loop that paces audio.
+
+fsync policy:
+- "batch": fsync every file touched by a batch (durable within ~flush_interval)
+- "close": fsync once when the call ends
+- "never": leave flushing to the OS
+"""
+
+import os
+import queue
+import re
+import threading
+import time
+
+FSYNC_POLICIES = ("batch", "close", "never")
+
+_CLOSE = object()     # per-call marker: the call ended, close its file
+_STOP = object()      # writer shutdown
+
+
+class TranscriptJournal:
+    """Process-wide transcript writer, one append-only file per CallSid"""
+
+    def __init__(self, directory, fsync="batch", flush_interval=0.2, max_batch=256, suffix=".txt"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"❌ Unknown fsync policy '{fsync}' (choose from {', '.join(FSYNC_POLICIES)})")
+        self.directory = directory
+        self.fsync = fsync
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.suffix = suffix
+
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._files = {}      # call_sid → open file (writer thread only)
+
+        self.records = 0
+        self.batches = 0
+        self.bytes = 0
+        self.fsyncs = 0
+        self.errors = 0
+        self.write_ms_max = 0.0
+
+    def path(self, call_sid):
+        # CallSids are alphanumeric; anything else is stripped so it can't escape the directory
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_-]", "", call_sid) or "unknown") + self.suffix
+
+    def write(self, call_sid, line):
+        """Append one line to the call's transcript; never blocks"""
+        self._ensure_started()
+        self._queue.put((call_sid, line))
+
+    def close_call(self, call_sid):
+        """The call ended: flush and close its file"""
+        self._ensure_started()
+        self._queue.put((call_sid, _CLOSE))
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="transcript-journal", daemon=True)
+                    self._thread.start()
+
+    def _next_batch(self):
+        """Block for one item, then gather whatever arrives within flush_interval"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.max_batch and batch[-1] is not _STOP:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        os.makedirs(self.directory, exist_ok=True)
+        while True:
+            batch = self._next_batch()
+            start = time.perf_counter()
+            touched = set()
+            closed = []
+            stop = False
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                    continue
+                call_sid, line = item
+                if line is _CLOSE:
+                    closed.append(call_sid)
+                    continue
+                try:
+                    f = self._files.get(call_sid)
+                    if f is None:
+                        f = self._files[call_sid] = open(self.path(call_sid), "a", encoding="utf-8")
+                    data = line + "\n"
+                    f.write(data)
+                    touched.add(call_sid)
+                    self.records += 1
+                    self.bytes += len(data.encode("utf-8"))
+                except OSError as e:
+                    self.errors += 1
+                    print(f"❌ Transcript journal error ({call_sid}): {e}")
+
+            for call_sid in touched:
+                self._flush(call_sid, sync=self.fsync == "batch")
+            for call_sid in closed:
+                self._close_file(call_sid)
+            self.batches += 1
+            self.write_ms_max = max(self.write_ms_max, (time.perf_counter() - start) * 1000)
+
+            if stop:
+                for call_sid in list(self._files):
+                    self._close_file(call_sid)
+                return
+
+    def _flush(self, call_sid, sync):
+        f = self._files.get(call_sid)
+        if f is None:
+            return
+        try:
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+                self.fsyncs += 1
+        except OSError as e:
+            self.errors += 1
+            print(f"❌ Transcript journal error ({call_sid}): {e}")
+
+    def _close_file(self, call_sid):
+        self._flush(call_sid, sync=self.fsync != "never")
+        f = self._files.pop(call_sid, None)
+        if f is not None:
+            f.close()
+
+    def close(self):
+        """Write out everything still queued and stop the writer (blocking)"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        return {
+            "records": self.records,
+            "batches": self.batches,
+            "batch_avg": round(self.records / self.batches, 1) if self.batches else 0.0,
+            "bytes": self.bytes,
+            "fsyncs": self.fsyncs,
+            "errors": self.errors,
+            "backlog": self._queue.qsize(),
+            "open_files": len(self._files),
+            "write_ms_max": round(self.write_ms_max, 1),
+        }
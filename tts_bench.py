@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Open-loop Kyutai TTS load generator
+
+The old test_ttfa_* scripts fired every request at once through
+asyncio.gather: that measures one burst, not a server under steady load,
+and each timed TTFA slightly differently with time.time(). This
+benchmark starts sessions on a schedule (Poisson or constant arrivals at
+`--rate` per second) whether or not earlier ones have finished, like
+real calls do, and times every session with perf_counter:
+
+    connect_ms   WebSocket connect + handshake
+    ttfa_ms      first Text sent → first Audio
+    gaps_ms      time between consecutive Audio messages
+    total_ms     first Text sent → Done
+    rtf          total synthesis time / duration of the audio produced
+    late_ms      how far behind schedule the session started (generator lag)
+
+    python tts_bench.py --rate 4 --duration 60
+    python tts_bench.py --rate 8 --schedule constant --corpus texts.txt --json run.json
+    python tts_bench.py --rate 8 --json new.json --baseline run.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+import msgpack
+import websockets
+
+from latency_metrics import percentile
+
+SAMPLE_RATE = 24000   # Kyutai PCM
+SCHEDULES = ("poisson", "constant")
+
+DEFAULT_URL = "ws://127.0.0.1:8080/api/tts_streaming"
+DEFAULT_VOICE = "cml-tts/fr/2465_1943_000152-0002.wav"
+
+# Short, medium and long replies (a voicebot mostly says the first two)
+DEFAULT_CORPUS = [
+    "Bonjour",
+    "D'accord, je regarde.",
+    "Bonjour, comment allez-vous aujourd'hui ?",
+    "Le serveur TTS fonctionne très bien avec une latence rapide.",
+    "Nous sommes ouverts du lundi au vendredi, de neuf heures à dix-huit heures.",
+    "Je suis un assistant virtuel et je peux répondre à vos questions en français.",
+    "Bonjour à vous. Je suis heureux de vous présenter ce serveur de synthèse vocale ultra-rapide "
+    "qui utilise l'intelligence artificielle pour convertir du texte en parole.",
+    "Voici un texte plus long pour tester comment la latence change en fonction de la longueur du texte. "
+    "Plus le texte est long, plus il faut de temps pour générer la parole.",
+]
+
+
+def arrival_times(rate, duration, schedule="poisson", seed=None):
+    """Start offsets (s) of every session within `duration` seconds"""
+    if schedule not in SCHEDULES:
+        raise ValueError(f"❌ Unknown schedule '{schedule}' (choose from {', '.join(SCHEDULES)})")
+    rng = random.Random(seed)
+    times, t = [], 0.0
+    while True:
+        t += rng.expovariate(rate) if schedule == "poisson" else 1.0 / rate
+        if t >= duration:
+            return times
+        times.append(t)
+
+
+async def send_text(ws, text, mode):
+    """Like the call server (word by word) or the whole text at once, then Eos"""
+    if mode == "words":
+        for word in text.split():
+            await ws.send(msgpack.packb({"type": "Text", "text": word + " "}))
+    else:
+        await ws.send(msgpack.packb({"type": "Text", "text": text}))
+    await ws.send(msgpack.packb({"type": "Eos"}))
+
+
+async def run_session(uri, api_key, text, send_mode="words", timeout=15.0):
+    """One synthesis on a fresh connection; returns its sample (error set if it failed)"""
+    sample = {"chars": len(text), "connect_ms": None, "ttfa_ms": None, "gaps_ms": [], "total_ms": None,
+              "audio_s": 0.0, "chunks": 0, "rtf": None, "error": None}
+    start = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout):
+            async with websockets.connect(uri, additional_headers={"kyutai-api-key": api_key},
+                                          ping_interval=None, close_timeout=1) as ws:
+                sent = time.perf_counter()
+                sample["connect_ms"] = (sent - start) * 1000
+                sender = asyncio.create_task(send_text(ws, text, send_mode))
+                last = None
+                try:
+                    async for message in ws:
+                        msg = msgpack.unpackb(message)
+                        now = time.perf_counter()
+                        if msg.get("type") == "Audio":
+                            if last is None:
+                                sample["ttfa_ms"] = (now - sent) * 1000
+                            else:
+                                sample["gaps_ms"].append((now - last) * 1000)
+                            last = now
+                            sample["chunks"] += 1
+                            sample["audio_s"] += len(msg.get("pcm") or ()) / SAMPLE_RATE
+                        elif msg.get("type") == "Done":
+                            sample["total_ms"] = (now - sent) * 1000
+                            break
+                finally:
+                    sender.cancel()
+        if sample["total_ms"] is None:
+            sample["error"] = "closed before Done"
+        elif sample["audio_s"]:
+            sample["rtf"] = sample["total_ms"] / 1000 / sample["audio_s"]
+    except TimeoutError:
+        sample["error"] = f"timeout after {timeout}s"
+    except Exception as e:
+        sample["error"] = str(e) or type(e).__name__
+    for key in ("connect_ms", "ttfa_ms", "total_ms", "rtf"):
+        if sample[key] is not None:
+            sample[key] = round(sample[key], 3)
+    sample["gaps_ms"] = [round(gap, 3) for gap in sample["gaps_ms"]]
+    sample["audio_s"] = round(sample["audio_s"], 4)
+    return sample
+
+
+async def run_benchmark(uri, api_key, corpus, rate, duration, schedule="poisson", seed=None,
+                        send_mode="words", timeout=15.0):
+    """Open loop: every session starts on schedule, however many are still running"""
+    schedule_s = arrival_times(rate, duration, schedule, seed)
+    rng = random.Random(seed)
+    samples = []
+    in_flight = in_flight_max = 0
+
+    async def session(index, offset, late_ms, text):
+        nonlocal in_flight, in_flight_max
+        in_flight += 1
+        in_flight_max = max(in_flight_max, in_flight)
+        try:
+            sample = await run_session(uri, api_key, text, send_mode, timeout)
+        finally:
+            in_flight -= 1
+        sample["index"] = index
+        sample["scheduled_s"] = round(offset, 4)
+        sample["late_ms"] = late_ms
+        samples.append(sample)
+
+    tasks = []
+    start = time.perf_counter()
+    for index, offset in enumerate(schedule_s):
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        late_ms = max(0.0, (time.perf_counter() - start - offset) * 1000)
+        tasks.append(asyncio.create_task(session(index, offset, round(late_ms, 3), rng.choice(corpus))))
+    arrivals_s = max(duration, time.perf_counter() - start)
+    await asyncio.gather(*tasks)
+
+    samples.sort(key=lambda sample: sample["index"])
+    return {
+        "config": {"uri": uri, "rate": rate, "duration": duration, "schedule": schedule, "seed": seed,
+                   "send": send_mode, "texts": len(corpus)},
+        "summary": summarize(samples, arrivals_s, in_flight_max),
+        "samples": samples,
+    }
+
+
+def distribution(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3),
+        **{f"p{q}": round(percentile(values, q), 3) for q in (50, 95, 99)},
+        "max": round(values[-1], 3),
+    }
+
+
+def summarize(samples, arrivals_s, in_flight_max=0):
+    ok = [sample for sample in samples if sample["error"] is None]
+    return {
+        "sessions": len(samples),
+        "errors": len(samples) - len(ok),
+        "achieved_rate": round(len(samples) / arrivals_s, 3) if arrivals_s else 0.0,
+        "in_flight_max": in_flight_max,
+        "connect_ms": distribution([s["connect_ms"] for s in ok]),
+        "ttfa_ms": distribution([s["ttfa_ms"] for s in ok if s["ttfa_ms"] is not None]),
+        "gap_ms": distribution([gap for s in ok for gap in s["gaps_ms"]]),
+        "total_ms": distribution([s["total_ms"] for s in ok]),
+        "rtf": distribution([s["rtf"] for s in ok if s["rtf"] is not None]),
+        "late_ms": distribution([s["late_ms"] for s in samples]),
+    }
+
+
+METRICS = ("connect_ms", "ttfa_ms", "gap_ms", "total_ms", "rtf", "late_ms")
+
+
+def report(summary, baseline=None):
+    lines = [f"📊 {summary['sessions']} session(s), {summary['errors']} error(s), "
+             f"{summary['achieved_rate']}/s achieved, {summary['in_flight_max']} in flight at most",
+             f"  {'metric':<12}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"]
+    for metric in METRICS:
+        row = summary.get(metric)
+        if row is None:
+            continue
+        lines.append(f"  {metric:<12}{row['count']:>8}" + "".join(f"{row[key]:>10.2f}" for key in ("p50", "p95", "p99", "max")))
+        base = (baseline or {}).get(metric)
+        if base is not None:
+            lines.append(f"  {'  vs base':<12}{'':>8}" + "".join(
+                f"{row[key] - base[key]:>+10.2f}" for key in ("p50", "p95", "p99", "max")))
+    return "\n".join(lines)
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop Kyutai TTS benchmark")
+    parser.add_argument("--url", default=os.getenv("KYUTAI_TTS_URL", DEFAULT_URL))
+    parser.add_argument("--voice", default=DEFAULT_VOICE)
+    parser.add_argument("--format", default="PcmMessagePack")
+    parser.add_argument("--api-key", default=os.getenv("KYUTAI_API_KEY", "public_token"))
+    parser.add_argument("--rate", type=float, default=2.0, help="sessions started per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of arrivals")
+    parser.add_argument("--schedule", choices=SCHEDULES, default="poisson")
+    parser.add_argument("--seed", type=int, default=None, help="same seed → same arrivals and texts")
+    parser.add_argument("--corpus", help="text file, one text per line (default: built-in French replies)")
+    parser.add_argument("--send", choices=("words", "text"), default="words",
+                        help="word by word like the call server, or the whole text in one message")
+    parser.add_argument("--timeout", type=float, default=15.0, help="per session")
+    parser.add_argument("--json", metavar="PATH", help="write config, summary and raw samples")
+    parser.add_argument("--baseline", metavar="PATH", help="earlier --json output to compare against")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus) if args.corpus else DEFAULT_CORPUS
+    uri = f"{args.url}?voice={args.voice}&format={args.format}"
+    print(f"🚀 {args.schedule} arrivals at {args.rate}/s for {args.duration:.0f}s → {args.url}")
+    result = asyncio.run(run_benchmark(uri, args.api_key, corpus, args.rate, args.duration,
+                                       args.schedule, args.seed, args.send, args.timeout))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["summary"]
+    print(report(result["summary"], baseline))
+    errors = {sample["error"] for sample in result["samples"] if sample["error"]}
+    for error in sorted(errors):
+        print(f"❌ {error}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=1, ensure_ascii=False)
+        print(f"💾 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
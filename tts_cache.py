@@ -0,0 +1,168 @@
+"""
+Cache of synthesized replies as ready-to-send 8kHz μ-law
+
+Greetings, "je n'ai pas compris" and confirmations come back again and
+again; a cache hit plays them with no Kyutai request, no resampling and
+no μ-law conversion. Entries are keyed by (voice, format, normalized text)
+and kept in two tiers:
+
+- memory: LRU bounded in bytes
+- disk:   one file per entry, mmap'd on a hit (page cache, not heap),
+          bounded in bytes, least recently used files removed first
+"""
+
+import asyncio
+import hashlib
+import mmap
+import os
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    """Same words → same key: Unicode NFC, single spaces, case-folded"""
+    return unicodedata.normalize("NFC", " ".join(text.split())).casefold()
+
+
+class TTSCache:
+    """Two-tier (memory LRU + mmap'd files) store of μ-law replies"""
+
+    def __init__(self, directory, max_memory_bytes=32 << 20, max_disk_bytes=512 << 20):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()    # key → bytes or mmap, least recently used first
+        self._disk = OrderedDict()      # key → size in bytes, least recently used first
+        self._writing = set()           # keys being written: a concurrent put of the same reply skips
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+
+        # Entries left by earlier runs, oldest first
+        os.makedirs(directory, exist_ok=True)
+        entries = [e for e in os.scandir(directory) if e.name.endswith(".ulaw")]
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+            size = entry.stat().st_size
+            if size:
+                self._disk[entry.name[:-len(".ulaw")]] = size
+                self.disk_bytes += size
+
+    def key(self, voice, fmt, text):
+        return hashlib.sha256(f"{voice}\n{fmt}\n{normalize_text(text)}".encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".ulaw")
+
+    async def get(self, voice, fmt, text):
+        """μ-law audio for this reply, or None on a miss"""
+        key = self.key(voice, fmt, text)
+
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self.hits += 1
+            self.memory_hits += 1
+            return audio
+
+        if key in self._disk:
+            try:
+                audio = await asyncio.to_thread(self._map, key)
+            except (OSError, ValueError):
+                # Removed or truncated behind our back
+                self.disk_bytes -= self._disk.pop(key, 0)
+            else:
+                self._disk.move_to_end(key)
+                self._remember(key, audio)
+                self.hits += 1
+                self.disk_hits += 1
+                return audio
+
+        self.misses += 1
+        return None
+
+    async def put(self, voice, fmt, text, audio):
+        """Store a complete reply (written off the event loop)"""
+        key = self.key(voice, fmt, text)
+        if not audio or key in self._disk or key in self._writing:
+            return
+        audio = bytes(audio)
+        # Reserved before the await: two calls finishing the same greeting must not both count it
+        self._writing.add(key)
+        try:
+            await asyncio.to_thread(self._write, key, audio)
+        finally:
+            self._writing.discard(key)
+        self._disk[key] = len(audio)
+        self.disk_bytes += len(audio)
+        self.stored += 1
+        self._remember(key, audio)
+
+        expired = []
+        while self.disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            old_key, size = self._disk.popitem(last=False)
+            self.disk_bytes -= size
+            self.disk_evictions += 1
+            self._forget(old_key)
+            expired.append(old_key)
+        if expired:
+            await asyncio.to_thread(self._unlink, expired)
+
+    def _remember(self, key, audio):
+        if len(audio) > self.max_memory_bytes:
+            return
+        self._memory[key] = audio
+        self.memory_bytes += len(audio)
+        while self.memory_bytes > self.max_memory_bytes:
+            self._forget(next(iter(self._memory)))
+            self.memory_evictions += 1
+
+    def _forget(self, key):
+        # Never close a mapping here: a reply may still be playing from it (GC unmaps it)
+        audio = self._memory.pop(key, None)
+        if audio is not None:
+            self.memory_bytes -= len(audio)
+
+    def _map(self, key):
+        with open(self._path(key), "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _write(self, key, audio):
+        # Write + rename: a crash or a concurrent reader never sees a partial file
+        tmp = self._path(key) + f".{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(audio)
+        os.replace(tmp, self._path(key))
+
+    def _unlink(self, keys):
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stored": self.stored,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self.memory_bytes,
+            "memory_evictions": self.memory_evictions,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self.disk_bytes,
+            "disk_evictions": self.disk_evictions,
+        }
@@ -0,0 +1,119 @@
+"""
+Process-wide admission control for Kyutai TTS sessions
+
+Kyutai batches concurrent sessions on the GPU; past its batch size every
+session slows down (TTFA and audio quality degrade for all calls at
+once). The scheduler caps in-flight sessions at `max_sessions` and queues
+the rest by priority, so extra load turns into predictable queueing:
+
+    LIVE_FIRST     first sentence of a live turn (the caller is waiting)
+    LIVE_NEXT      continuation sentences (the previous one is playing)
+    OFFLINE        pre-render jobs (filler clips, cache warm-up)
+
+FIFO within a priority. A freed slot goes straight to the best waiter.
+
+A slot covers a whole Kyutai session. With streamed GPT replies the
+session opens on the segment's first word and stays in the GPU batch
+while later words trickle in, so GPT stalls inside a segment count
+against the cap; time before the first word does not.
+
+The counter lives in one process: with several workers (WORKERS=N) each
+has its own cap and the GPU sees up to N × max_sessions sessions, so
+KYUTAI_MAX_SESSIONS_PER_WORKER is the backends' total batch size / N.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+
+LIVE_FIRST = 0
+LIVE_NEXT = 1
+OFFLINE = 2
+PRIORITY_NAMES = {LIVE_FIRST: "live_first", LIVE_NEXT: "live_next", OFFLINE: "offline"}
+
+
+class TTSScheduler:
+    """Caps concurrent Kyutai sessions; waiters are admitted by (priority, arrival)"""
+
+    def __init__(self, max_sessions=8):
+        self.max_sessions = max_sessions   # 0 = no limit
+        self.in_flight = 0
+        self._waiters = []                 # heap of (priority, seq, future)
+        self._seq = itertools.count()
+
+        self.in_flight_max = 0
+        self.queued_max = 0
+        self.admitted = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.queued = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.wait_ms_total = {name: 0.0 for name in PRIORITY_NAMES.values()}
+        self.wait_ms_max = {name: 0.0 for name in PRIORITY_NAMES.values()}
+
+    def _has_room(self):
+        return not self.max_sessions or self.in_flight < self.max_sessions
+
+    def _admit(self):
+        self.in_flight += 1
+        self.in_flight_max = max(self.in_flight_max, self.in_flight)
+
+    def _release(self):
+        self.in_flight -= 1
+        # Hand the slot to the best live waiter (cancelled ones are skipped)
+        while self._waiters and self._has_room():
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._admit()
+                future.set_result(None)
+
+    async def acquire(self, priority=LIVE_FIRST):
+        name = PRIORITY_NAMES[priority]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        if self._has_room() and not self._waiters:
+            self._admit()
+        else:
+            future = loop.create_future()
+            heapq.heappush(self._waiters, (priority, next(self._seq), future))
+            self.queued[name] += 1
+            self.queued_max = max(self.queued_max, len(self._waiters))
+            try:
+                await future
+            except asyncio.CancelledError:
+                # Admitted just before being cancelled: give the slot back
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+
+        wait_ms = (loop.time() - start) * 1000
+        self.admitted[name] += 1
+        self.wait_ms_total[name] += wait_ms
+        self.wait_ms_max[name] = max(self.wait_ms_max[name], wait_ms)
+        return wait_ms
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority=LIVE_FIRST):
+        """Hold one Kyutai session slot for the body of the `async with`"""
+        wait_ms = await self.acquire(priority)
+        if wait_ms >= 1:
+            print(f"🚦 Kyutai slot after {wait_ms:.0f}ms in queue ({PRIORITY_NAMES[priority]})")
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self):
+        return {
+            "max_sessions": self.max_sessions,
+            "in_flight": self.in_flight,
+            "in_flight_max": self.in_flight_max,
+            "waiting": sum(1 for _, _, future in self._waiters if not future.done()),
+            "queued_max": self.queued_max,
+            "admitted": dict(self.admitted),
+            "queued": dict(self.queued),
+            "queue_wait_ms_avg": {
+                name: round(self.wait_ms_total[name] / count, 1) if count else 0.0
+                for name, count in self.admitted.items()
+            },
+            "queue_wait_ms_max": {name: round(ms, 1) for name, ms in self.wait_ms_max.items()},
+        }
@@ -0,0 +1,147 @@
+"""
+Per-call turn manager
+
+Final transcripts are submitted without blocking, so the Deepgram read
+loop never waits on GPT + TTS. Turns run one at a time as separate tasks
+under an explicit policy:
+
+- "queue":     every final becomes its own turn, answered in order
+- "coalesce":  finals that arrive while a turn runs are merged into one turn
+- "supersede": a new final cancels the running turn and drops queued ones
+
+Whatever the policy, a turn cancelled by `hold_current` (the caller kept
+talking before the reply started) is merged into the next final.
+"""
+
+import asyncio
+from collections import deque
+
+TURN_POLICIES = ("queue", "coalesce", "supersede")
+
+
+class TurnManager:
+    """Runs `respond(transcript)` turns for one call, one at a time"""
+
+    def __init__(self, respond, policy="coalesce"):
+        if policy not in TURN_POLICIES:
+            raise ValueError(f"❌ Unknown turn policy '{policy}' (choose from {', '.join(TURN_POLICIES)})")
+        self.respond = respond
+        self.policy = policy
+
+        self._pending = deque()     # (transcript, submitted_at)
+        self._held = []             # transcripts of turns cancelled before they spoke
+        self._current_transcript = None
+        self._wakeup = asyncio.Event()
+        self._worker = None
+        self.current = None         # task of the turn being answered
+        self.current_wait_ms = 0.0  # how long its final waited to start (TurnTimer queued_ms)
+
+        self.submitted = 0
+        self.turns = 0
+        self.coalesced = 0
+        self.superseded = 0
+        self.held = 0
+        self.max_queue_depth = 0
+        self.wait_ms = []           # submit → turn start
+
+    @property
+    def queue_depth(self):
+        return len(self._pending)
+
+    @property
+    def busy(self):
+        return self.current is not None and not self.current.done()
+
+    def submit(self, transcript):
+        """Queue a final transcript; never blocks
+
+        Returns the running turn's task when this final cancelled it (supersede), else None
+        """
+        cancelled = None
+        self.submitted += 1
+        if self._held:
+            # The caller was still talking: answer the whole utterance
+            self.coalesced += len(self._held)
+            transcript = " ".join(self._held + [transcript])
+            self._held.clear()
+        if self.policy == "supersede":
+            self.superseded += len(self._pending)
+            self._pending.clear()
+            if self.busy and not self.current.cancelling():
+                self.superseded += 1
+                self.current.cancel()
+                cancelled = self.current
+
+        self._pending.append((transcript, asyncio.get_running_loop().time()))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._pending))
+
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        self._wakeup.set()
+        return cancelled
+
+    def _next_turn(self):
+        if self.policy == "coalesce":
+            transcripts = [transcript for transcript, _ in self._pending]
+            submitted_at = self._pending[0][1]
+            self.coalesced += len(transcripts) - 1
+            self._pending.clear()
+            return " ".join(transcripts), submitted_at
+        return self._pending.popleft()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            transcript, submitted_at = self._next_turn()
+            wait_ms = (loop.time() - submitted_at) * 1000
+            self.wait_ms.append(wait_ms)
+            if wait_ms >= 1:
+                print(f"🔁 Turn waited {wait_ms:.0f}ms ({len(self._pending)} still queued)")
+
+            self._current_transcript = transcript
+            self.current_wait_ms = wait_ms
+            self.current = asyncio.create_task(self.respond(transcript))
+            await asyncio.wait([self.current])
+            self.turns += 1
+
+    async def hold_current(self):
+        """Cancel the running turn before it spoke; its transcript is merged into the next final
+
+        Returns True if a turn was cancelled
+        """
+        if not self.busy or self.current.cancelling():
+            return False
+        self._held.append(self._current_transcript)
+        self.held += 1
+        self.current.cancel()
+        await asyncio.wait([self.current])
+        return True
+
+    async def close(self):
+        """Cancel the running turn and anything still queued"""
+        self._pending.clear()
+        self._held.clear()
+        tasks = [task for task in (self._worker, self.current) if task is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def stats(self):
+        return {
+            "policy": self.policy,
+            "submitted": self.submitted,
+            "turns": self.turns,
+            "coalesced": self.coalesced,
+            "superseded": self.superseded,
+            "held": self.held,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "wait_ms_avg": round(sum(self.wait_ms) / len(self.wait_ms), 1) if self.wait_ms else 0.0,
+            "wait_ms_max": round(max(self.wait_ms), 1) if self.wait_ms else 0.0,
+        }
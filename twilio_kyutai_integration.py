@@ -1,15 +1,34 @@
 import asyncio
+import contextlib
 import websockets
 import base64
 import json
 import aiohttp
 import datetime
+import functools
 import struct
 import msgpack
 import os
-from openai import OpenAI
-import scipy.signal
+import signal
+from urllib.parse import urlsplit, parse_qs
 import numpy as np
+from kyutai_router import KyutaiRouter
+from deepgram_pool import DeepgramStreamPool
+from llm_client import LLMClient
+from playout import PlayoutClock
+from barge_in import BargeIn
+from turn_manager import TurnManager
+from transcript_journal import TranscriptJournal
+from tts_cache import TTSCache
+from filler_bank import FillerBank
+from response_cache import ResponseCache
+from speculation import Speculator, current_speculation
+from sentence_pipeline import SentencePipeline
+from worker_supervisor import CallGauge, WorkerSupervisor
+from audio_offload import ConversionPool
+from tts_scheduler import LIVE_FIRST, LIVE_NEXT, OFFLINE, TTSScheduler
+from latency_metrics import LatencyMetrics, TurnTimer
+from call_trace import CallTracer, current_trace, trace_event
 
 # ✅ Configuration from environment variables
 DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY", "")
@@ -18,69 +37,208 @@ KYUTAI_TTS_URI = os.getenv("KYUTAI_TTS_URI", "ws://127.0.0.1:8080/api/tts_stream
 KYUTAI_API_KEY = os.getenv("KYUTAI_API_KEY", "public_token")
 TWILIO_SERVER_HOST = os.getenv("TWILIO_SERVER_HOST", "0.0.0.0")
 TWILIO_SERVER_PORT = int(os.getenv("TWILIO_SERVER_PORT", "8765"))
-TRANSCRIPT_FILE = os.getenv("TRANSCRIPT_FILE", "transcript.txt")
+TRANSCRIPT_DIR = os.getenv("TRANSCRIPT_DIR", "transcripts")
+TRANSCRIPT_FSYNC = os.getenv("TRANSCRIPT_FSYNC", "batch")
+STREAM_PLAYBACK = os.getenv("STREAM_PLAYBACK", "true").lower() == "true"
+GPT_STREAMING = os.getenv("GPT_STREAMING", "true").lower() == "true"
+KYUTAI_POOL_SIZE = int(os.getenv("KYUTAI_POOL_SIZE", "2"))
+KYUTAI_POOL_MAX_IDLE = float(os.getenv("KYUTAI_POOL_MAX_IDLE", "30"))
+KYUTAI_MAX_SESSIONS_PER_WORKER = int(os.getenv("KYUTAI_MAX_SESSIONS_PER_WORKER", "8"))
+KYUTAI_PROBE_INTERVAL = float(os.getenv("KYUTAI_PROBE_INTERVAL", "10"))
+KYUTAI_EJECT_RATIO = float(os.getenv("KYUTAI_EJECT_RATIO", "2.0"))
+RESAMPLER_QUALITY = os.getenv("RESAMPLER_QUALITY", "high_quality")
+PLAYOUT_LEAD_MS = int(os.getenv("PLAYOUT_LEAD_MS", "100"))
+BARGE_IN = os.getenv("BARGE_IN", "true").lower() == "true"
+BARGE_IN_MIN_WORDS = int(os.getenv("BARGE_IN_MIN_WORDS", "1"))
+TURN_POLICY = os.getenv("TURN_POLICY", "coalesce")
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+DEEPGRAM_ENDPOINT = os.getenv("DEEPGRAM_ENDPOINT", "wss://api.deepgram.com/v1/listen")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1"   # empty in .env = default
+DEEPGRAM_POOL_SIZE = int(os.getenv("DEEPGRAM_POOL_SIZE", "2"))
+TTS_CACHE = os.getenv("TTS_CACHE", "true").lower() == "true"
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "tts_cache")
+TTS_CACHE_MEMORY_MB = int(os.getenv("TTS_CACHE_MEMORY_MB", "32"))
+TTS_CACHE_DISK_MB = int(os.getenv("TTS_CACHE_DISK_MB", "512"))
+FILLERS = os.getenv("FILLERS", "true").lower() == "true"
+FILLER_PHRASES = [p.strip() for p in os.getenv("FILLER_PHRASES", "D'accord…|Un instant…|Hmm, voyons…|Très bien…").split("|") if p.strip()]
+FILLER_DELAY_MS = int(os.getenv("FILLER_DELAY_MS", "150"))
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "true").lower() == "true"
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))
+RESPONSE_CACHE_FUZZY = float(os.getenv("RESPONSE_CACHE_FUZZY", "1.0"))
+RESPONSE_CACHE_FAQ = os.getenv("RESPONSE_CACHE_FAQ", "")
+RESPONSE_CACHE_GPT = os.getenv("RESPONSE_CACHE_GPT", "false").lower() == "true"
+SPECULATIVE_GPT = os.getenv("SPECULATIVE_GPT", "false").lower() == "true"
+SPECULATION_STABLE_MS = int(os.getenv("SPECULATION_STABLE_MS", "300"))
+SPECULATION_TOLERANCE = float(os.getenv("SPECULATION_TOLERANCE", "0.9"))
+SENTENCE_LOOKAHEAD = int(os.getenv("SENTENCE_LOOKAHEAD", "1"))
+KYUTAI_SEGMENT_TIMEOUT = float(os.getenv("KYUTAI_SEGMENT_TIMEOUT", "5.0"))
+WORKERS = int(os.getenv("WORKERS", "1"))
+WORKER_REPORT_INTERVAL = float(os.getenv("WORKER_REPORT_INTERVAL", "30"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+CALL_TRACES = os.getenv("CALL_TRACES", "true").lower() == "true"
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+CONVERSION_POOL = os.getenv("CONVERSION_POOL", "thread")
+CONVERSION_WORKERS = int(os.getenv("CONVERSION_WORKERS", "2"))
+CONVERSION_MAX_PENDING = int(os.getenv("CONVERSION_MAX_PENDING", "64"))
+
+DEEPGRAM_URL = (
+    f"{DEEPGRAM_ENDPOINT}?"
+    "model=nova-2&encoding=mulaw&sample_rate=8000&channels=1&language=fr"
+    "&smart_format=true&interim_results=true&endpointing=500"
+)
+
+# ✅ Split the TTS URI into endpoint + (voice, format), the connection pool key
+_tts_uri = urlsplit(KYUTAI_TTS_URI)
+_tts_query = parse_qs(_tts_uri.query)
+KYUTAI_TTS_URL = f"{_tts_uri.scheme}://{_tts_uri.netloc}{_tts_uri.path}"
+KYUTAI_VOICE = _tts_query.get("voice", ["cml-tts/fr/2465_1943_000152-0002.wav"])[0]
+KYUTAI_FORMAT = _tts_query.get("format", ["PcmMessagePack"])[0]
+# Several moshi-servers (comma-separated endpoints, same voice/format): load-balanced with health checks
+KYUTAI_TTS_URLS = [url.strip() for url in os.getenv("KYUTAI_TTS_URLS", KYUTAI_TTS_URL).split(",") if url.strip()]
 
 # ✅ Validate required API keys
 if not DEEPGRAM_API_KEY or not OPENAI_API_KEY:
     raise ValueError("❌ Missing required environment variables: DEEPGRAM_API_KEY and OPENAI_API_KEY")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-# ✅ Convert float PCM to int16
-def float_to_int16(float_samples):
-    """Convert float [-1.0, 1.0] to int16 [-32768, 32767]"""
-    return np.array([int(x * 32767) for x in float_samples], dtype=np.int16)
-
-# ✅ Convert int16 PCM to µ-law (8-bit)
-def pcm_to_ulaw(pcm_data):
-    """Convert 16-bit PCM to 8-bit µ-law"""
-    # Use librosa/scipy compatible approach
-    mu = 255.0
-    safe_abs_value = np.abs(pcm_data)
-    magnitude = np.log(1.0 + mu * safe_abs_value / 32768.0) / np.log(1.0 + mu)
-    signal = np.sign(pcm_data) * magnitude * 128.0
-    return np.uint8(signal + 128.0)
-
-# ✅ Resample 24kHz → 8kHz
-def resample_24k_to_8k(pcm_int16):
-    """Resample PCM from 24kHz to 8kHz"""
-    # Simple approach: every 3rd sample (24000/8000 = 3)
-    # Better approach: use scipy.signal.resample
-    num_samples = int(len(pcm_int16) / 3)
-    resampled = scipy.signal.resample(pcm_int16, num_samples)
-    return np.int16(resampled)
+llm = LLMClient(OPENAI_API_KEY, max_connections=OPENAI_MAX_CONNECTIONS, base_url=OPENAI_BASE_URL)
+journal = TranscriptJournal(TRANSCRIPT_DIR, fsync=TRANSCRIPT_FSYNC)
+tracer = CallTracer(TRACE_DIR) if CALL_TRACES else None
+tts_cache = TTSCache(TTS_CACHE_DIR, TTS_CACHE_MEMORY_MB << 20, TTS_CACHE_DISK_MB << 20) if TTS_CACHE else None
+responses = None
+if RESPONSE_CACHE:
+    responses = ResponseCache(ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_SIZE, fuzzy_threshold=RESPONSE_CACHE_FUZZY)
+    if RESPONSE_CACHE_FAQ:
+        print(f"📚 Pinned {responses.load_faq(RESPONSE_CACHE_FAQ)} FAQ answer(s)")
+fillers = FillerBank(FILLER_PHRASES, delay_ms=FILLER_DELAY_MS) if FILLERS else None
+dg_pool = DeepgramStreamPool(DEEPGRAM_URL, DEEPGRAM_API_KEY, size=DEEPGRAM_POOL_SIZE)
+tts_pool = KyutaiRouter(
+    KYUTAI_TTS_URLS, KYUTAI_API_KEY,
+    size=KYUTAI_POOL_SIZE, max_idle=KYUTAI_POOL_MAX_IDLE,
+    probe_interval=KYUTAI_PROBE_INTERVAL, eject_ratio=KYUTAI_EJECT_RATIO, ping_interval=None
+)
+tts_scheduler = TTSScheduler(max_sessions=KYUTAI_MAX_SESSIONS_PER_WORKER)
+metrics = LatencyMetrics()
+conversions = ConversionPool(CONVERSION_POOL, workers=CONVERSION_WORKERS, max_pending=CONVERSION_MAX_PENDING, observe=metrics.observe)
+active_calls = CallGauge()   # replaced by the supervisor's shared counter in worker processes
+metrics.gauge("active_calls", "Calls in progress on this process", lambda: active_calls.value)
+metrics.gauge("kyutai_sessions_in_flight", "Kyutai sessions synthesizing", lambda: tts_scheduler.in_flight)
+metrics.gauge("kyutai_sessions_waiting", "Kyutai sessions queued for a slot", lambda: tts_scheduler.stats()["waiting"])
+if fillers is not None:
+    metrics.gauge("fillers_played", "Turns where a filler clip started", lambda: fillers.played)
+    metrics.gauge("fillers_skipped", "Turns whose reply was ready within the filler delay", lambda: fillers.skipped)
+    metrics.gauge("fillers_faded", "Fillers faded out for the reply", lambda: fillers.faded)
+    metrics.gauge("fillers_cut", "Fillers stopped mid-clip when the turn ended", lambda: fillers.cut)
+    metrics.gauge("fillers_first_audio_ms_avg", "Turn start → first audio on the call (filler or reply)",
+                  lambda: fillers.stats()["first_audio_ms_avg"])
+if tts_cache is not None:
+    metrics.gauge("tts_cache_hits", "TTS cache hits (memory or disk)", lambda: tts_cache.hits)
+    metrics.gauge("tts_cache_misses", "TTS cache misses", lambda: tts_cache.misses)
+    metrics.gauge("tts_cache_evictions", "TTS cache entries evicted (memory and disk)",
+                  lambda: tts_cache.memory_evictions + tts_cache.disk_evictions)
 
 # ✅ WebSocket Handler
 async def handler(websocket):
     print("✅ Twilio connected!")
+    trace = tracer.start() if tracer is not None else None
 
-    async with aiohttp.ClientSession() as session:
-        deepgram_url = (
-            "wss://api.deepgram.com/v1/listen?"
-            "model=nova-2&encoding=mulaw&sample_rate=8000&channels=1&language=fr"
-            "&smart_format=true&interim_results=true&endpointing=500"
-        )
-        dg_ws = await session.ws_connect(deepgram_url, headers={"Authorization": f"Token {DEEPGRAM_API_KEY}"})
+    async with dg_pool.stream() as dg_ws:
         print("🧬 Connected to Deepgram")
 
-        # Reset transcript
-        open(TRANSCRIPT_FILE, "w").close()
-
         stream_sid = None
+        call_sid = None     # transcript journal key (from Twilio's start event)
+        playout = PlayoutClock(lead_ms=PLAYOUT_LEAD_MS)
+        barge_in = BargeIn(min_words=BARGE_IN_MIN_WORDS)
+        media_start = None  # loop time of the first caller audio (Deepgram offsets are relative to it)
+        reply_turn = None   # TurnTimer of the latest turn (its "frame" mark: the reply started playing)
+
+        def reply_playing():
+            return reply_turn is not None and "frame" in reply_turn.marks
 
         async def twilio_to_deepgram():
-            nonlocal stream_sid
+            nonlocal stream_sid, call_sid, media_start
             try:
                 async for message in websocket:
                     data = json.loads(message)
                     if data.get("event") == "media":
                         audio = base64.b64decode(data["media"]["payload"])
+                        if media_start is None:
+                            media_start = asyncio.get_running_loop().time()
                         await dg_ws.send_bytes(audio)
                     elif data.get("event") == "start":
                         stream_sid = data["start"]["streamSid"]
+                        call_sid = data["start"].get("callSid") or stream_sid
+                        if trace is not None:
+                            trace.twilio_start(call_sid, stream_sid)
                         print(f"📡 Stream SID: {stream_sid}")
             except websockets.exceptions.ConnectionClosedError as e:
                 print("🔌 Twilio closed:", e)
+            finally:
+                # No more caller audio: Deepgram sends its last results and closes
+                await dg_pool.finish(dg_ws)
+
+        # GPT started early on stable interims (kept only if the final matches)
+        speculator = None
+        if SPECULATIVE_GPT:
+            speculator = Speculator(functools.partial(ask_gpt_words, store=False), stable_ms=SPECULATION_STABLE_MS, tolerance=SPECULATION_TOLERANCE)
+
+        # GPT → Kyutai → Twilio for one turn (runs as its own task so it can be cancelled)
+        async def respond(transcript):
+            nonlocal reply_turn
+            if trace is not None:
+                trace.begin_turn(transcript)
+            # Filler ("D'accord…") while GPT + Kyutai work; the reply stops it right before its first frame
+            filler = None
+            if fillers is not None:
+                filler = fillers.start(lambda frame: send_to_twilio(websocket, stream_sid, frame), playout)
+            speculative = None
+            turn = reply_turn = TurnTimer(metrics, queued_ms=turns.current_wait_ms)   # timed from the final
+            complete = False
+            try:
+                # Recurring question: cached answer, no GPT request (and usually a TTS cache hit)
+                answer = responses.lookup(transcript) if responses is not None else None
+                if speculator is not None:
+                    if answer is None:
+                        speculative = speculator.take(transcript)
+                        if speculative is not None:
+                            trace_event("gpt_adopted", spec=speculative.number)
+                    else:
+                        speculator.close()
+
+                if answer is not None:
+                    print(f"📚 Cached answer: {answer}")
+                    await speak_with_kyutai(answer, websocket, stream_sid, playout, filler, turn)
+                elif speculative is not None:
+                    # Words already generated play right away, the rest follows live
+                    if GPT_STREAMING:
+                        await speak_with_kyutai(turn.first_word(speculative.replay()), websocket, stream_sid, playout, filler, turn)
+                    else:
+                        gpt_reply = await speculative.text()
+                        turn.mark("gpt")
+                        await speak_with_kyutai(gpt_reply, websocket, stream_sid, playout, filler, turn)
+                elif GPT_STREAMING:
+                    await speak_with_kyutai(turn.first_word(ask_gpt_words(transcript)), websocket, stream_sid, playout, filler, turn)
+                else:
+                    gpt_reply = await ask_gpt(transcript)
+                    turn.mark("gpt")
+                    print(f"🤖 GPT: {gpt_reply}")
+                    await speak_with_kyutai(gpt_reply, websocket, stream_sid, playout, filler, turn)
+                complete = True
+                # Adopted speculation played in full: cache its answer under the final transcript
+                if caching_gpt_answers() and speculative is not None and speculative.finished:
+                    reply = " ".join(speculative.words)
+                    if "Erreur GPT" not in reply:
+                        responses.store(transcript, reply)
+            finally:
+                turn.finish(complete)
+                if filler is not None:
+                    await filler.stop()
+                if speculative is not None:
+                    speculative.cancel()
+                if trace is not None:
+                    trace.end_turn(complete)
+
+        turns = TurnManager(respond, policy=TURN_POLICY)
 
         async def deepgram_to_actions():
             try:
@@ -90,111 +248,383 @@ async def handler(websocket):
                         transcript = dg_data.get("channel", {}).get("alternatives", [{}])[0].get("transcript")
                         if transcript:
                             is_final = dg_data.get("is_final", False)
+                            if not is_final:
+                                trace_event("dg_interim", words=len(transcript.split()))
                             timestamp = datetime.datetime.now().strftime("%H:%M:%S")
                             print(f"🗣️ [{timestamp}] {'(FINAL)' if is_final else '(INTERIM)'} {transcript}")
 
+                            # Caller talks over the bot → cancel GPT/Kyutai/playback and flush Twilio
+                            playing = reply_playing()
+                            if BARGE_IN and barge_in.should_interrupt(turns.current, transcript, playing):
+                                now = asyncio.get_running_loop().time()
+                                speech_start = now
+                                if media_start is not None and "start" in dg_data:
+                                    speech_start = min(now, media_start + dg_data["start"])
+                                await barge_in.interrupt(turns.current, websocket, stream_sid, speech_start)
+                            elif BARGE_IN and barge_in.should_hold(turns.current, transcript, playing):
+                                # Nothing played yet: the caller only paused; answer the whole utterance at the next final
+                                held = turns.current
+                                if await turns.hold_current() and reply_playing():
+                                    await barge_in.flush(held, websocket, stream_sid)   # first frame went out meanwhile
+
+                            if speculator is not None:
+                                if is_final:
+                                    speculator.final()
+                                else:
+                                    speculator.interim(transcript)
+
                             if is_final:
-                                with open(TRANSCRIPT_FILE, "a", encoding="utf-8") as f:
-                                    f.write(transcript + "\n")
-                                gpt_reply = await ask_gpt(transcript)
-                                print(f"🤖 GPT: {gpt_reply}")
-                                await speak_with_kyutai(gpt_reply, websocket, stream_sid)
+                                # Deepgram latency: end of the caller's speech → final transcript
+                                stt_ms = None
+                                if media_start is not None and "start" in dg_data:
+                                    speech_end = media_start + dg_data["start"] + dg_data.get("duration", 0)
+                                    stt_ms = max(0.0, asyncio.get_running_loop().time() - speech_end) * 1000
+                                    metrics.observe("stt_final", stt_ms)
+                                trace_event("dg_final", text=transcript, stt_ms=round(stt_ms, 1) if stt_ms is not None else None)
+                                journal.write(call_sid or "unknown", transcript)
+                                playing = reply_playing()
+                                superseded = turns.submit(transcript)
+                                if superseded is not None and playing:
+                                    # TURN_POLICY=supersede cut a reply Twilio is still playing
+                                    await barge_in.flush(superseded, websocket, stream_sid)
             except Exception as e:
                 print("❌ Deepgram error:", e)
 
         await asyncio.gather(twilio_to_deepgram(), deepgram_to_actions())
+        await turns.close()
+        if speculator is not None:
+            speculator.close()
+        journal.close_call(call_sid or "unknown")
+        if trace is not None:
+            trace.close()
+        print(f"📊 Deepgram pool: {dg_pool.stats()}")
+        print(f"📊 Kyutai pool: {tts_pool.stats()}")
+        print(f"📊 Kyutai scheduler: {tts_scheduler.stats()}")
+        print(f"📊 Conversion: {conversions.stats()}")
+        print(f"📊 Latency: {metrics.stats()}")
+        print(f"📊 Playout: {playout.stats()}")
+        print(f"📊 Barge-in: {barge_in.stats()}")
+        print(f"📊 Turns: {turns.stats()}")
+        print(f"📊 GPT: {llm.stats()}")
+        print(f"📊 Transcript journal: {journal.stats()}")
+        if tracer is not None:
+            print(f"📊 Traces: {tracer.stats()}")
+        if tts_cache is not None:
+            print(f"📊 TTS cache: {tts_cache.stats()}")
+        if fillers is not None:
+            print(f"📊 Fillers: {fillers.stats()}")
+        if responses is not None:
+            print(f"📊 Response cache: {responses.stats()}")
+        if speculator is not None:
+            print(f"📊 Speculation: {speculator.stats()}")
+
+GPT_SYSTEM_PROMPT = "Tu es un assistant vocal amical. Réponds de manière concise en français (max 2-3 phrases)."
+
+# ✅ Response cache policy
+def caching_gpt_answers():
+    """Store GPT answers only when opted in (RESPONSE_CACHE_GPT)
+
+    A near-match that differs by a negation or a number would replay the wrong
+    answer, so by default the response cache only serves pinned FAQ answers.
+    """
+    return RESPONSE_CACHE_GPT and responses is not None
 
 # ✅ GPT Response
 async def ask_gpt(text):
+    trace_event("gpt_request", stream=False)
     try:
-        response = await asyncio.to_thread(
-            lambda: client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "Tu es un assistant vocal amical. Réponds de manière concise en français (max 2-3 phrases)."},
-                    {"role": "user", "content": text}
-                ],
-                max_tokens=100
-            )
+        reply = await llm.complete(
+            [
+                {"role": "system", "content": GPT_SYSTEM_PROMPT},
+                {"role": "user", "content": text}
+            ],
+            max_tokens=100
         )
-        return response.choices[0].message.content
     except Exception as e:
+        trace_event("gpt_done", failed=True)
         return f"Erreur GPT: {e}"
+    trace_event("gpt_done", words=len(reply.split()))
+    if caching_gpt_answers():
+        responses.store(text, reply)
+    return reply
+
+# ✅ GPT Response (streamed)
+async def ask_gpt_words(text, usage=None, store=True):
+    """Stream the GPT reply, yielding each word as soon as it is complete"""
+    messages = [
+        {"role": "system", "content": GPT_SYSTEM_PROMPT},
+        {"role": "user", "content": text}
+    ]
+    reply_words = []
+    buffer = ""
+    failed = False
+    # Speculative streams carry their number: the trace report only counts the one a turn adopted
+    spec = current_speculation.get()
+    tag = {} if spec is None else {"spec": spec}
+    trace_event("gpt_request", stream=True, **tag)
+    try:
+        # aclosing → a cancelled turn (barge-in) closes the HTTP stream immediately
+        async with contextlib.aclosing(llm.stream(messages, max_tokens=100, usage=usage)) as deltas:
+            async for delta in deltas:
+                if not reply_words and not buffer:
+                    trace_event("gpt_first", **tag)
+                buffer += delta
+                words = buffer.split()
+                # Keep the last word back until GPT sends the whitespace that ends it
+                buffer = words.pop() if words and not buffer[-1].isspace() else ""
+                for word in words:
+                    reply_words.append(word)
+                    yield word
+    except Exception as e:
+        buffer += f" Erreur GPT: {e}"
+        failed = True
+    for word in buffer.split():
+        reply_words.append(word)
+        yield word
+    trace_event("gpt_done", words=len(reply_words), failed=failed, **tag)
+    print(f"🤖 GPT: {' '.join(reply_words)}")
+    # Only reached when the whole reply was consumed (not on barge-in); speculative replies are stored by
+    # respond(), under the final transcript, once adopted
+    if caching_gpt_answers() and store and not failed:
+        responses.store(text, " ".join(reply_words))
 
 # ✅ Kyutai TTS → µ-law 8kHz → Send to Twilio
-async def speak_with_kyutai(text, websocket, stream_sid):
+async def speak_with_kyutai(text, websocket, stream_sid, playout=None, filler=None, turn=None):
+    """Speak `text` on the call; `text` may also be an async iterator of words (streamed GPT)"""
+    # New reply: pace against a fresh anchor (per-call clock keeps the counters)
+    playout = playout or PlayoutClock(lead_ms=PLAYOUT_LEAD_MS)
+    if filler is None:
+        playout.reset()
+
     try:
-        print(f"🎙️ Kyutai TTS: Converting '{text}' to speech...")
+        if isinstance(text, str):
+            # Same reply synthesized before → play the stored µ-law, no Kyutai request, no conversion
+            if tts_cache is not None and (cached := await tts_cache.get(KYUTAI_VOICE, KYUTAI_FORMAT, text)) is not None:
+                print(f"💾 TTS cache hit: '{text}'")
+                if turn is not None:
+                    turn.mark("frame")
+                trace_event("reply_first_frame", cached=True)
+                await play_ulaw(cached, websocket, stream_sid, playout, filler)
+                await playout.drain()
+                return
+            print(f"🎙️ Kyutai TTS: Converting '{text}' to speech...")
+            spoken = [text]
+        else:
+            print("🎙️ Kyutai TTS: Converting streamed GPT reply to speech...")
+            spoken = []
+            text = record_words(text, spoken)
+
+        # First reply frame: stop the filler, mark the turn's dead air
+        async def first_frame():
+            if turn is not None:
+                turn.mark("frame")
+            trace_event("reply_first_frame")
+            if filler is not None:
+                await filler.stop(reply_starting=True)
+
+        # Sentence by sentence: segment 1 plays while segment 2 is synthesized (bounded look-ahead)
+        pipeline = SentencePipeline(synthesize_segment, lookahead=SENTENCE_LOOKAHEAD)
+        audio = await pipeline.run(
+            text,
+            lambda frame: send_to_twilio(websocket, stream_sid, frame),
+            playout,
+            buffered=not STREAM_PLAYBACK,
+            on_first_frame=first_frame,
+            on_first_audio=(lambda: turn.mark("audio")) if turn is not None else None,
+        )
+        # Return once the reply has actually played out on the call
+        await playout.drain()
+
+        # Complete reply (Kyutai sent Done for every segment, nothing cancelled): keep it for the next time
+        reply_text = " ".join(spoken)
+        if tts_cache is not None and audio and "Erreur GPT" not in reply_text:
+            await store_tts(reply_text, audio)
 
-        # Connect to Kyutai TTS
-        async with websockets.connect(KYUTAI_TTS_URI, additional_headers={"kyutai-api-key": KYUTAI_API_KEY}, ping_interval=None) as tts_ws:
+    except Exception as e:
+        print(f"❌ Kyutai TTS error: {e}")
+        import traceback
+        traceback.print_exc()
+
+# ✅ Send reply text to Kyutai, then Eos
+async def send_text_to_kyutai(tts_ws, text, gpt_wait=lambda waiting: None):
+    """Send a full reply as one Text message, or a word stream one word at a time
+
+    `gpt_wait(True)` / `gpt_wait(False)` bracket each wait for the next streamed word
+    """
+    try:
+        if isinstance(text, str):
             # Send text (using msgpack directly)
             await tts_ws.send(msgpack.packb({"type": "Text", "text": text}))
-            # Signal end of stream
-            await tts_ws.send(msgpack.packb({"type": "Eos"}))
+        else:
+            words = aiter(text)
+            while True:
+                gpt_wait(True)
+                try:
+                    word = await anext(words)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    gpt_wait(False)
+                await tts_ws.send(msgpack.packb({"type": "Text", "text": word + " "}))
+        # Signal end of stream
+        await tts_ws.send(msgpack.packb({"type": "Eos"}))
+    except websockets.exceptions.ConnectionClosed:
+        pass
 
-            # Collect all PCM chunks
-            pcm_float_list = []
-            try:
-                async with asyncio.timeout(10.0):
-                    async for msg_bytes in tts_ws:
-                        msg = msgpack.unpackb(msg_bytes)
-
-                        if msg.get("type") == "Audio":
-                            pcm = msg.get("pcm", [])
-                            if isinstance(pcm, list):
-                                pcm_float_list.extend(pcm)
-                        elif msg.get("type") == "Done":
-                            break
-            except asyncio.TimeoutError:
-                print("⚠️  Timeout waiting for Kyutai audio")
-                pass
-
-            if not pcm_float_list:
-                print("❌ No audio from Kyutai")
-                return
+# ✅ Record streamed words on their way to Kyutai
+async def record_words(words, spoken):
+    """Pass words through unchanged, appending each to `spoken` (cache key of the finished reply)"""
+    async for word in words:
+        spoken.append(word)
+        yield word
 
-            # Convert float → int16
-            pcm_int16 = float_to_int16(pcm_float_list)
-            print(f"✅ Got {len(pcm_int16)} PCM samples @ 24kHz")
+# ✅ One sentence → Kyutai → µ-law 8kHz
+async def synthesize_segment(text, emit, first=True, offline=False):
+    """Synthesize one segment on its own pooled Kyutai session, passing µ-law to `emit` as it arrives
 
-            # Resample 24kHz → 8kHz
-            pcm_8k = resample_24k_to_8k(pcm_int16)
-            print(f"📊 Resampled to {len(pcm_8k)} samples @ 8kHz")
+    Returns True if Kyutai finished the segment (Done)
+    """
+    conversion = conversions.stream(RESAMPLER_QUALITY)
+    received = done = False
+    # Wait for a Kyutai slot (GPU batch): first sentences of live turns go first, pre-render jobs last
+    priority = OFFLINE if offline else LIVE_FIRST if first else LIVE_NEXT
+    async with tts_scheduler.slot(priority), tts_pool.connection(KYUTAI_VOICE, KYUTAI_FORMAT) as tts_ws:
+        trace_event("kyutai_connect", first=first, offline=offline)
+        loop = asyncio.get_running_loop()
+        waiting_for_gpt = False
+        text_sender = None
+        try:
+            async with asyncio.timeout(KYUTAI_SEGMENT_TIMEOUT) as idle:
+                # Idle deadline: restarted by every word sent and message received, off while GPT owes the next word
+                def restart_idle(gpt_wait=None):
+                    nonlocal waiting_for_gpt
+                    if gpt_wait is not None:
+                        waiting_for_gpt = gpt_wait
+                    idle.reschedule(None if waiting_for_gpt else loop.time() + KYUTAI_SEGMENT_TIMEOUT)
 
-            # Convert PCM → µ-law
-            ulaw_data = pcm_to_ulaw(pcm_8k)
-            print(f"🔉 Converted to µ-law: {len(ulaw_data)} bytes")
+                text_sender = asyncio.create_task(send_text_to_kyutai(tts_ws, text, restart_idle))
+                while not done:
+                    msg = msgpack.unpackb(await tts_ws.recv())
+                    restart_idle()
 
-            # Chunk and send to Twilio (20ms per packet → 160 bytes µ-law @ 8kHz)
-            chunk_size = 160
-            for i in range(0, len(ulaw_data), chunk_size):
-                chunk = ulaw_data[i:i+chunk_size]
-                audio_base64 = base64.b64encode(chunk).decode("utf-8")
-                await websocket.send(json.dumps({
-                    "event": "media",
-                    "streamSid": stream_sid,
-                    "media": {"payload": audio_base64}
-                }))
-                await asyncio.sleep(0.02)  # ~20ms
+                    if msg.get("type") == "Audio":
+                        pcm = msg.get("pcm", [])
+                        if isinstance(pcm, list) and pcm:
+                            # 24kHz → 8kHz → µ-law in the conversion pool, one Kyutai frame at a time (filter state carries over)
+                            if not received:
+                                trace_event("kyutai_first_audio")
+                            received = True
+                            emit(await conversion.convert(pcm))
+                    elif msg.get("type") == "Done":
+                        done = True
+        except asyncio.TimeoutError:
+            print(f"⚠️  Timeout waiting for Kyutai audio ({KYUTAI_SEGMENT_TIMEOUT}s idle)")
+        except websockets.exceptions.ConnectionClosed:
+            print("⚠️  Kyutai connection closed mid-segment")
+        finally:
+            if text_sender is not None:
+                text_sender.cancel()
+            trace_event("kyutai_last_audio", done=done)
 
-            print(f"✅ Audio sent to Twilio ({len(ulaw_data)} bytes total)")
+    # Tail still held back by the resampler filter delay
+    if received:
+        emit(await conversion.flush())
+    return done
 
+# ✅ Cached reply → Twilio
+async def play_ulaw(audio, websocket, stream_sid, playout, filler=None):
+    """Send stored 8kHz µ-law (TTS cache hit) with the same pacing as live audio"""
+    if filler is not None:
+        await filler.stop(reply_starting=True)
+    chunk_size = 160
+    for i in range(0, len(audio), chunk_size):
+        await playout.wait()
+        await send_to_twilio(websocket, stream_sid, audio[i:i+chunk_size])
+
+# ✅ Finished audio → TTS cache
+async def store_tts(text, ulaw_data):
+    """Cache synthesized µ-law; a cache failure is logged as one and never fails the reply"""
+    try:
+        await tts_cache.put(KYUTAI_VOICE, KYUTAI_FORMAT, text, ulaw_data)
     except Exception as e:
-        print(f"❌ Kyutai TTS error: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"⚠️  TTS cache error: {e}")
+
+# ✅ Phrase → µ-law without a call
+async def synthesize_ulaw(text):
+    """Synthesize a whole phrase to 8kHz µ-law (filler bank), served from the TTS cache when possible"""
+    if tts_cache is not None and (cached := await tts_cache.get(KYUTAI_VOICE, KYUTAI_FORMAT, text)) is not None:
+        return cached
+
+    chunks = []
+    if not await synthesize_segment(text, chunks.append, offline=True):
+        return None
+
+    ulaw_data = b"".join(chunks)
+    if tts_cache is not None:
+        await store_tts(text, ulaw_data)
+    return ulaw_data
+
+# ✅ Send one µ-law packet to Twilio
+async def send_to_twilio(websocket, stream_sid, chunk):
+    if (trace := current_trace.get()) is not None:
+        trace.frame()
+    audio_base64 = base64.b64encode(chunk).decode("utf-8")
+    await websocket.send(json.dumps({
+        "event": "media",
+        "streamSid": stream_sid,
+        "media": {"payload": audio_base64}
+    }))
 
 # ✅ Run server
-async def main():
+async def main(reuse_port=False, metrics_port=METRICS_PORT):
+    """Serve Twilio media streams; `reuse_port` when several workers share the port (SO_REUSEPORT)"""
     print(f"🎧 Kyutai TTS + Twilio Server running at ws://{TWILIO_SERVER_HOST}:{TWILIO_SERVER_PORT}/ws")
-    print(f"📡 Kyutai TTS endpoint: {KYUTAI_TTS_URI}")
-    async with websockets.serve(handler, TWILIO_SERVER_HOST, TWILIO_SERVER_PORT):
-        await asyncio.Future()
+    print(f"📡 Kyutai TTS endpoint(s): {', '.join(KYUTAI_TTS_URLS)} (voice {KYUTAI_VOICE})")
+    print(f"🔥 Pre-warming {KYUTAI_POOL_SIZE} Kyutai connection(s) per backend")
+    tts_pool.warm(KYUTAI_VOICE, KYUTAI_FORMAT)
+    dg_pool.warm()
+    if fillers is not None:
+        print(f"🗯️ Rendering {len(FILLER_PHRASES)} filler clip(s)")
+        filler_render = asyncio.create_task(fillers.render(synthesize_ulaw))  # referenced until shutdown
+
+    # SIGTERM (supervisor, docker stop) → same clean shutdown as Ctrl+C
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    try:
+        if metrics_port:
+            await metrics.serve(TWILIO_SERVER_HOST, metrics_port)
+            print(f"📈 Metrics at http://{TWILIO_SERVER_HOST}:{metrics_port}/metrics")
+        async with websockets.serve(active_calls.wrap(handler), TWILIO_SERVER_HOST, TWILIO_SERVER_PORT, reuse_port=reuse_port):
+            await stop.wait()
+    finally:
+        await asyncio.to_thread(journal.close)
+        if tracer is not None:
+            await asyncio.to_thread(tracer.close)
+        await llm.close()
+        await dg_pool.close()
+        await tts_pool.close()
+        await asyncio.to_thread(conversions.close)
+        await metrics.close()
+
+# ✅ Worker process
+def run_worker(index, gauge):
+    """One of WORKERS processes: the full server, its active calls counted in the supervisor's shared memory"""
+    global active_calls
+    active_calls = gauge
+    print(f"👷 Worker {index + 1}: pid {os.getpid()}")
+    try:
+        # One metrics port per worker: METRICS_PORT, METRICS_PORT + 1, …
+        asyncio.run(main(reuse_port=True, metrics_port=METRICS_PORT + index if METRICS_PORT else 0))
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if WORKERS > 1:
+            print(f"🎧 {WORKERS} workers sharing ws://{TWILIO_SERVER_HOST}:{TWILIO_SERVER_PORT}/ws")
+            WorkerSupervisor(run_worker, WORKERS, report_interval=WORKER_REPORT_INTERVAL).run()
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n🛑 Server stopped")
     except Exception as e:
@@ -1,13 +1,31 @@
 import asyncio
+import contextlib
 import websockets
 import base64
 import json
 import aiohttp
 import datetime
+import functools
 import msgpack
+import signal
 import numpy as np
-import audioop
-from openai import OpenAI
+from kyutai_router import KyutaiRouter
+from deepgram_pool import DeepgramStreamPool
+from llm_client import LLMClient
+from playout import PlayoutClock
+from barge_in import BargeIn
+from turn_manager import TurnManager
+from transcript_journal import TranscriptJournal
+from tts_cache import TTSCache
+from filler_bank import FillerBank
+from response_cache import ResponseCache
+from speculation import Speculator, current_speculation
+from sentence_pipeline import SentencePipeline
+from worker_supervisor import CallGauge, WorkerSupervisor
+from audio_offload import ConversionPool
+from tts_scheduler import LIVE_FIRST, LIVE_NEXT, OFFLINE, TTSScheduler
+from latency_metrics import LatencyMetrics, TurnTimer
+from call_trace import CallTracer, current_trace, trace_event
 
 # ✅ API Keys (Load from .env file - see .env.example)
 import os
@@ -21,47 +39,241 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 if not DEEPGRAM_API_KEY or not OPENAI_API_KEY:
     raise ValueError("❌ Missing API keys in .env file. See .env.example")
 
+# ✅ Service endpoints (point them at deepgram_stand_in.py / openai_stand_in.py to run without the live APIs)
+DEEPGRAM_ENDPOINT = os.getenv("DEEPGRAM_ENDPOINT", "wss://api.deepgram.com/v1/listen")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1"   # empty in .env = default
+
+# ✅ Deepgram live transcription (listen sockets are pre-opened with these parameters)
+DEEPGRAM_URL = (
+    f"{DEEPGRAM_ENDPOINT}?"
+    "model=nova-2&encoding=mulaw&sample_rate=8000&channels=1&language=fr"
+    "&smart_format=true&interim_results=true&endpointing=500"
+)
+DEEPGRAM_POOL_SIZE = int(os.getenv("DEEPGRAM_POOL_SIZE", "2"))
+
 # ✅ Kyutai TTS Configuration
 KYUTAI_TTS_URL = "ws://127.0.0.1:8080/api/tts_streaming"
 KYUTAI_API_KEY = "public_token"
 KYUTAI_VOICE = "cml-tts/fr/2465_1943_000152-0002.wav"
 KYUTAI_FORMAT = "PcmMessagePack"
+KYUTAI_POOL_SIZE = int(os.getenv("KYUTAI_POOL_SIZE", "2"))
+KYUTAI_POOL_MAX_IDLE = float(os.getenv("KYUTAI_POOL_MAX_IDLE", "30"))
+KYUTAI_MAX_SESSIONS_PER_WORKER = int(os.getenv("KYUTAI_MAX_SESSIONS_PER_WORKER", "8"))   # in-flight sessions per worker process, 0 = no limit
+
+# ✅ Kyutai backends (comma-separated), least outstanding sessions first; probe every N s, eject when TTFA > ratio × baseline
+KYUTAI_TTS_URLS = [url.strip() for url in os.getenv("KYUTAI_TTS_URLS", KYUTAI_TTS_URL).split(",") if url.strip()]
+KYUTAI_PROBE_INTERVAL = float(os.getenv("KYUTAI_PROBE_INTERVAL", "10"))
+KYUTAI_EJECT_RATIO = float(os.getenv("KYUTAI_EJECT_RATIO", "2.0"))
+
+# ✅ 24kHz → 8kHz resampler filter: "low_latency" or "high_quality"
+RESAMPLER_QUALITY = os.getenv("RESAMPLER_QUALITY", "high_quality")
+
+# ✅ Where Kyutai audio is converted to μ-law: "thread" pool, "process" pool or "inline" (event loop); max jobs queued
+CONVERSION_POOL = os.getenv("CONVERSION_POOL", "thread")
+CONVERSION_WORKERS = int(os.getenv("CONVERSION_WORKERS", "2"))
+CONVERSION_MAX_PENDING = int(os.getenv("CONVERSION_MAX_PENDING", "64"))
+
+# ✅ Audio kept queued at Twilio ahead of real time (burst-ahead), in ms
+PLAYOUT_LEAD_MS = int(os.getenv("PLAYOUT_LEAD_MS", "100"))
+
+# ✅ Barge-in: stop the reply when the caller starts talking over it (before it plays: wait for the rest of the utterance)
+BARGE_IN = os.getenv("BARGE_IN", "true").lower() == "true"
+BARGE_IN_MIN_WORDS = int(os.getenv("BARGE_IN_MIN_WORDS", "1"))
+
+# ✅ What to do with finals that arrive while a turn is running: queue, coalesce or supersede
+TURN_POLICY = os.getenv("TURN_POLICY", "coalesce")
+
+# ✅ Shared async OpenAI HTTP pool (max concurrent GPT requests)
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+
+# ✅ Playback mode: stream each Kyutai frame to Twilio as it arrives (false = buffer each sentence)
+STREAM_PLAYBACK = os.getenv("STREAM_PLAYBACK", "true").lower() == "true"
+
+# ✅ GPT mode: push each streamed GPT word into Kyutai as it arrives (false = wait for full reply)
+GPT_STREAMING = os.getenv("GPT_STREAMING", "true").lower() == "true"
+
+# ✅ Cache of synthesized replies (μ-law, memory LRU + mmap'd files) keyed by voice, format and text
+TTS_CACHE = os.getenv("TTS_CACHE", "true").lower() == "true"
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "tts_cache")
+TTS_CACHE_MEMORY_MB = int(os.getenv("TTS_CACHE_MEMORY_MB", "32"))
+TTS_CACHE_DISK_MB = int(os.getenv("TTS_CACHE_DISK_MB", "512"))
+
+# ✅ Answers to recurring questions served without GPT (TTL in s, max entries, fuzzy threshold 0-1, 0 = exact only)
+# RESPONSE_CACHE_FAQ: optional JSON file of pinned answers [{"question": ..., "answer": ...}]
+# RESPONSE_CACHE_GPT: also reuse GPT's own answers (off: only the FAQ is served)
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "true").lower() == "true"
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))
+RESPONSE_CACHE_FUZZY = float(os.getenv("RESPONSE_CACHE_FUZZY", "1.0"))
+RESPONSE_CACHE_FAQ = os.getenv("RESPONSE_CACHE_FAQ", "")
+RESPONSE_CACHE_GPT = os.getenv("RESPONSE_CACHE_GPT", "false").lower() == "true"
+
+# ✅ Speculative GPT: start on an interim unchanged for STABLE_MS, keep it if the final matches (similarity 0-1)
+SPECULATIVE_GPT = os.getenv("SPECULATIVE_GPT", "false").lower() == "true"
+SPECULATION_STABLE_MS = int(os.getenv("SPECULATION_STABLE_MS", "300"))
+SPECULATION_TOLERANCE = float(os.getenv("SPECULATION_TOLERANCE", "0.9"))
 
-TRANSCRIPT_FILE = "transcript.txt"
+# ✅ Replies spoken sentence by sentence: segments synthesized ahead of the one playing, Kyutai idle timeout (s)
+SENTENCE_LOOKAHEAD = int(os.getenv("SENTENCE_LOOKAHEAD", "1"))
+KYUTAI_SEGMENT_TIMEOUT = float(os.getenv("KYUTAI_SEGMENT_TIMEOUT", "5.0"))
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# ✅ Filler clips played while GPT + Kyutai work (rendered once at startup), after a grace delay in ms
+FILLERS = os.getenv("FILLERS", "true").lower() == "true"
+FILLER_PHRASES = [p.strip() for p in os.getenv("FILLER_PHRASES", "D'accord…|Un instant…|Hmm, voyons…|Très bien…").split("|") if p.strip()]
+FILLER_DELAY_MS = int(os.getenv("FILLER_DELAY_MS", "150"))
+
+# ✅ Transcripts: one file per CallSid, written by a background thread (fsync: batch, close or never)
+TRANSCRIPT_DIR = os.getenv("TRANSCRIPT_DIR", "transcripts")
+TRANSCRIPT_FSYNC = os.getenv("TRANSCRIPT_FSYNC", "batch")
+
+# ✅ Worker processes accepting on port 8765 together (SO_REUSEPORT), 1 = single process; pools and caches are per worker
+WORKERS = int(os.getenv("WORKERS", "1"))
+WORKER_REPORT_INTERVAL = float(os.getenv("WORKER_REPORT_INTERVAL", "30"))
+
+# ✅ Prometheus /metrics (per-stage latency histograms) on a sidecar port, +1 per worker; 0 = off
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+# ✅ Per-call trace timelines: <TRACE_DIR>/<CallSid>.jsonl (report: python call_trace.py traces/)
+CALL_TRACES = os.getenv("CALL_TRACES", "true").lower() == "true"
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+
+llm = LLMClient(OPENAI_API_KEY, max_connections=OPENAI_MAX_CONNECTIONS, base_url=OPENAI_BASE_URL)
+journal = TranscriptJournal(TRANSCRIPT_DIR, fsync=TRANSCRIPT_FSYNC)
+tracer = CallTracer(TRACE_DIR) if CALL_TRACES else None
+tts_cache = TTSCache(TTS_CACHE_DIR, TTS_CACHE_MEMORY_MB << 20, TTS_CACHE_DISK_MB << 20) if TTS_CACHE else None
+responses = None
+if RESPONSE_CACHE:
+    responses = ResponseCache(ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_SIZE, fuzzy_threshold=RESPONSE_CACHE_FUZZY)
+    if RESPONSE_CACHE_FAQ:
+        print(f"📚 Pinned {responses.load_faq(RESPONSE_CACHE_FAQ)} FAQ answer(s)")
+fillers = FillerBank(FILLER_PHRASES, delay_ms=FILLER_DELAY_MS) if FILLERS else None
+dg_pool = DeepgramStreamPool(DEEPGRAM_URL, DEEPGRAM_API_KEY, size=DEEPGRAM_POOL_SIZE)
+tts_pool = KyutaiRouter(
+    KYUTAI_TTS_URLS, KYUTAI_API_KEY, size=KYUTAI_POOL_SIZE, max_idle=KYUTAI_POOL_MAX_IDLE,
+    probe_interval=KYUTAI_PROBE_INTERVAL, eject_ratio=KYUTAI_EJECT_RATIO
+)
+tts_scheduler = TTSScheduler(max_sessions=KYUTAI_MAX_SESSIONS_PER_WORKER)
+metrics = LatencyMetrics()
+conversions = ConversionPool(CONVERSION_POOL, workers=CONVERSION_WORKERS, max_pending=CONVERSION_MAX_PENDING, observe=metrics.observe)
+active_calls = CallGauge()   # replaced by the supervisor's shared counter in worker processes
+metrics.gauge("active_calls", "Calls in progress on this process", lambda: active_calls.value)
+metrics.gauge("kyutai_sessions_in_flight", "Kyutai sessions synthesizing", lambda: tts_scheduler.in_flight)
+metrics.gauge("kyutai_sessions_waiting", "Kyutai sessions queued for a slot", lambda: tts_scheduler.stats()["waiting"])
+if fillers is not None:
+    metrics.gauge("fillers_played", "Turns where a filler clip started", lambda: fillers.played)
+    metrics.gauge("fillers_skipped", "Turns whose reply was ready within the filler delay", lambda: fillers.skipped)
+    metrics.gauge("fillers_faded", "Fillers faded out for the reply", lambda: fillers.faded)
+    metrics.gauge("fillers_cut", "Fillers stopped mid-clip when the turn ended", lambda: fillers.cut)
+    metrics.gauge("fillers_first_audio_ms_avg", "Turn start → first audio on the call (filler or reply)",
+                  lambda: fillers.stats()["first_audio_ms_avg"])
+if tts_cache is not None:
+    metrics.gauge("tts_cache_hits", "TTS cache hits (memory or disk)", lambda: tts_cache.hits)
+    metrics.gauge("tts_cache_misses", "TTS cache misses", lambda: tts_cache.misses)
+    metrics.gauge("tts_cache_evictions", "TTS cache entries evicted (memory and disk)",
+                  lambda: tts_cache.memory_evictions + tts_cache.disk_evictions)
 
 # ✅ WebSocket Handler
 async def handler(websocket):
     print("✅ Twilio connected!")
+    trace = tracer.start() if tracer is not None else None
 
-    async with aiohttp.ClientSession() as session:
-        deepgram_url = (
-            "wss://api.deepgram.com/v1/listen?"
-            "model=nova-2&encoding=mulaw&sample_rate=8000&channels=1&language=fr"
-            "&smart_format=true&interim_results=true&endpointing=500"
-        )
-        dg_ws = await session.ws_connect(deepgram_url, headers={"Authorization": f"Token {DEEPGRAM_API_KEY}"})
+    async with dg_pool.stream() as dg_ws:
         print("🧬 Connected to Deepgram")
 
-        # Reset transcript
-        open(TRANSCRIPT_FILE, "w").close()
-
         stream_sid = None
+        call_sid = None     # transcript journal key (from Twilio's start event)
+        playout = PlayoutClock(lead_ms=PLAYOUT_LEAD_MS)
+        barge_in = BargeIn(min_words=BARGE_IN_MIN_WORDS)
+        media_start = None  # loop time of the first caller audio (Deepgram offsets are relative to it)
+        reply_turn = None   # TurnTimer of the latest turn (its "frame" mark: the reply started playing)
+
+        def reply_playing():
+            return reply_turn is not None and "frame" in reply_turn.marks
 
         async def twilio_to_deepgram():
-            nonlocal stream_sid
+            nonlocal stream_sid, call_sid, media_start
             try:
                 async for message in websocket:
                     data = json.loads(message)
                     if data.get("event") == "media":
                         audio = base64.b64decode(data["media"]["payload"])
+                        if media_start is None:
+                            media_start = asyncio.get_running_loop().time()
                         await dg_ws.send_bytes(audio)
                     elif data.get("event") == "start":
                         stream_sid = data["start"]["streamSid"]
+                        call_sid = data["start"].get("callSid") or stream_sid
+                        if trace is not None:
+                            trace.twilio_start(call_sid, stream_sid)
                         print(f"📡 Stream SID: {stream_sid}")
             except websockets.exceptions.ConnectionClosedError as e:
                 print("🔌 Twilio closed:", e)
+            finally:
+                # No more caller audio: Deepgram sends its last results and closes
+                await dg_pool.finish(dg_ws)
+
+        # GPT started early on stable interims (kept only if the final matches)
+        speculator = None
+        if SPECULATIVE_GPT:
+            speculator = Speculator(functools.partial(ask_gpt_words, store=False), stable_ms=SPECULATION_STABLE_MS, tolerance=SPECULATION_TOLERANCE)
+
+        # GPT → Kyutai → Twilio for one turn (runs as its own task so it can be cancelled)
+        async def respond(transcript):
+            nonlocal reply_turn
+            if trace is not None:
+                trace.begin_turn(transcript)
+            # Filler ("D'accord…") while GPT + Kyutai work; the reply stops it right before its first frame
+            filler = None
+            if fillers is not None:
+                filler = fillers.start(lambda frame: send_to_twilio(websocket, stream_sid, frame), playout)
+            speculative = None
+            turn = reply_turn = TurnTimer(metrics, queued_ms=turns.current_wait_ms)   # timed from the final
+            complete = False
+            try:
+                # Recurring question: cached answer, no GPT request (and usually a TTS cache hit)
+                answer = responses.lookup(transcript) if responses is not None else None
+                if speculator is not None:
+                    if answer is None:
+                        speculative = speculator.take(transcript)
+                        if speculative is not None:
+                            trace_event("gpt_adopted", spec=speculative.number)
+                    else:
+                        speculator.close()
+
+                if answer is not None:
+                    print(f"📚 Cached answer: {answer}")
+                    await speak_with_kyutai(answer, websocket, stream_sid, playout, filler, turn)
+                elif speculative is not None:
+                    # Words already generated play right away, the rest follows live
+                    if GPT_STREAMING:
+                        await speak_with_kyutai(turn.first_word(speculative.replay()), websocket, stream_sid, playout, filler, turn)
+                    else:
+                        gpt_reply = await speculative.text()
+                        turn.mark("gpt")
+                        await speak_with_kyutai(gpt_reply, websocket, stream_sid, playout, filler, turn)
+                elif GPT_STREAMING:
+                    await speak_with_kyutai(turn.first_word(ask_gpt_words(transcript)), websocket, stream_sid, playout, filler, turn)
+                else:
+                    gpt_reply = await ask_gpt(transcript)
+                    turn.mark("gpt")
+                    print(f"🤖 GPT: {gpt_reply}")
+                    await speak_with_kyutai(gpt_reply, websocket, stream_sid, playout, filler, turn)
+                complete = True
+                # Adopted speculation played in full: cache its answer under the final transcript
+                if caching_gpt_answers() and speculative is not None and speculative.finished:
+                    reply = " ".join(speculative.words)
+                    if "Erreur GPT" not in reply:
+                        responses.store(transcript, reply)
+            finally:
+                turn.finish(complete)
+                if filler is not None:
+                    await filler.stop()
+                if speculative is not None:
+                    speculative.cancel()
+                if trace is not None:
+                    trace.end_turn(complete)
+
+        turns = TurnManager(respond, policy=TURN_POLICY)
 
         async def deepgram_to_actions():
             try:
@@ -71,94 +283,342 @@ async def handler(websocket):
                         transcript = dg_data.get("channel", {}).get("alternatives", [{}])[0].get("transcript")
                         if transcript:
                             is_final = dg_data.get("is_final", False)
+                            if not is_final:
+                                trace_event("dg_interim", words=len(transcript.split()))
                             timestamp = datetime.datetime.now().strftime("%H:%M:%S")
                             print(f"🗣️ [{timestamp}] {'(FINAL)' if is_final else '(INTERIM)'} {transcript}")
 
+                            # Caller talks over the bot → cancel GPT/Kyutai/playback and flush Twilio
+                            playing = reply_playing()
+                            if BARGE_IN and barge_in.should_interrupt(turns.current, transcript, playing):
+                                now = asyncio.get_running_loop().time()
+                                speech_start = now
+                                if media_start is not None and "start" in dg_data:
+                                    speech_start = min(now, media_start + dg_data["start"])
+                                await barge_in.interrupt(turns.current, websocket, stream_sid, speech_start)
+                            elif BARGE_IN and barge_in.should_hold(turns.current, transcript, playing):
+                                # Nothing played yet: the caller only paused; answer the whole utterance at the next final
+                                held = turns.current
+                                if await turns.hold_current() and reply_playing():
+                                    await barge_in.flush(held, websocket, stream_sid)   # first frame went out meanwhile
+
+                            if speculator is not None:
+                                if is_final:
+                                    speculator.final()
+                                else:
+                                    speculator.interim(transcript)
+
                             if is_final:
-                                with open(TRANSCRIPT_FILE, "a", encoding="utf-8") as f:
-                                    f.write(transcript + "\n")
-                                gpt_reply = await ask_gpt(transcript)
-                                print(f"🤖 GPT: {gpt_reply}")
-                                await speak_with_kyutai(gpt_reply, websocket, stream_sid)
+                                # Deepgram latency: end of the caller's speech → final transcript
+                                stt_ms = None
+                                if media_start is not None and "start" in dg_data:
+                                    speech_end = media_start + dg_data["start"] + dg_data.get("duration", 0)
+                                    stt_ms = max(0.0, asyncio.get_running_loop().time() - speech_end) * 1000
+                                    metrics.observe("stt_final", stt_ms)
+                                trace_event("dg_final", text=transcript, stt_ms=round(stt_ms, 1) if stt_ms is not None else None)
+                                journal.write(call_sid or "unknown", transcript)
+                                playing = reply_playing()
+                                superseded = turns.submit(transcript)
+                                if superseded is not None and playing:
+                                    # TURN_POLICY=supersede cut a reply Twilio is still playing
+                                    await barge_in.flush(superseded, websocket, stream_sid)
             except Exception as e:
                 print("❌ Deepgram error:", e)
 
         await asyncio.gather(twilio_to_deepgram(), deepgram_to_actions())
+        await turns.close()
+        if speculator is not None:
+            speculator.close()
+        journal.close_call(call_sid or "unknown")
+        if trace is not None:
+            trace.close()
+        print(f"📊 Deepgram pool: {dg_pool.stats()}")
+        print(f"📊 Kyutai pool: {tts_pool.stats()}")
+        print(f"📊 Kyutai scheduler: {tts_scheduler.stats()}")
+        print(f"📊 Conversion: {conversions.stats()}")
+        print(f"📊 Latency: {metrics.stats()}")
+        print(f"📊 Playout: {playout.stats()}")
+        print(f"📊 Barge-in: {barge_in.stats()}")
+        print(f"📊 Turns: {turns.stats()}")
+        print(f"📊 GPT: {llm.stats()}")
+        print(f"📊 Transcript journal: {journal.stats()}")
+        if tracer is not None:
+            print(f"📊 Traces: {tracer.stats()}")
+        if tts_cache is not None:
+            print(f"📊 TTS cache: {tts_cache.stats()}")
+        if fillers is not None:
+            print(f"📊 Fillers: {fillers.stats()}")
+        if responses is not None:
+            print(f"📊 Response cache: {responses.stats()}")
+        if speculator is not None:
+            print(f"📊 Speculation: {speculator.stats()}")
+
+GPT_MESSAGES = [{"role": "system", "content": "Réponds de manière amicale et concise en français."}]
+
+# ✅ GPT answers go into the response cache only when opted in: a near-match that differs by a
+# negation or a number would replay the wrong answer, so by default only pinned FAQ answers are served
+def caching_gpt_answers():
+    return RESPONSE_CACHE_GPT and responses is not None
 
 # ✅ GPT Response
 async def ask_gpt(text):
+    trace_event("gpt_request", stream=False)
     try:
-        response = await asyncio.to_thread(
-            lambda: client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "Réponds de manière amicale et concise en français."},
-                    {"role": "user", "content": text}
-                ],
-                max_tokens=100
-            )
-        )
-        return response.choices[0].message.content
+        reply = await llm.complete(GPT_MESSAGES + [{"role": "user", "content": text}], max_tokens=100)
     except Exception as e:
+        trace_event("gpt_done", failed=True)
         return f"Erreur GPT: {e}"
+    trace_event("gpt_done", words=len(reply.split()))
+    if caching_gpt_answers():
+        responses.store(text, reply)
+    return reply
+
+# ✅ GPT Response, streamed: yields each completed word as soon as GPT produces it
+async def ask_gpt_words(text, usage=None, store=True):
+    reply_words = []
+    buffer = ""
+    failed = False
+    # Speculative streams carry their number: the trace report only counts the one a turn adopted
+    spec = current_speculation.get()
+    tag = {} if spec is None else {"spec": spec}
+    trace_event("gpt_request", stream=True, **tag)
+    try:
+        # aclosing: a cancelled turn (barge-in) closes the HTTP stream right away
+        async with contextlib.aclosing(llm.stream(GPT_MESSAGES + [{"role": "user", "content": text}], max_tokens=100, usage=usage)) as deltas:
+            async for delta in deltas:
+                if not reply_words and not buffer:
+                    trace_event("gpt_first", **tag)
+                buffer += delta
+                words = buffer.split()
+                # The last word is still incomplete unless GPT already sent the whitespace after it
+                buffer = words.pop() if words and not buffer[-1].isspace() else ""
+                for word in words:
+                    reply_words.append(word)
+                    yield word
+    except Exception as e:
+        buffer += f" Erreur GPT: {e}"
+        failed = True
+    for word in buffer.split():
+        reply_words.append(word)
+        yield word
+    trace_event("gpt_done", words=len(reply_words), failed=failed, **tag)
+    print(f"🤖 GPT: {' '.join(reply_words)}")
+    # Only reached when the whole reply was consumed (not on barge-in); speculative replies are stored by
+    # respond(), under the final transcript, once adopted
+    if caching_gpt_answers() and store and not failed:
+        responses.store(text, " ".join(reply_words))
 
 # ✅ Kyutai TTS → 24kHz PCM → 8kHz μ-law → Twilio
-async def speak_with_kyutai(text, websocket, stream_sid):
+# `text` is either the full reply or an async iterator of words (streamed GPT)
+async def speak_with_kyutai(text, websocket, stream_sid, playout=None, filler=None, turn=None):
+    # New reply: pace against a fresh anchor (per-call clock keeps the counters)
+    playout = playout or PlayoutClock(lead_ms=PLAYOUT_LEAD_MS)
+    if filler is None:
+        playout.reset()
+
     try:
-        uri = f"{KYUTAI_TTS_URL}?voice={KYUTAI_VOICE}&format={KYUTAI_FORMAT}"
-        headers = {"kyutai-api-key": KYUTAI_API_KEY}
+        if isinstance(text, str):
+            # Same reply synthesized before: play the stored μ-law, no Kyutai and no conversion
+            if tts_cache is not None and (cached := await tts_cache.get(KYUTAI_VOICE, KYUTAI_FORMAT, text)) is not None:
+                print(f"💾 TTS cache hit: {text[:60]}...")
+                if turn is not None:
+                    turn.mark("frame")
+                trace_event("reply_first_frame", cached=True)
+                await play_ulaw(cached, websocket, stream_sid, playout, filler)
+                await playout.drain()
+                return
+            print(f"🎙️ Kyutai: {text[:60]}...")
+            spoken = [text]
+        else:
+            print("🎙️ Kyutai: streaming GPT reply...")
+            spoken = []
+            text = record_words(text, spoken)
 
-        print(f"🎙️ Kyutai: {text[:60]}...")
+        # First reply frame: stop the filler, mark the turn's dead air
+        async def first_frame():
+            if turn is not None:
+                turn.mark("frame")
+            trace_event("reply_first_frame")
+            if filler is not None:
+                await filler.stop(reply_starting=True)
+
+        # Sentence by sentence: segment 1 plays while segment 2 is synthesized (bounded look-ahead)
+        pipeline = SentencePipeline(synthesize_segment, lookahead=SENTENCE_LOOKAHEAD)
+        audio = await pipeline.run(
+            text,
+            lambda frame: send_to_twilio(websocket, stream_sid, frame),
+            playout,
+            buffered=not STREAM_PLAYBACK,
+            on_first_frame=first_frame,
+            on_first_audio=(lambda: turn.mark("audio")) if turn is not None else None,
+        )
+        # Return once the reply has actually played out on the call
+        await playout.drain()
 
-        async with websockets.connect(uri, additional_headers=headers) as tts_ws:
-            # Send text word by word
+        # Complete reply (Kyutai sent Done for every segment, nothing cancelled): keep it for the next time
+        reply_text = " ".join(spoken)
+        if tts_cache is not None and audio and "Erreur GPT" not in reply_text:
+            await store_tts(reply_text, audio)
+
+    except Exception as e:
+        print(f"❌ Kyutai error: {e}")
+
+# ✅ Send reply text to Kyutai word by word, then Eos
+# `gpt_wait(True)` / `gpt_wait(False)` bracket each wait for the next streamed word
+async def send_text_to_kyutai(tts_ws, text, gpt_wait=lambda waiting: None):
+    try:
+        if isinstance(text, str):
             for word in text.split():
                 await tts_ws.send(msgpack.packb({"type": "Text", "text": word + " "}))
-            await tts_ws.send(msgpack.packb({"type": "Eos"}))
-
-            # Collect audio chunks
-            audio_chunks = []
-            async for message_bytes in tts_ws:
-                msg = msgpack.unpackb(message_bytes)
-                if msg.get("type") == "Audio":
-                    pcm_data = msg.get("pcm")
-                    if pcm_data is not None:
-                        audio_chunks.append(pcm_data)
-
-            if not audio_chunks:
-                print("❌ No audio from Kyutai")
-                return
+        else:
+            words = aiter(text)
+            while True:
+                gpt_wait(True)
+                try:
+                    word = await anext(words)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    gpt_wait(False)
+                await tts_ws.send(msgpack.packb({"type": "Text", "text": word + " "}))
+        await tts_ws.send(msgpack.packb({"type": "Eos"}))
+    except websockets.exceptions.ConnectionClosed:
+        pass
 
-            # Convert 24kHz PCM float → 8kHz μ-law
-            pcm_24k = np.concatenate(audio_chunks, axis=0)
-            pcm_int16 = (pcm_24k * 32767).astype(np.int16).tobytes()
-            pcm_8k, _ = audioop.ratecv(pcm_int16, 2, 1, 24000, 8000, None)
-            pcm_mulaw = audioop.lin2ulaw(pcm_8k, 2)
+# ✅ Pass streamed words through, keeping a copy (cache key of the finished reply)
+async def record_words(words, spoken):
+    async for word in words:
+        spoken.append(word)
+        yield word
 
-            print(f"🔉 {len(pcm_mulaw)} bytes to Twilio")
+# ✅ One segment on its own pooled Kyutai session → 8kHz μ-law passed to `emit` as it arrives
+# Returns True once Kyutai sent Done; the timeout is per message, so long replies are never cut off
+async def synthesize_segment(text, emit, first=True, offline=False):
+    conversion = conversions.stream(RESAMPLER_QUALITY)
+    received = done = False
+    # Wait for a Kyutai slot (GPU batch): first sentences of live turns go first, pre-render jobs last
+    priority = OFFLINE if offline else LIVE_FIRST if first else LIVE_NEXT
+    async with tts_scheduler.slot(priority), tts_pool.connection(KYUTAI_VOICE, KYUTAI_FORMAT) as tts_ws:
+        trace_event("kyutai_connect", first=first, offline=offline)
+        loop = asyncio.get_running_loop()
+        waiting_for_gpt = False
+        text_sender = None
+        try:
+            async with asyncio.timeout(KYUTAI_SEGMENT_TIMEOUT) as idle:
+                # Idle deadline: restarted by every word sent and message received, off while GPT owes the next word
+                def restart_idle(gpt_wait=None):
+                    nonlocal waiting_for_gpt
+                    if gpt_wait is not None:
+                        waiting_for_gpt = gpt_wait
+                    idle.reschedule(None if waiting_for_gpt else loop.time() + KYUTAI_SEGMENT_TIMEOUT)
 
-            # Stream to Twilio (160 bytes = 20ms)
-            chunk_size = 160
-            for i in range(0, len(pcm_mulaw), chunk_size):
-                chunk = pcm_mulaw[i:i+chunk_size]
-                audio_base64 = base64.b64encode(chunk).decode("utf-8")
-                await websocket.send(json.dumps({
-                    "event": "media",
-                    "streamSid": stream_sid,
-                    "media": {"payload": audio_base64}
-                }))
-                await asyncio.sleep(0.02)
+                text_sender = asyncio.create_task(send_text_to_kyutai(tts_ws, text, restart_idle))
+                while not done:
+                    msg = msgpack.unpackb(await tts_ws.recv())
+                    restart_idle()
+                    if msg.get("type") == "Audio":
+                        pcm_data = msg.get("pcm")
+                        if pcm_data is not None:
+                            if not received:
+                                trace_event("kyutai_first_audio")
+                            received = True
+                            emit(await conversion.convert(pcm_data))
+                    elif msg.get("type") == "Done":
+                        done = True
+        except asyncio.TimeoutError:
+            print(f"⚠️ Kyutai idle for {KYUTAI_SEGMENT_TIMEOUT}s, segment cut short")
+        except websockets.exceptions.ConnectionClosed:
+            print("⚠️ Kyutai connection closed mid-segment")
+        finally:
+            if text_sender is not None:
+                text_sender.cancel()
+            trace_event("kyutai_last_audio", done=done)
 
-            print("✅ Audio sent")
+    # Tail held back by the resampler filter delay
+    if received:
+        emit(await conversion.flush())
+    return done
 
+# ✅ Cached reply: already 8kHz μ-law, paced like live audio
+async def play_ulaw(audio, websocket, stream_sid, playout, filler=None):
+    if filler is not None:
+        await filler.stop(reply_starting=True)
+    for i in range(0, len(audio), 160):
+        await playout.wait()
+        await send_to_twilio(websocket, stream_sid, audio[i:i+160])
+
+# ✅ Finished audio → TTS cache; a cache failure is logged as one and never fails the reply
+async def store_tts(text, ulaw):
+    try:
+        await tts_cache.put(KYUTAI_VOICE, KYUTAI_FORMAT, text, ulaw)
     except Exception as e:
-        print(f"❌ Kyutai error: {e}")
+        print(f"⚠️ TTS cache error: {e}")
 
-# ✅ Run server
-async def main():
+# ✅ Whole phrase → 8kHz μ-law without a call (filler bank), from the TTS cache when possible
+async def synthesize_ulaw(text):
+    if tts_cache is not None and (cached := await tts_cache.get(KYUTAI_VOICE, KYUTAI_FORMAT, text)) is not None:
+        return cached
+    chunks = []
+    if not await synthesize_segment(text, chunks.append, offline=True):
+        return None
+    ulaw = b"".join(chunks)
+    if tts_cache is not None:
+        await store_tts(text, ulaw)
+    return ulaw
+
+# ✅ Send one μ-law chunk to Twilio
+async def send_to_twilio(websocket, stream_sid, chunk):
+    if (trace := current_trace.get()) is not None:
+        trace.frame()
+    audio_base64 = base64.b64encode(chunk).decode("utf-8")
+    await websocket.send(json.dumps({
+        "event": "media",
+        "streamSid": stream_sid,
+        "media": {"payload": audio_base64}
+    }))
+
+# ✅ Run server (reuse_port: one of several workers sharing port 8765)
+async def main(reuse_port=False, metrics_port=METRICS_PORT):
     print("🎧 Server running at ws://0.0.0.0:8765/ws")
-    async with websockets.serve(handler, "0.0.0.0", 8765):
-        await asyncio.Future()
+    print(f"📡 Kyutai backends: {', '.join(KYUTAI_TTS_URLS)}")
+    tts_pool.warm(KYUTAI_VOICE, KYUTAI_FORMAT)
+    dg_pool.warm()
+    if fillers is not None:
+        filler_render = asyncio.create_task(fillers.render(synthesize_ulaw))  # referenced until shutdown
+
+    # SIGTERM (supervisor, docker stop) → close pools and flush transcripts like Ctrl+C
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    try:
+        if metrics_port:
+            await metrics.serve("0.0.0.0", metrics_port)
+            print(f"📈 Metrics at http://0.0.0.0:{metrics_port}/metrics")
+        async with websockets.serve(active_calls.wrap(handler), "0.0.0.0", 8765, reuse_port=reuse_port):
+            await stop.wait()
+    finally:
+        await asyncio.to_thread(journal.close)
+        if tracer is not None:
+            await asyncio.to_thread(tracer.close)
+        await llm.close()
+        await dg_pool.close()
+        await tts_pool.close()
+        await asyncio.to_thread(conversions.close)
+        await metrics.close()
+
+# ✅ Worker process: full server on its own core, active calls counted for the supervisor
+def run_worker(index, gauge):
+    global active_calls
+    active_calls = gauge
+    print(f"👷 Worker {index + 1}: pid {os.getpid()}")
+    try:
+        # One metrics port per worker: METRICS_PORT, METRICS_PORT + 1, …
+        asyncio.run(main(reuse_port=True, metrics_port=METRICS_PORT + index if METRICS_PORT else 0))
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if WORKERS > 1:
+        print(f"🎧 {WORKERS} workers sharing ws://0.0.0.0:8765/ws")
+        WorkerSupervisor(run_worker, WORKERS, report_interval=WORKER_REPORT_INTERVAL).run()
+    else:
+        asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+G.711 μ-law codec shared by both Twilio servers
+
+Vectorized NumPy replacement for the per-sample Python loops and for
+`audioop` (removed in Python 3.13). Encoding and decoding are single
+table lookups and match audioop.lin2ulaw / audioop.ulaw2lin bit-for-bit.
+"""
+
+import numpy as np
+
+ULAW_BIAS = 0x84
+ULAW_CLIP = 8159  # 14-bit magnitude limit (32635 >> 2)
+ULAW_SEGMENT_ENDS = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+
+
+def _build_encode_table():
+    """μ-law byte for every int16 value, indexed by the sample's uint16 bit pattern"""
+    pcm = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32)
+
+    # Same steps as G.711 / audioop: 14-bit magnitude, bias, segment, 4-bit mantissa
+    pcm = pcm >> 2
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(pcm), ULAW_CLIP) + (ULAW_BIAS >> 2)
+    segment = np.searchsorted(ULAW_SEGMENT_ENDS, magnitude)
+    mantissa = (magnitude >> (segment + 1)) & 0x0F
+    ulaw = np.where(segment >= 8, 0x7F, (segment << 4) | mantissa)
+    return (ulaw ^ mask).astype(np.uint8)
+
+
+def _build_decode_table():
+    """int16 sample for every μ-law byte"""
+    ulaw = ~np.arange(256, dtype=np.int32) & 0xFF
+    t = (((ulaw & 0x0F) << 3) + ULAW_BIAS) << ((ulaw & 0x70) >> 4)
+    return np.where(ulaw & 0x80, ULAW_BIAS - t, t - ULAW_BIAS).astype(np.int16)
+
+
+ULAW_ENCODE_TABLE = _build_encode_table()
+ULAW_DECODE_TABLE = _build_decode_table()
+
+
+# ✅ float PCM → int16
+def float_to_int16(float_samples):
+    """Convert float [-1.0, 1.0] to int16, saturating (not wrapping) on overshoot"""
+    scaled = np.asarray(float_samples, dtype=np.float32) * 32767
+    return np.clip(scaled, -32768, 32767).astype(np.int16)
+
+
+# ✅ int16 PCM → μ-law
+def lin2ulaw(pcm_int16):
+    """Encode int16 samples (array or raw bytes) to μ-law bytes"""
+    if isinstance(pcm_int16, (bytes, bytearray, memoryview)):
+        pcm_int16 = np.frombuffer(pcm_int16, dtype=np.int16)
+    pcm_int16 = np.asarray(pcm_int16, dtype=np.int16)
+    return np.take(ULAW_ENCODE_TABLE, pcm_int16.view(np.uint16)).tobytes()
+
+
+# ✅ μ-law → int16 PCM
+def ulaw2lin(ulaw_bytes):
+    """Decode μ-law bytes to an int16 array"""
+    return np.take(ULAW_DECODE_TABLE, np.frombuffer(ulaw_bytes, dtype=np.uint8))
+
+
+# ✅ float PCM → μ-law
+def float_to_ulaw(float_samples):
+    """Convert float samples straight to μ-law bytes"""
+    return lin2ulaw(float_to_int16(float_samples))
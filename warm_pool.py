@@ -0,0 +1,168 @@
+"""
+Pre-opened connection pools refilled in the background
+
+Common part of the Kyutai TTS and Deepgram listen pools: `size` ready
+connections per key, a background task per key that drops stale ones
+(closed by the server or idle for `max_idle` s) and opens replacements,
+and the same hit/miss/wait accounting. Connections are single-use: the
+caller retires one after its session and the keeper refills the pool.
+
+Subclasses open, check and close their own kind of connection, and may
+ping idle ones (`_keepalive`) on every refill sweep.
+"""
+
+import abc
+import asyncio
+import contextlib
+import time
+from collections import deque
+
+
+class WarmPool(abc.ABC):
+    """Keyed pool of pre-opened connections with hit/miss/wait accounting"""
+
+    label = "Connection"
+
+    def __init__(self, size=2, max_idle=30.0, refill_interval=15.0):
+        self.size = size
+        self.max_idle = max_idle
+        self.refill_interval = refill_interval
+
+        self._idle = {}      # key → deque of (connection, opened_at)
+        self._wakeups = {}   # key → asyncio.Event that triggers a refill
+        self._keepers = {}   # key → background refill task
+        self._closing = set()  # close() tasks of discarded connections, referenced until done
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.opened = 0
+        self.connect_errors = 0
+        self.acquired = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    # ✅ Per kind of connection
+    @abc.abstractmethod
+    async def _open(self, key):
+        """Open a new connection for `key`"""
+
+    @abc.abstractmethod
+    def _is_open(self, conn):
+        """False once the server closed `conn`"""
+
+    async def _keepalive(self, conn):
+        """Ping an idle connection; raise to have it discarded"""
+
+    async def retire(self, conn):
+        """Close a used connection"""
+        with contextlib.suppress(Exception):
+            await conn.close()
+
+    # ✅ Shared pool mechanics
+    async def _connect(self, key):
+        conn = await self._open(key)
+        self.opened += 1
+        return conn
+
+    def _is_fresh(self, conn, opened_at):
+        return self._is_open(conn) and time.monotonic() - opened_at < self.max_idle
+
+    def _discard(self, conn):
+        self.stale += 1
+        task = asyncio.create_task(conn.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _keep_filled(self, key):
+        idle = self._idle[key]
+        wakeup = self._wakeups[key]
+        while True:
+            wakeup.clear()
+
+            # Drop connections the server closed or that idled too long; ping the rest
+            for _ in range(len(idle)):
+                conn, opened_at = idle.popleft()
+                if not self._is_fresh(conn, opened_at):
+                    self._discard(conn)
+                    continue
+                try:
+                    await self._keepalive(conn)
+                except Exception:
+                    self._discard(conn)
+                    continue
+                idle.append((conn, opened_at))
+
+            while len(idle) < self.size:
+                try:
+                    conn = await self._connect(key)
+                except Exception as e:
+                    self.connect_errors += 1
+                    print(f"⚠️  {self.label} pool refill failed: {e}")
+                    await asyncio.sleep(1.0)
+                    break
+                idle.append((conn, time.monotonic()))
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(wakeup.wait(), timeout=self.refill_interval)
+
+    def _warm(self, key):
+        if self.size <= 0:
+            return
+        if key not in self._keepers:
+            self._idle[key] = deque()
+            self._wakeups[key] = asyncio.Event()
+            self._keepers[key] = asyncio.create_task(self._keep_filled(key))
+        else:
+            self._wakeups[key].set()
+
+    async def _acquire(self, key):
+        """A ready connection (pool hit) or a new one (pool miss)"""
+        start = time.perf_counter()
+
+        conn = None
+        idle = self._idle.get(key)
+        while idle:
+            candidate, opened_at = idle.popleft()
+            if self._is_fresh(candidate, opened_at):
+                conn = candidate
+                break
+            self._discard(candidate)
+
+        self._warm(key)
+
+        if conn is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            conn = await self._connect(key)
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        self.acquired += 1
+        self.wait_ms_total += wait_ms
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+        return conn
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / self.acquired if self.acquired else 0.0,
+            "stale": self.stale,
+            "opened": self.opened,
+            "connect_errors": self.connect_errors,
+            "idle": sum(len(idle) for idle in self._idle.values()),
+            "wait_ms_avg": self.wait_ms_total / self.acquired if self.acquired else 0.0,
+            "wait_ms_max": self.wait_ms_max,
+        }
+
+    async def close(self):
+        for keeper in self._keepers.values():
+            keeper.cancel()
+        self._keepers.clear()
+        for idle in self._idle.values():
+            while idle:
+                conn, _ = idle.popleft()
+                await self.retire(conn)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
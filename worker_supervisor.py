@@ -0,0 +1,186 @@
+"""
+Multi-process media WebSocket server
+
+One event loop does all the JSON parsing, base64, NumPy conversion and
+pacing of every call, so a single process tops out at one core. With
+WORKERS > 1 the supervisor starts N worker processes that each run the
+full server and accept on the same port (SO_REUSEPORT: the kernel spreads
+new connections across them), so call capacity grows with cores.
+
+The supervisor restarts a worker that exits (with a growing delay when it
+keeps crashing right after start) and reports per-worker active calls,
+read from a counter each worker keeps in shared memory.
+"""
+
+import contextlib
+import multiprocessing
+import multiprocessing.connection
+import signal
+import time
+
+
+class CallGauge:
+    """Active calls of one worker, in shared memory so the supervisor can read it"""
+
+    def __init__(self, value=None):
+        self._value = value if value is not None else multiprocessing.Value("i", 0)
+
+    @property
+    def value(self):
+        return self._value.value
+
+    def reset(self):
+        with self._value.get_lock():
+            self._value.value = 0
+
+    @contextlib.contextmanager
+    def track(self):
+        with self._value.get_lock():
+            self._value.value += 1
+        try:
+            yield
+        finally:
+            with self._value.get_lock():
+                self._value.value -= 1
+
+    def wrap(self, handler):
+        """WebSocket handler that counts the call while it runs"""
+        async def counted(websocket):
+            with self.track():
+                await handler(websocket)
+        return counted
+
+
+class WorkerSupervisor:
+    """Starts `workers` processes running target(index, gauge), restarts them when they exit"""
+
+    def __init__(self, target, workers, report_interval=30.0, restart_delay=1.0,
+                 max_restart_delay=30.0, min_uptime=10.0):
+        self.target = target
+        self.workers = workers
+        self.report_interval = report_interval   # 0 = no periodic report
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.min_uptime = min_uptime             # exits sooner than this count as a crash loop
+
+        # spawn: every worker imports the server fresh (own event loop, pools, sessions)
+        self._ctx = multiprocessing.get_context("spawn")
+        self.gauges = [CallGauge(self._ctx.Value("i", 0)) for _ in range(workers)]
+        self.processes = [None] * workers
+        self._started_at = [0.0] * workers
+        self._delay = [restart_delay] * workers
+        self._restart_at = [None] * workers
+        self._stopping = False
+
+        self.restarts = [0] * workers
+        self.exit_codes = [None] * workers
+
+    def _start(self, index):
+        self.gauges[index].reset()
+        process = self._ctx.Process(
+            target=self.target, args=(index, self.gauges[index]), name=f"worker-{index + 1}"
+        )
+        process.start()
+        self.processes[index] = process
+        self._started_at[index] = time.monotonic()
+        self._restart_at[index] = None
+        print(f"👷 Worker {index + 1} started (pid {process.pid})")
+
+    def start(self):
+        for index in range(self.workers):
+            self._start(index)
+
+    def _exited(self, index, now):
+        process = self.processes[index]
+        process.join()
+        self.processes[index] = None
+        self.exit_codes[index] = process.exitcode
+        self.gauges[index].reset()   # calls of a dead worker are gone
+
+        # Crash loop: back off instead of restarting a broken worker as fast as possible
+        if now - self._started_at[index] < self.min_uptime:
+            delay = self._delay[index]
+            self._delay[index] = min(delay * 2, self.max_restart_delay)
+        else:
+            delay = self._delay[index] = self.restart_delay
+        self._restart_at[index] = now + delay
+        print(f"💥 Worker {index + 1} (pid {process.pid}) exited with code {process.exitcode}, "
+              f"restarting in {delay:.1f}s")
+
+    def poll(self, timeout=0.0):
+        """Wait up to `timeout` for a worker to exit; handle exits and due restarts"""
+        sentinels = [process.sentinel for process in self.processes if process is not None]
+        if sentinels:
+            multiprocessing.connection.wait(sentinels, timeout)
+        elif timeout:
+            time.sleep(timeout)
+
+        now = time.monotonic()
+        for index, process in enumerate(self.processes):
+            if process is not None and not process.is_alive():
+                self._exited(index, now)
+            elif process is None and not self._stopping and self._restart_at[index] is not None \
+                    and self._restart_at[index] <= now:
+                self.restarts[index] += 1
+                self._start(index)
+
+    def run(self):
+        """Supervise until SIGINT/SIGTERM, then stop the workers"""
+        def terminate(signum, frame):
+            raise KeyboardInterrupt
+        signal.signal(signal.SIGTERM, terminate)
+
+        self.start()
+        next_report = time.monotonic() + self.report_interval if self.report_interval else float("inf")
+        try:
+            while True:
+                now = time.monotonic()
+                due = [at for at in self._restart_at if at is not None] + [next_report]
+                self.poll(timeout=max(0.0, min(min(due) - now, 1.0)))
+                if time.monotonic() >= next_report:
+                    self.report()
+                    next_report += self.report_interval
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping workers")
+        finally:
+            self.stop()
+
+    def stop(self, timeout=10.0):
+        """SIGTERM every worker (graceful shutdown), SIGKILL the ones still running after `timeout`"""
+        self._stopping = True
+        running = [process for process in self.processes if process is not None and process.is_alive()]
+        for process in running:
+            process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in running:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+    def report(self):
+        stats = self.stats()
+        workers = ", ".join(
+            f"#{w['worker']} pid {w['pid'] or '-'}: {w['active_calls']} call(s)"
+            + (f", {w['restarts']} restart(s)" if w["restarts"] else "")
+            for w in stats["workers"]
+        )
+        print(f"📊 Workers: {stats['active_calls']} active call(s) — {workers}")
+
+    def stats(self):
+        workers = []
+        for index, process in enumerate(self.processes):
+            workers.append({
+                "worker": index + 1,
+                "pid": process.pid if process is not None else None,
+                "alive": process is not None and process.is_alive(),
+                "active_calls": self.gauges[index].value,
+                "restarts": self.restarts[index],
+                "last_exit_code": self.exit_codes[index],
+            })
+        return {
+            "workers": workers,
+            "alive": sum(1 for w in workers if w["alive"]),
+            "active_calls": sum(w["active_calls"] for w in workers),
+            "restarts": sum(self.restarts),
+        }